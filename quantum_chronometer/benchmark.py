@@ -0,0 +1,233 @@
+"""
+Benchmark harness for the model hot paths.
+
+Times update_unit_times (on a still board and while one unit is dragged),
+get_proximity_pairs, save_state/load_state and emoji_count over several
+board layouts and unit counts, and writes the results as JSON so two
+revisions can be compared:
+
+    python -m quantum_chronometer.benchmark --output new.json --compare old.json
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+
+from .model import QuantumModel, QuantumUnit
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+TICK_BUDGET_MS = 50.0            # One QTimer interval
+UNIT_SPACING = 60                # Average px between units in spread-out layouts
+REGRESSION_TOLERANCE = 1.25      # Slower than this ratio counts as a regression
+DRAG_STEP = 5.0                  # px a dragged unit moves between ticks
+TICK_OPERATIONS = ("update_unit_times", "drag_tick")  # Checked against the frame budget
+
+# Layouts whose cost grows with n^2 no matter how good the index is
+LAYOUT_MAX_UNITS = {
+    "overlapping": 5000,
+}
+
+
+def _board_side(count):
+    return math.sqrt(count) * UNIT_SPACING
+
+
+def layout_uniform(count, rng):
+    side = _board_side(count)
+    return [("⚛️", rng.uniform(0, side), rng.uniform(0, side)) for _ in range(count)]
+
+
+def layout_clustered(count, rng, cluster_size=50, spread=40):
+    side = _board_side(count)
+    units = []
+    while len(units) < count:
+        cx, cy = rng.uniform(0, side), rng.uniform(0, side)
+        for _ in range(min(cluster_size, count - len(units))):
+            units.append(("🌌", rng.gauss(cx, spread), rng.gauss(cy, spread)))
+    return units
+
+
+def layout_overlapping(count, rng):
+    return [("🔮", 500 + rng.uniform(-1, 1), 400 + rng.uniform(-1, 1)) for _ in range(count)]
+
+
+def layout_black_holes(count, rng):
+    side = _board_side(count)
+    return [("🕳️" if i % 4 == 0 else "🚀", rng.uniform(0, side), rng.uniform(0, side)) for i in range(count)]
+
+
+LAYOUTS = {
+    "uniform": layout_uniform,
+    "clustered": layout_clustered,
+    "overlapping": layout_overlapping,
+    "black_holes": layout_black_holes,
+    "entangled": layout_uniform,  # Uniform positions plus dense entanglement
+}
+
+
+def build_model(layout, count, backend="python", seed=0):
+    """Create a model populated with `count` units in the given layout."""
+    rng = random.Random(seed)
+    model = QuantumModel(backend=backend)
+    for text, x, y in LAYOUTS[layout](count, rng):
+        unit = QuantumUnit(text, x, y)
+        unit.superposition_symbol = rng.choice(['+', '*', '~'])
+        model.add_unit(unit)
+    if layout == "entangled":
+        # A chain through every unit plus random cross links: two pairs per unit
+        ids = [unit.id for unit in model.units]
+        for i in range(1, count):
+            model.entangle_units(ids[i - 1], ids[i])
+            model.entangle_units(ids[i], ids[rng.randrange(count)])
+    return model
+
+
+def time_call(func, repeat=5, budget=2.0):
+    """
+    Run func up to `repeat` times (at least once), stopping early once
+    `budget` seconds have been spent. Returns the timings in milliseconds.
+    """
+    timings = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        func()
+        timings.append((time.perf_counter_ns() - t0) / 1e6)
+        if time.perf_counter() - started > budget:
+            break
+    return timings
+
+
+def bench_case(layout, count, backend="python", repeat=5, budget=2.0):
+    """Benchmark every operation for one (layout, count). Returns result dicts."""
+    model = build_model(layout, count, backend)
+    state = model.save_state()
+    scratch = QuantumModel(backend=backend)
+
+    def drag_tick():
+        # One unit moved per tick, as while the user drags it
+        unit = model.units[0] if model.units else None
+        if unit is not None:
+            model.update_unit_position(unit.id, unit.x + DRAG_STEP, unit.y)
+        model.update_unit_times(0.05, is_observing=True, mouse_pos=(0, 0))
+
+    operations = {
+        "update_unit_times": lambda: model.update_unit_times(0.05, is_observing=True, mouse_pos=(0, 0)),
+        "drag_tick": drag_tick,
+        "get_proximity_pairs": model.get_proximity_pairs,
+        "save_state": model.save_state,
+        "load_state": lambda: scratch.load_state(state),
+        "emoji_count": lambda: sum(unit.emoji_count for unit in model.units),
+    }
+    results = []
+    for name, func in operations.items():
+        timings = time_call(func, repeat, budget)
+        results.append({
+            "layout": layout,
+            "units": count,
+            "backend": backend,
+            "operation": name,
+            "runs": len(timings),
+            "min_ms": min(timings),
+            "median_ms": statistics.median(timings),
+            "mean_ms": statistics.fmean(timings),
+        })
+    model.close()
+    scratch.close()
+    return results
+
+
+def run_benchmarks(sizes=None, layouts=None, backend="python", repeat=5, budget=2.0, log=None):
+    """Run the full matrix and return a JSON-serializable report."""
+    sizes = sizes or DEFAULT_SIZES
+    layouts = layouts or list(LAYOUTS)
+    results = []
+    for layout in layouts:
+        for count in sizes:
+            if count > LAYOUT_MAX_UNITS.get(layout, count):
+                continue
+            case = bench_case(layout, count, backend, repeat, budget)
+            results.extend(case)
+            if log:
+                tick, drag = (next(r for r in case if r["operation"] == name) for name in TICK_OPERATIONS)
+                log(f"{layout:>12} {count:>7} units: tick {tick['median_ms']:.2f} ms, "
+                    f"while dragging {drag['median_ms']:.2f} ms")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": backend,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "tick_budget_ms": TICK_BUDGET_MS,
+        },
+        "results": results,
+    }
+
+
+def _key(result):
+    return (result["layout"], result["units"], result.get("backend", "python"), result["operation"])
+
+
+def compare_results(baseline, current, tolerance=REGRESSION_TOLERANCE):
+    """
+    Compare two reports. Returns a list of (key, baseline_ms, current_ms, ratio)
+    for every case whose median got slower than `tolerance` times the baseline.
+    """
+    old = {_key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = old.get(_key(result))
+        if before is None or before["median_ms"] <= 0:
+            continue
+        ratio = result["median_ms"] / before["median_ms"]
+        if ratio > tolerance:
+            regressions.append((_key(result), before["median_ms"], result["median_ms"], ratio))
+    return regressions
+
+
+def over_budget(report, budget_ms=TICK_BUDGET_MS):
+    """Tick results whose median exceeds the frame budget."""
+    return [r for r in report["results"]
+            if r["operation"] in TICK_OPERATIONS and r["median_ms"] > budget_ms]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Quantum Chronometer model")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument("--backend", choices=QuantumModel.BACKENDS, default="python")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0, help="Max seconds spent per operation")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.layouts, args.backend, args.repeat, args.budget, log=print)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    for result in over_budget(report):
+        print(f"Over {TICK_BUDGET_MS:.0f} ms budget: {result['layout']} {result['units']} units "
+              f"({result['median_ms']:.1f} ms)")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, report, args.tolerance)
+        for key, before, after, ratio in regressions:
+            print(f"Regression {key}: {before:.2f} ms -> {after:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
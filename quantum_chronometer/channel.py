@@ -0,0 +1,89 @@
+"""
+Distortion channel: broadcasts the local time distortion and aggregates
+what the other instances report.
+
+This is the Qt-free core of network.QuantumNetworkManager, which only
+adds the socket setup and the remote_distortion_received signal, so the
+channel can be driven from tests and loadtest.py without a GUI.
+"""
+from .peers import DEFAULT_AGGREGATION, PEER_TTL, SEQ_MODULUS, PeerTable, new_instance_id
+from .transport import DatagramTransport
+from .wire import SendPolicy, pack_distortion, unpack_distortion
+
+
+def distortion_decoder(instance_id):
+    """
+    decode callable for DatagramTransport: (sender id, (seq, value)) for
+    distortion packets from other instances, None for our own. Malformed
+    packets raise and are counted as drops by the transport.
+    """
+    def decode(data, addr):
+        sender, seq, value, _flags = unpack_distortion(data)
+        if sender == instance_id:
+            return None  # Our own broadcast, echoed back
+        return sender, (seq, value)
+    return decode
+
+
+class DistortionChannel:
+    """
+    sock: UDP socket, already bound; owned and closed by the transport.
+    destinations: addresses every broadcast is sent to, e.g.
+                  [('<broadcast>', port)] or the loopback peers of a test.
+    Remote values are kept per instance in a PeerTable and combined with
+    `aggregation` (see peers.AGGREGATIONS).
+    """
+
+    def __init__(self, sock, destinations, aggregation=DEFAULT_AGGREGATION, peer_ttl=PEER_TTL,
+                 send_policy=None, instance_id=None):
+        self.destinations = list(destinations)
+        self.instance_id = instance_id if instance_id is not None else new_instance_id()
+        self.seq = 0
+        self.peers = PeerTable(aggregation, peer_ttl)
+        self.send_policy = send_policy if send_policy is not None else SendPolicy()
+        self.transport = DatagramTransport(sock, distortion_decoder(self.instance_id))
+
+    @property
+    def running(self):
+        return self.transport.running
+
+    def start(self):
+        """Start the transport's event-loop thread. Returns False if it could not start."""
+        return self.transport.start()
+
+    def stop(self):
+        """Stop the transport and close the socket."""
+        self.transport.stop()
+
+    def send(self, distortion):
+        """
+        Queue the local distortion for every destination if the send policy
+        wants it on the wire; replaces a value not sent yet. Returns True if
+        a packet was queued.
+        """
+        flags = self.send_policy.decide(distortion)
+        if flags is None:
+            return False
+        self.seq = (self.seq + 1) % SEQ_MODULUS
+        message = pack_distortion(self.instance_id, self.seq, distortion, flags)
+        sent = False
+        for addr in self.destinations:
+            sent = self.transport.send(("distortion", addr), message, addr) or sent
+        return sent
+
+    def poll(self, now=None):
+        """
+        Fold the packets received since the last poll into the peer table and
+        evict silent peers. Returns the aggregate if it changed, else None.
+        """
+        return self.apply(self.transport.drain(), now)
+
+    def apply(self, batch, now=None):
+        """poll() for a batch already drained from the transport ({sender: (seq, value)})."""
+        peers = self.peers
+        previous = peers.aggregate()
+        for sender, (seq, value) in batch.items():
+            peers.update(sender, seq, value, now)
+        peers.expire(now)
+        aggregate = peers.aggregate()
+        return aggregate if aggregate != previous else None
@@ -0,0 +1,242 @@
+import math
+import time
+
+from .model import QuantumModel
+from .snapshot import load_snapshot, write_snapshot
+
+DEFAULT_DT = 0.05               # Seconds of simulated time per tick (20 ticks/s)
+OBSERVATION_WINDOW = 0.2        # Seconds a mouse movement keeps time flowing
+OBSERVATION_RADIUS = 200        # Mouse distance (px) at which observation intensity reaches 0
+MIN_OBSERVATION_INTENSITY = 0.1 # Any mouse movement observes at least this much
+MAX_CATCH_UP = 0.25             # Max seconds of backlog simulated in one advance()
+
+
+class SimulationEngine:
+    """
+    Headless driver for a QuantumModel.
+    Owns the tick length, the observed (accumulated) time and the
+    observation state, and advances the model one tick at a time.
+    Has no Qt dependency, so it can run on machines without a display.
+
+    Inputs applied through the engine's methods (add_unit, move_unit,
+    observe_mouse, ...) and every tick are reported to its listeners as
+    event dicts, which is how the journal and the replay recorder see them.
+    Events that read the clock carry the value read as "now".
+    """
+
+    def __init__(self, model=None, dt=DEFAULT_DT, clock=time.time, max_catch_up=MAX_CATCH_UP):
+        self.model = model if model is not None else QuantumModel()
+        self.dt = dt
+        self.clock = clock
+        self.tick_count = 0
+        self.accumulated_time = 0.0  # Total "observed" time
+        self.last_tick_flow = 0.0  # Observed time the last tick added
+
+        # Fixed-timestep accumulator for advance()
+        self.max_catch_up = max_catch_up
+        self.pending_time = 0.0  # Real time not yet simulated (always < dt after advance)
+        self.dropped_time = 0.0  # Real time discarded because the backlog was too long
+
+        # Observation state
+        self.is_observing = False  # Continuous observation (Observe button)
+        self.observation_intensity = 0.0  # 0-1, based on mouse proximity
+        self.mouse_x = 0
+        self.mouse_y = 0
+        self.last_observation_time = clock()
+
+        self.listeners = []  # Objects with record(event), see add_listener()
+
+    @property
+    def simulated_time(self):
+        """Simulated seconds elapsed since the engine started, observed or not."""
+        return self.tick_count * self.dt
+
+    @property
+    def magnified_time(self):
+        """Observed time including the model's current distortion."""
+        return self.accumulated_time + self.model.time_distortion
+
+    def set_profiler(self, profiler):
+        """Route the model's per-phase timings to a TickProfiler (or NULL_PROFILER)."""
+        self.model.profiler = profiler
+
+    def add_listener(self, listener):
+        """Call listener.record(event) for every input and tick from now on."""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def _emit(self, event):
+        for listener in self.listeners:
+            listener.record(event)
+
+    # --- Inputs ---
+
+    def add_unit(self, unit):
+        self.model.add_unit(unit)
+        if self.listeners:
+            self._emit({"op": "add", "id": unit.id, "text": unit.text, "x": unit.x, "y": unit.y,
+                        "symbol": unit.superposition_symbol})
+
+    def move_unit(self, unit_id, x, y):
+        """Move a unit by id. Returns False if there is no such unit."""
+        now = self.clock()
+        moved = self.model.update_unit_position(unit_id, x, y, now)
+        if moved and self.listeners:
+            self._emit({"op": "move", "id": unit_id, "x": x, "y": y, "now": now})
+        return moved
+
+    def remove_unit(self, unit_id):
+        """Remove a unit by id. Returns False if there is no such unit."""
+        removed = self.model.remove_unit(unit_id)
+        if removed and self.listeners:
+            self._emit({"op": "remove", "id": unit_id})
+        return removed
+
+    def entangle_units(self, unit_id1, unit_id2):
+        """Entangle two units. Returns False if either is unknown or they already are."""
+        added = self.model.entangle_units(unit_id1, unit_id2)
+        if added and self.listeners:
+            self._emit({"op": "entangle", "a": unit_id1, "b": unit_id2})
+        return added
+
+    def set_remote_distortion(self, value):
+        """Distortion reported by other instances on the network."""
+        self.model.external_distortion = value
+        if self.listeners:
+            self._emit({"op": "remote", "value": value})
+
+    def set_observing(self, is_observing):
+        """Toggle continuous observation."""
+        now = self.clock()
+        self.is_observing = is_observing
+        if is_observing:
+            self.last_observation_time = now
+        if self.listeners:
+            self._emit({"op": "observe", "on": bool(is_observing), "now": now})
+
+    def observe_mouse(self, x, y):
+        """Record a mouse movement; units near the pointer raise the intensity."""
+        self.mouse_x = x
+        self.mouse_y = y
+
+        max_intensity = 0.0
+        for _, distance in self.model.units_near(x, y, OBSERVATION_RADIUS):
+            intensity = 1.0 - (distance / OBSERVATION_RADIUS)
+            max_intensity = max(max_intensity, intensity)
+
+        self.observation_intensity = max(MIN_OBSERVATION_INTENSITY, max_intensity)
+        self.last_observation_time = now = self.clock()
+        if self.listeners:
+            self._emit({"op": "mouse", "x": x, "y": y, "now": now})
+
+    def is_time_flowing(self, now=None):
+        """Time flows during continuous observation or shortly after a mouse movement."""
+        if now is None:
+            now = self.clock()
+        return self.is_observing or now - self.last_observation_time < OBSERVATION_WINDOW
+
+    def step(self, n=1):
+        """Advance the simulation by n ticks. Returns the number of ticks run."""
+        model = self.model
+        dt = self.dt
+        mouse_pos = (self.mouse_x, self.mouse_y)
+        for _ in range(n):
+            # Read the clock once per tick, so a recorded tick replays exactly
+            now = self.clock()
+            is_flowing = self.is_time_flowing(now)
+            model.update_unit_times(dt, is_observing=is_flowing, mouse_pos=mouse_pos, now=now)
+            self.last_tick_flow = dt if is_flowing else 0.0
+            if is_flowing:
+                self.accumulated_time += dt
+            if self.listeners:
+                self._emit({"op": "tick", "now": now, "distortion": model.time_distortion})
+        self.tick_count += n
+        return n
+
+    @property
+    def interpolation_alpha(self):
+        """Fraction (0-1) of the next tick already elapsed, for smooth rendering."""
+        return self.pending_time / self.dt
+
+    @property
+    def display_magnified_time(self):
+        """
+        magnified_time for a frame drawn between ticks: the observed time is
+        interpolated from the previous tick to the last one by
+        interpolation_alpha, so a display refreshing faster than the
+        simulation advances smoothly instead of repeating the last tick.
+        Lags the simulation by less than one tick and never runs backwards.
+        """
+        return self.magnified_time - (1.0 - self.interpolation_alpha) * self.last_tick_flow
+
+    @property
+    def display_unit_lag(self):
+        """
+        Seconds to subtract from every unit's local time for a frame drawn
+        between ticks (the unit-time counterpart of display_magnified_time).
+        """
+        return (1.0 - self.interpolation_alpha) * self.model.last_flow_delta
+
+    def advance(self, elapsed):
+        """
+        Feed `elapsed` seconds of real time into the fixed-timestep
+        accumulator and run as many dt ticks as it covers. A backlog longer
+        than max_catch_up is dropped instead of simulated, so a stall does
+        not trigger a spiral of ever longer frames.
+        Returns the number of ticks run.
+        """
+        self.pending_time += max(0.0, elapsed)
+        ticks = math.floor(round(self.pending_time / self.dt, 9))
+        max_ticks = max(1, math.floor(round(self.max_catch_up / self.dt, 9)))
+        if ticks > max_ticks:
+            self.dropped_time += (ticks - max_ticks) * self.dt
+            self.pending_time -= (ticks - max_ticks) * self.dt
+            ticks = max_ticks
+        self.pending_time = max(0.0, self.pending_time - ticks * self.dt)
+        if ticks:
+            self.step(ticks)
+        return ticks
+
+    def run_until(self, t):
+        """
+        Step until at least `t` seconds of simulated time have elapsed.
+        Returns the number of ticks run.
+        """
+        remaining = t - self.simulated_time
+        if remaining <= 0:
+            return 0
+        # Round first to absorb float error, so run_until(1.0) with dt=0.05 runs 20 ticks
+        ticks = math.ceil(round(remaining / self.dt, 9))
+        return self.step(ticks)
+
+    def reset(self):
+        """Clear the board and the observed time."""
+        self.model.reset()
+        self.accumulated_time = 0.0
+        if self.listeners:
+            self._emit({"op": "reset"})
+
+    def save_state(self):
+        return self.model.save_state(self.accumulated_time)
+
+    def capture_state(self):
+        """Cheap capture of save_state() to build later (see QuantumModel.capture_state)."""
+        return self.model.capture_state(self.accumulated_time)
+
+    def load_state(self, state):
+        self.model.load_state(state)
+        self.accumulated_time = state.get("accumulated_time", 0.0)
+        if self.listeners:
+            self._emit({"op": "load", "state": state})
+
+    def save_snapshot(self, path):
+        """Write the state to `path` in the binary snapshot format."""
+        write_snapshot(self.model, path, self.accumulated_time)
+
+    def load_snapshot(self, path):
+        """Restore the state from a binary snapshot file."""
+        self.accumulated_time = load_snapshot(self.model, path)
+        if self.listeners:
+            self._emit({"op": "load", "state": self.save_state()})
@@ -0,0 +1,222 @@
+"""
+Monte Carlo ensembles of a saved board.
+
+The superposition noise makes every run of the chronometer one random
+trajectory. EnsembleRunner takes a board saved with save_state() and
+advances K trajectories of it in lockstep for T headless ticks, with the
+trajectory as the leading array axis: nothing moves in a headless run, so
+the gravity term is computed once and there is no movement effect, and
+every tick draws the noise and applies the entanglement means for all K
+trajectories at once.
+Trajectory k draws from its own generator and is the same run as a
+"numpy" backend model seeded with `seed + k` (see trajectory_engine).
+
+Only the current tick of the K trajectories is in memory. Each tick
+yields statistics across the ensemble; running statistics over every
+tick and trajectory (mean and variance by Chan's parallel update,
+quantiles from fixed-range histograms) are kept for summary():
+
+    python -m quantum_chronometer.ensemble board.json --runs 1000 --ticks 600 --output stats.json
+"""
+import argparse
+import json
+import sys
+from collections import namedtuple
+
+from .engine import DEFAULT_DT, SimulationEngine
+from .model import QuantumModel
+from .replay import ManualClock
+from .store import np
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+HISTOGRAM_BINS = 200  # Per unit and for the total; memory grows with units * bins
+
+# Statistics across the ensemble. mean and variance (population) are
+# floats for the total distortion and arrays with one value per unit for
+# the units; quantiles has one entry (or array) per requested quantile.
+Stats = namedtuple("Stats", ["mean", "variance", "quantiles"])
+TickStats = namedtuple("TickStats", ["tick", "now", "distortion", "units"])
+
+
+def trajectory_engine(state, seed, dt=DEFAULT_DT, start=0.0, external_distortion=0.0):
+    """
+    Engine that reproduces trajectory `seed` of an ensemble tick by tick:
+    advance its clock by dt after every step().
+    """
+    clock = ManualClock(start)
+    model = QuantumModel("numpy", seed=seed, clock=clock)
+    engine = SimulationEngine(model, dt=dt, clock=clock)
+    engine.load_state(state)
+    model.external_distortion = external_distortion
+    return engine
+
+
+class _RunningStats:
+    """Mean, variance and a histogram over a stream of (K, ...) batches."""
+
+    def __init__(self, low, high, bins):
+        self.count = 0
+        self.mean = np.zeros_like(low)
+        self.m2 = np.zeros_like(low)
+        self.low = low
+        self.width = np.where(high > low, high - low, 1.0)
+        self.bins = bins
+        self.histogram = np.zeros(low.shape + (bins,), dtype=np.int64)
+
+    def add(self, values, batch_mean, batch_variance):
+        # Chan et al.: merge the batch's mean and M2 into the running ones
+        batch = len(values)
+        total = self.count + batch
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * (batch / total)
+        self.m2 = self.m2 + batch_variance * batch + delta ** 2 * (self.count * batch / total)
+        self.count = total
+
+        bins = self.bins
+        index = np.clip(((values - self.low) / self.width * bins).astype(np.intp), 0, bins - 1)
+        flat = index.reshape(batch, -1) + np.arange(index[0].size) * bins
+        self.histogram += np.bincount(flat.ravel(), minlength=self.histogram.size).reshape(self.histogram.shape)
+
+    def quantiles(self, points):
+        """Quantiles from the histogram, to within one bin (the bin centre is returned)."""
+        cumulative = np.cumsum(self.histogram, axis=-1)
+        result = []
+        for point in points:
+            bin_index = np.argmax(cumulative >= point * self.count, axis=-1)
+            result.append(self.low + (bin_index + 0.5) / self.bins * self.width)
+        return result
+
+    def stats(self, points):
+        return Stats(self.mean, self.m2 / self.count if self.count else self.m2, self.quantiles(points))
+
+
+class EnsembleRunner:
+    """
+    state: board as returned by save_state().
+    runs: number of trajectories K; trajectory k is seeded with seed + k.
+    start: clock time of the first tick.
+    quantiles: quantiles reported per tick and in summary().
+    bins: histogram resolution for the summary quantiles.
+    """
+
+    def __init__(self, state, runs, seed=0, dt=DEFAULT_DT, start=0.0, external_distortion=0.0,
+                 quantiles=QUANTILES, bins=HISTOGRAM_BINS):
+        if np is None:
+            raise ImportError("The ensemble runner requires numpy")
+        if runs < 1:
+            raise ValueError(f"An ensemble needs at least one run, got {runs}")
+        self.model = model = QuantumModel("numpy")
+        model.load_state(state)
+        self.unit_ids = [unit.id for unit in model.units]
+        self.runs = runs
+        self.seed = seed
+        self.dt = dt
+        self.now = start
+        self.tick = 0
+        self.external_distortion = external_distortion
+        self.quantiles = tuple(quantiles)
+        self.generators = [np.random.default_rng(seed + k) for k in range(runs)]
+
+        # Nothing moves, so gravity is the same every tick
+        self.proximity_delta = model.proximity_columns()
+        bounds = model.superposition_bounds()
+        self.noise_low = bounds[:, 0].copy()
+        self.noise_high = bounds[:, 1].copy()
+
+        # Exact ranges for the histograms: noise at its bounds
+        low = model.local_distortion_columns(self.proximity_delta, self.noise_low)
+        high = model.local_distortion_columns(self.proximity_delta, self.noise_high)
+        total_low = np.array(low.sum() + external_distortion)
+        total_high = np.array(high.sum() + external_distortion)
+        model.entangle_columns(low)
+        model.entangle_columns(high)
+        self._units = _RunningStats(low, high, bins)
+        self._total = _RunningStats(total_low, total_high, bins)
+
+    def step(self):
+        """Advance every trajectory one tick. Returns the TickStats of the tick."""
+        model = self.model
+        noise = np.empty((self.runs, len(self.unit_ids)))
+        for row, rng in zip(noise, self.generators):
+            row[:] = rng.uniform(self.noise_low, self.noise_high)
+        local = model.local_distortion_columns(self.proximity_delta, noise)
+        total = local.sum(axis=-1) + self.external_distortion
+        model.entangle_columns(local)
+
+        distortion = Stats(float(total.mean()), float(total.var()),
+                           [float(value) for value in np.quantile(total, self.quantiles)])
+        units = Stats(local.mean(axis=0), local.var(axis=0), list(np.quantile(local, self.quantiles, axis=0)))
+        self._total.add(total, np.array(distortion.mean), np.array(distortion.variance))
+        self._units.add(local, units.mean, units.variance)
+
+        stats = TickStats(self.tick, self.now, distortion, units)
+        self.tick += 1
+        self.now += self.dt
+        return stats
+
+    def run(self, ticks):
+        """Yield the TickStats of the next `ticks` ticks as they are computed."""
+        for _ in range(ticks):
+            yield self.step()
+
+    def summary(self):
+        """JSON-serializable statistics over every tick and trajectory so far."""
+        total = self._total.stats(self.quantiles)
+        units = self._units.stats(self.quantiles)
+        return {
+            "runs": self.runs,
+            "ticks": self.tick,
+            "seeds": [self.seed, self.seed + self.runs - 1],
+            "dt": self.dt,
+            "distortion": {
+                "mean": float(total.mean),
+                "variance": float(total.variance),
+                "quantiles": {str(point): float(value) for point, value in zip(self.quantiles, total.quantiles)},
+            },
+            "units": [
+                {
+                    "id": unit_id,
+                    "mean": float(units.mean[i]),
+                    "variance": float(units.variance[i]),
+                    "quantiles": {str(point): float(values[i]) for point, values in zip(self.quantiles, units.quantiles)},
+                }
+                for i, unit_id in enumerate(self.unit_ids)
+            ],
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo ensemble of a saved Quantum Chronometer board")
+    parser.add_argument("board", help="JSON file written from save_state()")
+    parser.add_argument("--runs", type=int, default=100, help="Trajectories (default: 100)")
+    parser.add_argument("--ticks", type=int, default=200, help="Ticks per trajectory (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first trajectory")
+    parser.add_argument("--dt", type=float, default=DEFAULT_DT)
+    parser.add_argument("--start", type=float, default=0.0, help="Clock time of the first tick")
+    parser.add_argument("--every", type=int, default=20, help="Print the statistics every N ticks")
+    parser.add_argument("--bins", type=int, default=HISTOGRAM_BINS)
+    parser.add_argument("--output", help="Write the summary as JSON to this file")
+    args = parser.parse_args(argv)
+
+    with open(args.board, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    runner = EnsembleRunner(state, args.runs, args.seed, args.dt, args.start, bins=args.bins)
+    labels = "  ".join(f"q{point:g}" for point in runner.quantiles)
+    print(f"{len(runner.unit_ids)} units, {args.runs} runs. Per tick: mean  std  {labels}")
+    for stats in runner.run(args.ticks):
+        if stats.tick % args.every == 0 or stats.tick == args.ticks - 1:
+            distortion = stats.distortion
+            quantiles = "  ".join(f"{value:+.5f}" for value in distortion.quantiles)
+            print(f"tick {stats.tick:>6}  {distortion.mean:+.5f}  {distortion.variance ** 0.5:.5f}  {quantiles}")
+
+    summary = runner.summary()
+    overall = summary["distortion"]
+    print(f"All ticks: mean {overall['mean']:+.5f}  std {overall['variance'] ** 0.5:.5f}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+class EntanglementGraph:
+    """
+    Undirected graph of entangled unit IDs.
+    Pairs are de-duplicated regardless of order, direct entanglement checks
+    are O(1), and units are grouped into connected components so that a
+    chain A-B-C shares a single distortion value. Components are rebuilt
+    lazily, at most once after each change to the graph.
+    """
+
+    def __init__(self):
+        self.adjacency = {}   # unit_id -> set of directly entangled unit_ids
+        self._pairs = {}      # normalized (id1, id2) -> pair as originally given
+        self.version = 0      # Bumped on every change, used to invalidate caches
+        self._components = None
+        self._component_of = None
+
+    @staticmethod
+    def _key(unit_id1, unit_id2):
+        return (unit_id1, unit_id2) if unit_id1 <= unit_id2 else (unit_id2, unit_id1)
+
+    def __len__(self):
+        return len(self._pairs)
+
+    def __iter__(self):
+        return iter(self._pairs.values())
+
+    def __contains__(self, pair):
+        unit_id1, unit_id2 = pair
+        return self.are_entangled(unit_id1, unit_id2)
+
+    def _changed(self):
+        self.version += 1
+        self._components = None
+        self._component_of = None
+
+    def add(self, unit_id1, unit_id2):
+        """Entangle two units. Returns False for self-pairs and duplicates."""
+        if unit_id1 == unit_id2:
+            return False
+        key = self._key(unit_id1, unit_id2)
+        if key in self._pairs:
+            return False
+        self._pairs[key] = (unit_id1, unit_id2)
+        self.adjacency.setdefault(unit_id1, set()).add(unit_id2)
+        self.adjacency.setdefault(unit_id2, set()).add(unit_id1)
+        self._changed()
+        return True
+
+    def remove_unit(self, unit_id):
+        """Drop a unit and every pair it belongs to."""
+        neighbours = self.adjacency.pop(unit_id, None)
+        if not neighbours:
+            return
+        for other in neighbours:
+            del self._pairs[self._key(unit_id, other)]
+            others = self.adjacency[other]
+            others.discard(unit_id)
+            if not others:
+                del self.adjacency[other]
+        self._changed()
+
+    def clear(self):
+        self.adjacency.clear()
+        self._pairs.clear()
+        self._changed()
+
+    def pairs(self):
+        """List of (unit_id1, unit_id2) pairs in the order they were added."""
+        return list(self._pairs.values())
+
+    def are_entangled(self, unit_id1, unit_id2):
+        """True if the two units are directly entangled."""
+        return unit_id2 in self.adjacency.get(unit_id1, ())
+
+    def components(self):
+        """List of connected components, each a list of unit IDs."""
+        if self._components is None:
+            self._build_components()
+        return self._components
+
+    def component_of(self, unit_id):
+        """Index of the unit's component, or None if it is not entangled."""
+        if self._component_of is None:
+            self._build_components()
+        return self._component_of.get(unit_id)
+
+    def same_component(self, unit_id1, unit_id2):
+        """True if the units are linked through any chain of entanglements."""
+        component = self.component_of(unit_id1)
+        return component is not None and component == self.component_of(unit_id2)
+
+    def _build_components(self):
+        components = []
+        component_of = {}
+        adjacency = self.adjacency
+        for start in adjacency:
+            if start in component_of:
+                continue
+            index = len(components)
+            members = [start]
+            component_of[start] = index
+            stack = [start]
+            while stack:
+                for other in adjacency[stack.pop()]:
+                    if other not in component_of:
+                        component_of[other] = index
+                        members.append(other)
+                        stack.append(other)
+            components.append(members)
+        self._components = components
+        self._component_of = component_of
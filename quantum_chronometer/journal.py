@@ -0,0 +1,298 @@
+"""
+Append-only session journal with snapshot compaction.
+
+Every model mutation the engine reports (unit added, moved or removed,
+entanglement, reset, observation toggle, remote distortion) is appended as
+one JSON line to journal-<generation>.log. Lines are encoded and written by a background
+thread, which fsyncs at most once per `fsync_interval`, so recording an
+event on the UI thread is just a queue put.
+
+Compaction captures the board on the UI thread (references and column
+copies only), builds and writes it to snapshot-<generation>.json on the
+writer thread and starts a fresh journal for the next generation,
+deleting the older files. After a crash, recover() loads the latest snapshot and replays the
+journal tail; a torn last line is ignored.
+"""
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+from .model import QuantumUnit
+
+FSYNC_INTERVAL = 1.0       # Max seconds between fsyncs of the journal
+TIME_RECORD_INTERVAL = 1.0 # Seconds between accumulated-time entries
+COMPACT_EVERY = 10000      # Events after which the journal is compacted into a snapshot
+COMPACT_INTERVAL = 300.0   # ...or seconds, whichever comes first (if anything was recorded)
+
+UNJOURNALED_OPS = frozenset(("mouse", "tick"))  # Transient engine events, not needed to rebuild the board
+
+_SNAPSHOT_PATTERN = re.compile(r"snapshot-(\d+)\.json$")
+_GENERATION_FILE_PATTERN = re.compile(r"(?:snapshot|journal)-(\d+)\.(?:json|log)$")
+
+
+def snapshot_path(directory, generation):
+    return os.path.join(directory, f"snapshot-{generation}.json")
+
+
+def journal_path(directory, generation):
+    return os.path.join(directory, f"journal-{generation}.log")
+
+
+def latest_generation(directory):
+    """Generation of the newest snapshot in `directory` (0 if there is none)."""
+    generations = [0]
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            match = _SNAPSHOT_PATTERN.match(name)
+            if match:
+                generations.append(int(match.group(1)))
+    return max(generations)
+
+
+def apply_event(engine, event):
+    """Re-apply one journaled (or recorded) engine event to a SimulationEngine."""
+    op = event["op"]
+    if op == "add":
+        engine.add_unit(QuantumUnit(event["text"], event["x"], event["y"], event["id"], event["symbol"]))
+    elif op == "move":
+        engine.move_unit(event["id"], event["x"], event["y"])
+    elif op == "remove":
+        engine.remove_unit(event["id"])
+    elif op == "entangle":
+        engine.entangle_units(event["a"], event["b"])
+    elif op == "reset":
+        engine.reset()
+    elif op == "observe":
+        engine.set_observing(event["on"])
+    elif op == "remote":
+        engine.set_remote_distortion(event["value"])
+    elif op == "mouse":
+        engine.observe_mouse(event["x"], event["y"])
+    elif op == "load":
+        engine.load_state(event["state"])
+    elif op == "time":
+        engine.accumulated_time = event["accumulated"]
+    else:
+        raise ValueError(f"Unknown journal op {op!r}")
+
+
+def recover(engine, directory):
+    """
+    Rebuild the engine from the latest snapshot plus the journal written
+    after it. Returns the number of journal events replayed. A torn or
+    corrupt tail is cut off the journal, so the next SessionJournal
+    appends after the last complete line.
+    """
+    generation = latest_generation(directory)
+    path = snapshot_path(directory, generation)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            engine.load_state(json.load(f))
+    else:
+        engine.reset()
+
+    replayed = 0
+    path = journal_path(directory, generation)
+    if os.path.exists(path):
+        with open(path, 'r+b') as f:
+            end = 0  # Byte offset just after the last complete line
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn write at crash time
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break
+                apply_event(engine, event)
+                replayed += 1
+                end += len(line)
+            if f.seek(0, os.SEEK_END) > end:
+                f.truncate(end)
+    return replayed
+
+
+class SessionJournal:
+    """
+    Records model mutations to an append-only journal in `directory`.
+    Attach it with engine.add_listener(journal), call tick() once per frame
+    (periodic time entries and compaction) and close() on exit.
+    """
+    enabled = True
+
+    def __init__(self, directory, fsync_interval=FSYNC_INTERVAL, compact_every=COMPACT_EVERY,
+                 compact_interval=COMPACT_INTERVAL, clock=time.monotonic):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self.compact_interval = compact_interval
+        self.clock = clock
+        self.generation = latest_generation(directory)
+        self.events_since_compaction = 0
+        self.last_compaction = clock()
+        self._last_time_record = clock()
+        self._last_accumulated = None
+        self.error = None  # Last exception raised by the writer thread
+        self._queue = queue.Queue()
+        # The first generation is handed over here: compact() may bump
+        # self.generation before the thread gets to open its journal
+        self._thread = threading.Thread(target=self._run, args=(self.generation,),
+                                        name="journal-writer", daemon=True)
+        self._thread.start()
+
+    # --- Recording (UI thread) ---
+
+    def record(self, event):
+        """Engine listener callback. A loaded board replaces everything journaled so far."""
+        op = event["op"]
+        if op in UNJOURNALED_OPS:
+            return
+        if op == "load":
+            self._start_generation(event["state"])
+            return
+        self.events_since_compaction += 1
+        self._queue.put(("event", event))
+
+    def tick(self, engine):
+        """Record the observed time now and then, and compact when due."""
+        now = self.clock()
+        if (now - self._last_time_record >= TIME_RECORD_INTERVAL
+                and engine.accumulated_time != self._last_accumulated):
+            self._last_time_record = now
+            self._last_accumulated = engine.accumulated_time
+            self.events_since_compaction += 1
+            self._queue.put(("event", {"op": "time", "accumulated": engine.accumulated_time}))
+        if self.events_since_compaction >= self.compact_every or (
+                self.events_since_compaction and now - self.last_compaction >= self.compact_interval):
+            self.compact(engine)
+
+    def compact(self, engine):
+        """
+        Start a new generation from the engine's current state. The board
+        is captured here without building the state (see
+        SimulationEngine.capture_state); building, encoding and writing it
+        happen on the writer thread.
+        """
+        self._start_generation(engine.capture_state())
+
+    def _start_generation(self, state):
+        self.generation += 1
+        self.events_since_compaction = 0
+        self.last_compaction = self.clock()
+        self._queue.put(("compact", self.generation, state))
+
+    def flush(self, timeout=None):
+        """Block until everything recorded so far is written and fsynced."""
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(("stop",))
+            self._thread.join()
+
+    # --- Writer thread ---
+
+    def _run(self, generation):
+        f = open(journal_path(self.directory, generation), 'a', encoding='utf-8')
+        last_sync = self.clock()
+        unsynced = False
+        try:
+            while True:
+                # Wait for work (or the next fsync deadline), then drain the queue
+                batch = []
+                try:
+                    batch.append(self._queue.get(timeout=self.fsync_interval if unsynced else None))
+                    while True:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+
+                lines = []
+                stop = False
+                waiters = []
+                for item in batch:
+                    kind = item[0]
+                    if kind == "event":
+                        lines.append(json.dumps(item[1], ensure_ascii=False, separators=(",", ":")))
+                        continue
+                    # Anything else needs the lines so far on disk first
+                    if lines:
+                        f.write("\n".join(lines) + "\n")
+                        lines = []
+                        unsynced = True
+                    if kind == "compact":
+                        f = self._compact(f, item[1], item[2])
+                        unsynced = False
+                    elif kind == "flush":
+                        waiters.append(item[1])
+                    elif kind == "stop":
+                        stop = True
+                        break
+                if lines:
+                    f.write("\n".join(lines) + "\n")
+                    unsynced = True
+
+                now = self.clock()
+                if unsynced and (waiters or stop or now - last_sync >= self.fsync_interval):
+                    self._sync(f)
+                    last_sync = now
+                    unsynced = False
+                for done in waiters:
+                    done.set()
+                if stop:
+                    return
+        except Exception as e:
+            self.error = e
+            print(f"Journal: Writer stopped: {e}")
+        finally:
+            f.close()
+
+    @staticmethod
+    def _sync(f):
+        f.flush()
+        os.fsync(f.fileno())
+
+    def _compact(self, f, generation, state):
+        """
+        Write the snapshot for `generation`, switch to its journal and drop
+        older files. `state` is a state dict or a capture to build it from.
+        """
+        if callable(state):
+            state = state()
+        self._sync(f)
+        path = snapshot_path(self.directory, generation)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as snapshot:
+            json.dump(state, snapshot, ensure_ascii=False, separators=(",", ":"))
+            self._sync(snapshot)
+        os.replace(tmp_path, path)
+        f.close()
+        f = open(journal_path(self.directory, generation), 'a', encoding='utf-8')
+        for name in os.listdir(self.directory):
+            match = _GENERATION_FILE_PATTERN.match(name)
+            if match and int(match.group(1)) < generation:
+                os.remove(os.path.join(self.directory, name))
+        return f
+
+
+class NullJournal:
+    """Default journal that records nothing."""
+    enabled = False
+
+    def _ignore(self, *args, **kwargs):
+        pass
+
+    record = tick = compact = close = _ignore
+
+    def flush(self, timeout=None):
+        return True
+
+
+NULL_JOURNAL = NullJournal()
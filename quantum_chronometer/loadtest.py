@@ -0,0 +1,282 @@
+"""
+Loopback load test for the distortion channel.
+
+Starts a real DistortionChannel on 127.0.0.1 and floods it from N
+simulated peers at a configurable packet rate per peer. The peers run as
+threads in this process or, with --processes, in worker subprocesses so
+they do not share the listener's GIL. A fraction of the datagrams can be
+malformed (random bytes, truncated, foreign magic) or oversized. The
+listener polls at the app's tick rate, and the report gives receive
+throughput, drop rate and latency percentiles, to find how many peers one
+instance absorbs before it falls behind:
+
+    python -m quantum_chronometer.loadtest --peers 10,100,1000 --processes --workers 4
+
+Valid packets carry their send time (time.monotonic, which is one clock
+for all processes on the machine) as the distortion value. Transport
+latency is send -> decoded on the listener's loop thread; delivery
+latency is send -> picked up by poll(), for the newest value per peer.
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import socket
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .channel import DistortionChannel
+from .peers import SEQ_MODULUS, new_instance_id
+from .wire import DISTORTION, MAGIC, pack_distortion
+
+POLL_INTERVAL = 0.05      # One QTimer interval, like the app
+TICK_BUDGET_MS = 50.0     # Transport p99 latency above this means the listener falls behind
+MAX_DROP_RATE = 0.01      # ... and so does losing more than this share of datagrams
+OVERSIZED_BYTES = 9000    # Jumbo-frame sized; the UDP limit is 65507
+PACE_INTERVAL = 0.001     # Seconds a generator sleeps when it is ahead of schedule
+BURST = 256               # Max datagrams a generator sends before rechecking the clock
+DRAIN_GRACE = 0.2         # Seconds the listener keeps polling after the generators stop
+PERCENTILES = (50, 90, 99)
+
+
+def percentiles(values, points=PERCENTILES):
+    """Nearest-rank percentiles of `values` as {"p50": ..., "max": ...}, None when empty."""
+    ordered = sorted(values)
+    result = {}
+    for point in points:
+        result[f"p{point}"] = ordered[max(0, -(-len(ordered) * point // 100) - 1)] if ordered else None
+    result["max"] = ordered[-1] if ordered else None
+    return result
+
+
+def _malformed(rng):
+    valid = pack_distortion(rng.getrandbits(64), 1, 0.0)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return rng.randbytes(DISTORTION.size)
+    if kind == 1:
+        return valid[:rng.randrange(DISTORTION.size)]
+    return b"XXXX" + valid[len(MAGIC):]
+
+
+def flood(target, peer_ids, rate, duration, malformed=0.0, oversized=0.0,
+          oversized_bytes=OVERSIZED_BYTES, seed=None):
+    """
+    Send distortion packets to `target` as every peer in `peer_ids`, round
+    robin, at `rate` packets per second per peer for `duration` seconds.
+    Shares `malformed` and `oversized` of the datagrams are garbage instead.
+    Returns the number of datagrams sent by kind and the monotonic times
+    sending started and finished. Runs in a generator thread or worker
+    process.
+    """
+    rng = random.Random(seed)
+    counts = {"valid": 0, "malformed": 0, "oversized": 0, "failed": 0}
+    if not peer_ids:
+        now = time.monotonic()
+        return counts, now, now
+    seqs = [0] * len(peer_ids)
+    padding = bytes(max(0, oversized_bytes - DISTORTION.size))
+    total_rate = rate * len(peer_ids)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    start = time.monotonic()
+    end = start + duration
+    sent = 0
+    peer = 0
+    try:
+        while True:
+            now = time.monotonic()
+            if now >= end:
+                break
+            due = int((now - start) * total_rate) - sent
+            if due <= 0:
+                time.sleep(min(PACE_INTERVAL, end - now))
+                continue
+            for _ in range(min(due, BURST)):
+                roll = rng.random()
+                if roll < malformed:
+                    kind, data = "malformed", _malformed(rng)
+                elif roll < malformed + oversized:
+                    kind, data = "oversized", pack_distortion(peer_ids[peer], 0, 0.0) + padding
+                else:
+                    seqs[peer] = (seqs[peer] + 1) % SEQ_MODULUS
+                    kind, data = "valid", pack_distortion(peer_ids[peer], seqs[peer], time.monotonic())
+                try:
+                    sock.sendto(data, target)
+                    counts[kind] += 1
+                except OSError:
+                    counts["failed"] += 1
+                sent += 1
+                peer = (peer + 1) % len(peer_ids)
+    finally:
+        sock.close()
+    return counts, start, time.monotonic()
+
+
+def run_load(peers, rate, duration, workers=1, processes=False, malformed=0.0, oversized=0.0,
+             oversized_bytes=OVERSIZED_BYTES, poll_interval=POLL_INTERVAL, rcvbuf=None, seed=0):
+    """
+    Flood a loopback DistortionChannel from `peers` simulated instances
+    spread over `workers` generator threads (or processes) and poll it
+    every `poll_interval` seconds. Returns the report as a dict.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    if rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    sock.bind(("127.0.0.1", 0))
+    target = sock.getsockname()
+    channel = DistortionChannel(sock, [])
+    transport = channel.transport
+
+    arrivals = []  # Transport latencies in seconds, appended on the loop thread
+    decode = transport.decode
+
+    def timed_decode(data, addr):
+        decoded = decode(data, addr)
+        if decoded is not None:
+            arrivals.append(time.monotonic() - decoded[1][1])
+        return decoded
+
+    transport.decode = timed_decode
+    if not channel.start():
+        raise RuntimeError(f"Transport failed to start: {transport.last_error}")
+
+    peer_ids = [new_instance_id() for _ in range(peers)]
+    workers = max(1, min(workers, peers))
+    if processes:
+        # Spawned, not forked: the listener's loop thread is already running
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    delivery = []
+    poll_costs = []
+    peers_seen = 0
+    try:
+        with executor:
+            start = time.monotonic()
+            futures = [
+                executor.submit(flood, target, peer_ids[i::workers], rate, duration,
+                                malformed, oversized, oversized_bytes, seed + i)
+                for i in range(workers)
+            ]
+            grace_end = None
+            next_poll = start
+            while grace_end is None or time.monotonic() < grace_end:
+                next_poll += poll_interval
+                time.sleep(max(0.0, next_poll - time.monotonic()))
+                now = time.monotonic()
+                batch = transport.drain()
+                for _seq, sent_at in batch.values():
+                    delivery.append(now - sent_at)
+                channel.apply(batch, now)
+                poll_costs.append(time.monotonic() - now)
+                peers_seen = max(peers_seen, len(channel.peers))
+                if grace_end is None and all(future.done() for future in futures):
+                    grace_end = now + DRAIN_GRACE
+            counts = {"valid": 0, "malformed": 0, "oversized": 0, "failed": 0}
+            started, finished = [], []
+            for future in futures:
+                worker_counts, worker_start, worker_end = future.result()
+                for kind, count in worker_counts.items():
+                    counts[kind] += count
+                started.append(worker_start)
+                finished.append(worker_end)
+    finally:
+        channel.stop()
+
+    sent = counts["valid"] + counts["malformed"] + counts["oversized"]
+    received = transport.received
+    rejected = transport.dropped
+    lost = max(0, sent - received - rejected)  # Never reached the decoder: socket buffer overflow
+    elapsed = max(finished) - min(started)  # Generator start-up is not counted
+
+    def to_ms(values):
+        return {key: None if value is None else value * 1000.0 for key, value in percentiles(values).items()}
+
+    report = {
+        "peers": peers,
+        "rate": rate,
+        "workers": workers,
+        "mode": "processes" if processes else "threads",
+        "elapsed": elapsed,
+        "sent": counts,
+        "offered_rate": sent / elapsed if elapsed > 0 else 0.0,
+        "received": received,
+        "rejected": rejected,
+        "lost": lost,
+        "drop_rate": lost / sent if sent else 0.0,
+        "throughput": (received + rejected) / elapsed if elapsed > 0 else 0.0,
+        "peers_seen": peers_seen,
+        "polls": len(poll_costs),
+        "transport_latency_ms": to_ms(arrivals),
+        "delivery_latency_ms": to_ms(delivery),
+        "poll_ms": to_ms(poll_costs),
+    }
+    report["behind"] = falls_behind(report)
+    return report
+
+
+def falls_behind(report):
+    """True if the listener lost datagrams or queued them for longer than a tick."""
+    p99 = report["transport_latency_ms"]["p99"]
+    return report["drop_rate"] > MAX_DROP_RATE or (p99 is not None and p99 > TICK_BUDGET_MS)
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def print_report(report):
+    transport = report["transport_latency_ms"]
+    delivery = report["delivery_latency_ms"]
+    print(f"{report['peers']:>6} peers  {report['offered_rate']:>9.0f} pkt/s offered  "
+          f"{report['throughput']:>9.0f} pkt/s received  drop {report['drop_rate']:6.2%}  "
+          f"rejected {report['rejected']:>6}  seen {report['peers_seen']:>6}  "
+          f"transport p50/p99 {_ms(transport['p50'])}/{_ms(transport['p99'])} ms  "
+          f"delivery p50/p99 {_ms(delivery['p50'])}/{_ms(delivery['p99'])} ms  "
+          f"poll max {_ms(report['poll_ms']['max'])} ms"
+          f"{'  BEHIND' if report['behind'] else ''}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flood a loopback Quantum Chronometer listener with simulated peers")
+    parser.add_argument("--peers", default="10,100,1000",
+                        help="Comma-separated peer counts to run (default: 10,100,1000)")
+    parser.add_argument("--rate", type=float, default=10.0, help="Packets per second per peer (default: 10)")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per run (default: 3)")
+    parser.add_argument("--workers", type=int, default=1, help="Generator threads or processes")
+    parser.add_argument("--processes", action="store_true", help="Run the generators as subprocesses")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Share of malformed datagrams")
+    parser.add_argument("--oversized", type=float, default=0.0, help="Share of oversized datagrams")
+    parser.add_argument("--oversized-bytes", type=int, default=OVERSIZED_BYTES)
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument("--rcvbuf", type=int, help="SO_RCVBUF of the listener socket")
+    parser.add_argument("--output", help="Write the reports as JSON to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        counts = [int(count) for count in args.peers.split(",")]
+    except ValueError:
+        parser.error(f"--peers expects comma-separated integers, got {args.peers!r}")
+
+    reports = []
+    for count in counts:
+        report = run_load(count, args.rate, args.duration, args.workers, args.processes,
+                          args.malformed, args.oversized, args.oversized_bytes,
+                          args.poll_interval, args.rcvbuf)
+        print_report(report)
+        reports.append(report)
+
+    kept_up = [report["peers"] for report in reports if not report["behind"]]
+    if kept_up:
+        print(f"Listener keeps up with {max(kept_up)} peers at {args.rate:g} pkt/s each")
+    else:
+        print("Listener falls behind at every peer count tried")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,36 +1,58 @@
+import os
 import sys
-import time
-import math
 import json
+import time
+import argparse
+from itertools import chain
 from PySide6.QtWidgets import QApplication, QFileDialog, QMessageBox
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import Qt, QTimer
 
-from .model import QuantumModel, QuantumUnit, SUPERPOSITION_SYMBOLS
+from .engine import SimulationEngine, MAX_CATCH_UP
+from .journal import NULL_JOURNAL, SessionJournal, recover
+from .model import PLANCK_TIME_MAGNIFIER, QuantumModel, SUPERPOSITION_SYMBOLS
 from .network import QuantumNetworkManager
+from .peers import AGGREGATIONS, DEFAULT_AGGREGATION
+from .profiler import NULL_PROFILER, TickProfiler, format_snapshot
+from .replay import SessionRecorder
+from .snapshot import is_snapshot_path
+from .sync import SYNC_PORT, StateSync
+from .transport import broadcast_socket
+
+STATE_FILE_FILTER = "JSON Files (*.json);;Binary Snapshots (*.qcs)"
+PROFILE_ENV_VAR = "QUANTUM_CHRONOMETER_PROFILE"  # Set to 1 to enable the tick profiler
+DEFAULT_SIM_HZ = 20      # Physics ticks per second
+DEFAULT_DISPLAY_HZ = 20  # Screen refreshes per second
+DEFAULT_RENDERER = "widgets"  # "painter" draws every unit in one pass (faster for big boards)
+
+
+def format_local_time(centis):
+    """HH:MM:SS.ss label for a per-unit local time given in hundredths of a second."""
+    h, rest = divmod(centis, 360000)
+    m, rest = divmod(rest, 6000)
+    return f"{h:02d}:{m:02d}:{rest / 100:05.2f}"
 
 
 class QuantumController:
     """
     Controller that connects the Model and View.
     Implements observation-based time: time only flows during observation.
+    The simulation runs at a fixed rate (sim_hz) driven by real elapsed time,
+    independently of how often the display refreshes (display_hz).
     """
     
-    def __init__(self):
-        self.model = QuantumModel()
+    def __init__(self, sim_hz=DEFAULT_SIM_HZ, display_hz=DEFAULT_DISPLAY_HZ, max_catch_up=MAX_CATCH_UP,
+                 renderer=DEFAULT_RENDERER, journal_dir=None, seed=None, record=None,
+                 peer_aggregation=DEFAULT_AGGREGATION, sync=False):
+        self.model = QuantumModel(seed=seed)
         
-        # Observation state
-        self.is_observing = False  # Continuous observation via button
-        self.observation_intensity = 0.0  # 0-1, based on mouse proximity
-        self.mouse_x = 0
-        self.mouse_y = 0
-        self.last_observation_time = time.time()
-        self.accumulated_time = 0.0  # Total "observed" time
+        # Simulation state (observation, observed time, tick) lives in the engine
+        self.engine = SimulationEngine(self.model, dt=1.0 / sim_hz, max_catch_up=max_catch_up)
         
         # Import View
         from .view import QuantumView, EmojiPickerDialog
         self.EmojiPickerDialog = EmojiPickerDialog
         
-        self.view = QuantumView(self)
+        self.view = QuantumView(self, renderer)
         
         # Connect Signals
         self.view.whiteboard.unit_dropped.connect(self.handle_new_unit_drop)
@@ -45,15 +67,49 @@ class QuantumController:
         self.view.reset_clicked.connect(self.handle_reset)
         self.view.grid_changed.connect(self.handle_grid_change)
         
+        # unit_id -> local time (in hundredths of a second) currently on screen
+        self._unit_time_labels = {}
+        
+        # Opt-in tick profiler with on-screen overlay
+        self.profiler = TickProfiler() if os.environ.get(PROFILE_ENV_VAR) else NULL_PROFILER
+        self.engine.set_profiler(self.profiler)
+        self.view.whiteboard.profiler = self.profiler
+        if self.profiler.enabled:
+            self.profiler.add_exporter(
+                lambda snapshot: self.view.set_profiler_overlay(format_snapshot(snapshot))
+            )
+        
+        # Opt-in crash-safe journal: resume the previous session, then keep recording
+        self.journal = NULL_JOURNAL
+        if journal_dir:
+            replayed = recover(self.engine, journal_dir)
+            print(f"Journal: Recovered {len(self.model.units)} units ({replayed} events replayed)")
+            self._rebuild_visual_units()
+            self.view.observe_button.setChecked(self.engine.is_observing)
+            self.journal = SessionJournal(journal_dir)
+            self.engine.add_listener(self.journal)
+        
+        # Opt-in recording of every input and tick to the file `record`, for deterministic replay
+        self.recorder = SessionRecorder(self.engine, record, seed) if record else None
+        
         # Network Manager (Phase 5.1)
-        self.network = QuantumNetworkManager()
+        self.network = QuantumNetworkManager(aggregation=peer_aggregation)
         self.network.remote_distortion_received.connect(self.handle_remote_distortion)
         self.network.start()
         
-        # Timer for main update loop
+        # Opt-in shared whiteboard with the other --sync instances on the LAN
+        self.sync = None
+        if sync:
+            self.sync = StateSync(self.engine, broadcast_socket(SYNC_PORT), [('<broadcast>', SYNC_PORT)])
+            self.sync.start()
+        
+        # Timer for main update loop, at the display rate; the engine runs
+        # however many fixed physics ticks the real elapsed time covers.
+        self.last_frame_time = time.monotonic()
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.update_loop)
-        self.timer.start(50)  # 20 FPS
+        self.timer.start(max(1, round(1000 / display_hz)))
 
         self.view.show()
 
@@ -68,8 +124,8 @@ class QuantumController:
         center_x = self.view.whiteboard.width() // 2
         center_y = self.view.whiteboard.height() // 2
         
-        unit = QuantumUnit(emoji_text, center_x, center_y)
-        self.model.add_unit(unit)
+        unit = self.model.create_unit(emoji_text, center_x, center_y)
+        self.engine.add_unit(unit)
         
         self.view.add_visual_unit(
             unit.id, emoji_text, center_x, center_y,
@@ -78,8 +134,8 @@ class QuantumController:
 
     def handle_new_unit_drop(self, text, position):
         """Handle a new unit being dropped."""
-        unit = QuantumUnit(text, position.x(), position.y())
-        self.model.add_unit(unit)
+        unit = self.model.create_unit(text, position.x(), position.y())
+        self.engine.add_unit(unit)
         self.view.add_visual_unit(
             unit.id, text, position.x(), position.y(),
             unit.superposition_symbol, unit.display_width
@@ -87,7 +143,7 @@ class QuantumController:
 
     def handle_unit_move(self, unit_id, new_x, new_y):
         """Handle an existing unit being moved."""
-        self.model.update_unit_position(unit_id, new_x, new_y)
+        self.engine.move_unit(unit_id, new_x, new_y)
 
     def handle_wave_collapse(self):
         """Mouse movement triggers observation (not collapse in this mode)."""
@@ -96,150 +152,156 @@ class QuantumController:
 
     def handle_observe_toggle(self, is_checked):
         """Toggle continuous observation mode."""
-        self.is_observing = is_checked
-        if is_checked:
-            self.last_observation_time = time.time()
+        self.engine.set_observing(is_checked)
 
     def handle_mouse_observation(self, x, y):
         """Handle mouse position for proximity-based observation intensity."""
-        self.mouse_x = x
-        self.mouse_y = y
-        
-        # Calculate observation intensity based on proximity to any unit
-        max_intensity = 0.0
-        for unit in self.model.units:
-            distance = math.sqrt((x - unit.x)**2 + (y - unit.y)**2)
-            # Closer = higher intensity (max at 0, min at 200+)
-            if distance < 200:
-                intensity = 1.0 - (distance / 200.0)
-                max_intensity = max(max_intensity, intensity)
-        
-        # Always some base observation from mouse movement
-        self.observation_intensity = max(0.1, max_intensity)
-        self.last_observation_time = time.time()
+        self.engine.observe_mouse(x, y)
 
     def update_loop(self):
         """Main update loop - observation-based time mechanics."""
-        current_real_time = time.time()
-        
-        # Determine if time should flow
-        is_observing_time = False
-        
-        # 1. Continuous Observation
-        if self.is_observing:
-            is_observing_time = True
-            
-        # 2. Mouse Proximity Observation
-        # If mouse moved recently (last 0.2s)
-        if time.time() - self.last_observation_time < 0.2:
-            is_observing_time = True
-            
-        # dt is the time step for the model update
-        dt = 0.05 # Corresponds to the QTimer interval (50ms)
+        profiler = self.profiler
+        profiler.begin_frame()
         
-        # Update Model
-        self.model.update_unit_times(
-            dt, 
-            is_observing=is_observing_time,
-            mouse_pos=(self.mouse_x, self.mouse_y)
-        )
+        with profiler.phase("tick"):
+            # Advance the simulation by the real time elapsed since the last frame
+            now = time.monotonic()
+            ticks = self.engine.advance(now - self.last_frame_time)
+            self.last_frame_time = now
         
-        # Broadast local distortion (Phase 5.1)
-        # Only broadcast if significant to reduce traffic
-        if abs(self.model.time_distortion) > 0.0001:
-            self.network.broadcast_distortion(self.model.time_distortion)
+        # Periodic time entries and compaction; the writes happen off this thread
+        self.journal.tick(self.engine)
         
-        # Update View
-        if is_observing_time:
-            self.accumulated_time += dt
+        with profiler.phase("broadcast"):
+            # Deliver what the network received since the last frame
+            self.network.poll()
+            if self.sync is not None:
+                self._apply_sync_changes(self.sync.poll())
             
-        # Update Global Time Display
-        magnified_time = self.accumulated_time + self.model.time_distortion
-        distortion = self.model.time_distortion
-        
-        h = int(magnified_time // 3600)
-        m = int((magnified_time % 3600) // 60)
-        s = magnified_time % 60
-        time_str = f"{h:02d}:{m:02d}:{s:06.3f}"
+            # Broadast local distortion (Phase 5.1)
+            # The network's send policy drops values that barely changed
+            if ticks:
+                self.network.broadcast_distortion(self.model.time_distortion)
         
-        # Superposition Marker
-        if distortion > 0.5:
-            marker = SUPERPOSITION_SYMBOLS[0]
-        elif distortion < -0.5:
-            marker = SUPERPOSITION_SYMBOLS[2]
-        else:
-            marker = SUPERPOSITION_SYMBOLS[1]
+        with profiler.phase("format"):
+            # Update Global Time Display, interpolated between ticks when
+            # the display refreshes faster than the simulation runs
+            magnified_time = self.engine.display_magnified_time
+            distortion = self.model.time_distortion
             
-        self.view.update_time_display(time_str, marker)
-        self.view.update_distortion_display(distortion)
+            h = int(magnified_time // 3600)
+            m = int((magnified_time % 3600) // 60)
+            s = magnified_time % 60
+            time_str = f"{h:02d}:{m:02d}:{s:06.3f}"
+            
+            # Superposition Marker
+            if distortion > 0.5:
+                marker = SUPERPOSITION_SYMBOLS[0]
+            elif distortion < -0.5:
+                marker = SUPERPOSITION_SYMBOLS[2]
+            else:
+                marker = SUPERPOSITION_SYMBOLS[1]
+                
+            self.view.update_time_display(time_str, marker)
+            self.view.update_distortion_display(distortion)
+            
+            # Update Per-Unit Local Times, sending only labels whose
+            # displayed hundredths of a second changed since the last frame
+            observed_time = self.model.start_time + self.engine.accumulated_time
+            lag = self.engine.display_unit_lag * PLANCK_TIME_MAGNIFIER
+            shown = self._unit_time_labels
+            changed = {}
+            for unit in self.model.units:
+                centis = round((unit.get_local_magnified_time(observed_time) - lag) * 100)
+                if shown.get(unit.id) == centis:
+                    continue
+                shown[unit.id] = centis
+                changed[unit.id] = format_local_time(centis)
+            if changed:
+                self.view.update_unit_local_times(changed)
         
-        # Update Per-Unit Local Times
-        for unit in self.model.units:
-            observed_time = self.model.start_time + self.accumulated_time
-            local_time = unit.get_local_magnified_time(observed_time)
-            local_s = local_time % 60
-            local_m = int((local_time % 3600) // 60)
-            local_h = int(local_time // 3600)
-            local_str = f"{local_h:02d}:{local_m:02d}:{local_s:05.2f}"
-            self.view.update_unit_local_time(unit.id, local_str)
+        with profiler.phase("proximity"):
+            # Update Proximity Lines from the pairs that changed since the last frame
+            changes = self.model.take_proximity_changes()
+            if changes.reset or changes.added or changes.removed or changes.updated:
+                lines = {
+                    (u1.id, u2.id): ((u1.x, u1.y), (u2.x, u2.y))
+                    for u1, u2 in chain(changes.added, changes.updated)
+                }
+                self.view.update_proximity_lines(lines, changes.removed, changes.reset)
         
-        # Update Proximity Lines
-        proximity_pairs = self.model.get_proximity_pairs(threshold=100)
-        line_coords = [((u1.x, u1.y), (u2.x, u2.y)) for u1, u2 in proximity_pairs]
-        self.view.set_proximity_pairs(line_coords)
+        profiler.end_frame()
 
     def handle_save(self):
-        """Save current state to a JSON file."""
+        """Save current state to a JSON file, or a binary snapshot for *.qcs."""
         file_path, _ = QFileDialog.getSaveFileName(
             self.view,
             "Save Quantum State",
             "quantum_state.json",
-            "JSON Files (*.json)"
+            STATE_FILE_FILTER
         )
         if file_path:
             try:
-                state = self.model.save_state(self.accumulated_time)
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(state, f, ensure_ascii=False, indent=2)
+                if is_snapshot_path(file_path):
+                    self.engine.save_snapshot(file_path)
+                else:
+                    state = self.engine.save_state()
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        json.dump(state, f, ensure_ascii=False, indent=2)
                 QMessageBox.information(self.view, "Saved", f"State saved to {file_path}")
             except Exception as e:
                 QMessageBox.warning(self.view, "Error", f"Failed to save: {e}")
 
     def handle_load(self):
-        """Load state from a JSON file."""
+        """Load state from a JSON file or a binary snapshot (*.qcs)."""
         file_path, _ = QFileDialog.getOpenFileName(
             self.view,
             "Load Quantum State",
             "",
-            "JSON Files (*.json)"
+            STATE_FILE_FILTER
         )
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    state = json.load(f)
-                
-                # Clear current view
-                self.view.whiteboard.unit_widgets.clear()
-                # Clear whiteboard widgets
-                for child in self.view.whiteboard.children():
-                    if hasattr(child, 'unit_id'):
-                        child.deleteLater()
-                
                 # Load state into model
-                self.model.load_state(state)
-                self.accumulated_time = state.get("accumulated_time", 0.0)
+                if is_snapshot_path(file_path):
+                    self.engine.load_snapshot(file_path)
+                else:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        state = json.load(f)
+                    self.engine.load_state(state)
                 
-                # Recreate visual units
-                for unit in self.model.units:
-                    self.view.add_visual_unit(
-                        unit.id, unit.text, unit.x, unit.y,
-                        unit.superposition_symbol, unit.display_width
-                    )
+                self._rebuild_visual_units()
                 
                 QMessageBox.information(self.view, "Loaded", f"State loaded from {file_path}")
             except Exception as e:
                 QMessageBox.warning(self.view, "Error", f"Failed to load: {e}")
 
+    def _apply_sync_changes(self, changes):
+        """Mirror board changes made by other instances on the whiteboard."""
+        if changes.reset:
+            self._rebuild_visual_units()
+            return
+        for unit_id in changes.removed:
+            self.view.remove_visual_unit(unit_id)
+            self._unit_time_labels.pop(unit_id, None)
+        for unit in changes.added:
+            self.view.add_visual_unit(
+                unit.id, unit.text, unit.x, unit.y,
+                unit.superposition_symbol, unit.display_width
+            )
+        for unit in changes.moved:
+            self.view.move_visual_unit(unit.id, unit.x, unit.y)
+
+    def _rebuild_visual_units(self):
+        """Replace every unit on the whiteboard with the model's units."""
+        self.view.whiteboard.clear_units()
+        self._unit_time_labels.clear()
+        for unit in self.model.units:
+            self.view.add_visual_unit(
+                unit.id, unit.text, unit.x, unit.y,
+                unit.superposition_symbol, unit.display_width
+            )
+
     def handle_screenshot(self):
         """Save a screenshot of the whiteboard."""
         file_path, _ = QFileDialog.getSaveFileName(
@@ -265,16 +327,11 @@ class QuantumController:
             QMessageBox.Yes | QMessageBox.No
         )
         if confirm == QMessageBox.Yes:
-            self.model.units.clear()
-            self.model.entangled_pairs.clear()
-            self.model.time_distortion = 0.0
-            self.accumulated_time = 0.0
+            self.engine.reset()
             
             # Clear UI
-            self.view.whiteboard.unit_widgets.clear()
-            for child in self.view.whiteboard.children():
-                if hasattr(child, 'unit_id'):
-                    child.deleteLater()
+            self.view.whiteboard.clear_units()
+            self._unit_time_labels.clear()
             
             # Reset view labels
             self.view.update_time_display("00:00:00.000", SUPERPOSITION_SYMBOLS[1])
@@ -286,7 +343,7 @@ class QuantumController:
 
     def handle_remote_distortion(self, remote_value):
         """
-        Handle distortion received from network.
+        Handle distortion received from network (all peers, aggregated).
         For now, we just add it to the model's current distortion for display/effect.
         This is a simple additive interference.
         """
@@ -294,13 +351,47 @@ class QuantumController:
         # Since model calculates distortion every frame, we might need a property 'external_distortion'
         # For phase 5.1 MVP, let's just modify the view's display to show it?
         # Or better, update model to accept external input.
-        self.model.external_distortion = remote_value
+        self.engine.set_remote_distortion(remote_value)
+
+def parse_args(argv):
+    from .view import QuantumWhiteboardWidget
+    parser = argparse.ArgumentParser(description="Quantum Chronometer")
+    parser.add_argument("--sim-hz", type=float, default=DEFAULT_SIM_HZ,
+                        help="Physics ticks per second")
+    parser.add_argument("--display-hz", type=float, default=DEFAULT_DISPLAY_HZ,
+                        help="Screen refreshes per second")
+    parser.add_argument("--max-catch-up", type=float, default=MAX_CATCH_UP,
+                        help="Max seconds of backlog simulated after a stall")
+    parser.add_argument("--renderer", choices=QuantumWhiteboardWidget.RENDERERS, default=DEFAULT_RENDERER,
+                        help="Draw units as one widget each or in a single painter pass")
+    parser.add_argument("--journal", metavar="DIR",
+                        help="Journal every change to DIR and resume from it after a crash")
+    parser.add_argument("--seed", type=int,
+                        help="Seed the simulation's randomness (reproducible runs)")
+    parser.add_argument("--record", metavar="FILE",
+                        help="Record every input and tick to FILE as they happen, for "
+                             "python -m quantum_chronometer.replay FILE")
+    parser.add_argument("--peer-aggregation", choices=AGGREGATIONS, default=DEFAULT_AGGREGATION,
+                        help="How the distortions of other instances are combined")
+    parser.add_argument("--sync", action="store_true",
+                        help="Share the whiteboard with the other instances on the LAN started with --sync")
+    # Leave unknown arguments (e.g. Qt's own options) to QApplication
+    return parser.parse_known_args(argv)
+
 
 def main():
-    app = QApplication(sys.argv)
-    controller = QuantumController()
+    args, qt_argv = parse_args(sys.argv[1:])
+    app = QApplication(sys.argv[:1] + qt_argv)
+    controller = QuantumController(args.sim_hz, args.display_hz, args.max_catch_up, args.renderer,
+                                   args.journal, args.seed, record=args.record,
+                                   peer_aggregation=args.peer_aggregation, sync=args.sync)
     ret = app.exec()
     controller.network.stop()
+    if controller.sync is not None:
+        controller.sync.stop()
+    controller.journal.close()
+    if controller.recorder is not None:
+        controller.recorder.save()
     sys.exit(ret)
 
 
@@ -1,14 +1,36 @@
+import sys
 import time
 import math
 import uuid
+import random
 import re
-from random import choice, uniform
+from collections import namedtuple
+from functools import lru_cache
+
+from .entanglement import EntanglementGraph
+from .motion import MotionTracker
+from .noise import SuperpositionNoise
+from .parallel import ParallelGravity
+from .profiler import NULL_PROFILER
+from .proximity import ProximityTracker
+from .spatial import SpatialHashGrid
+from .store import ArrayUnitStore, np
 
 PLANCK_TIME_MAGNIFIER = 1.0  # Seconds per "magnified Planck Time unit"
 DISTANCE_GRAVITY_FACTOR = 0.05  # How much distance affects time (5% per unit distance)
 CLOSE_GRAVITY_FACTOR = 0.10     # Additional effect when units are close (10%)
 BLACK_HOLE_FACTOR = 0.50        # Extra distortion multiplier for black hole units
+GRAVITY_THRESHOLD = 100         # Max distance (px) at which units attract each other
+GRAVITY_FALLOFF = 50.0          # Distance (px) at which a neighbour pulls with exactly CLOSE_GRAVITY_FACTOR
+MOVEMENT_FACTOR = 0.05          # Max slow-down of a moving unit's clock
+MOVEMENT_SPEED = 500.0          # Speed (px/s) at which a unit gets half of MOVEMENT_FACTOR
+GRAVITY_REFRESH_FRACTION = 0.005  # Above this share of moved units, recompute gravity for every row
 SUPERPOSITION_SYMBOLS = ['+', '*', '~']
+SUPERPOSITION_NOISE = {           # Uniform noise range (low, high) per symbol
+    '+': (0.001, 0.005),
+    '*': (-0.002, 0.002),
+    '~': (-0.005, -0.001),
+}
 BLACK_HOLE_EMOJIS = ['🕳️', '🕳']  # Black hole emoji variants
 
 # Regex pattern to count emojis (handles most common emoji patterns)
@@ -23,6 +45,39 @@ EMOJI_PATTERN = re.compile(
     "|."  # Fallback for single characters
 )
 
+TEXT_METRICS_CACHE_SIZE = 4096  # Distinct unit texts remembered by measure_text
+
+TextMetrics = namedtuple("TextMetrics", ["text", "emoji_count", "is_black_hole"])
+
+
+def movement_distortion(speed):
+    """
+    Movement Effect of a unit moving at `speed` px/s: moving clocks run
+    slow, approaching -MOVEMENT_FACTOR for fast moves. Works on floats and
+    on numpy arrays of speeds.
+    """
+    squared = speed * speed
+    return -MOVEMENT_FACTOR * squared / (squared + MOVEMENT_SPEED * MOVEMENT_SPEED)
+
+
+@lru_cache(maxsize=TEXT_METRICS_CACHE_SIZE)
+def measure_text(text):
+    """
+    Measure a unit's text once and share the result between every unit with
+    the same text. The returned text is interned so identical strings are
+    only stored once.
+    """
+    # Simple approach: count grapheme clusters
+    # For emojis, this is a reasonable approximation
+    emojis = EMOJI_PATTERN.findall(text)
+    # Filter out empty matches
+    count = len([e for e in emojis if e.strip()])
+    return TextMetrics(
+        sys.intern(text),
+        max(1, count),  # At least 1
+        any(bh in text for bh in BLACK_HOLE_EMOJIS),
+    )
+
 
 class QuantumUnit:
     """
@@ -30,39 +85,60 @@ class QuantumUnit:
     Can contain one or multiple emojis.
     Its position and proximity to others affect time measurement.
     Each unit has its own local chronometer.
+    Values derived from the text are measured when the text is set.
     """
+    __slots__ = (
+        "id", "_text", "_metrics", "_display_width", "x", "y",
+        "superposition_symbol", "start_time", "elapsed_time_sec", "local_distortion",
+        "_store", "_row",
+    )
     BASE_WIDTH = 60   # Base display width for single emoji
     EXTRA_WIDTH = 30  # Additional width per extra emoji
     
-    def __init__(self, text, x, y):
-        self.id = str(uuid.uuid4())
+    def __init__(self, text, x, y, unit_id=None, superposition_symbol=None, rng=None, clock=time.time):
+        """
+        rng: random.Random used for the generated id and superposition
+             symbol (default: uuid4 and the global random module).
+        clock: time source for start_time.
+        """
+        if unit_id is None:
+            unit_id = str(uuid.uuid4()) if rng is None else str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        self.id = unit_id
         self.text = text
         self.x = x
         self.y = y
-        self.superposition_symbol = choice(SUPERPOSITION_SYMBOLS)
-        self.start_time = time.time()
+        if superposition_symbol is None:
+            superposition_symbol = (rng or random).choice(SUPERPOSITION_SYMBOLS)
+        self.superposition_symbol = superposition_symbol
+        self.start_time = clock()
         self.elapsed_time_sec = 0.0
         self.local_distortion = 0.0
 
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        metrics = measure_text(value)
+        self._text = metrics.text
+        self._metrics = metrics
+        self._display_width = self.BASE_WIDTH + (metrics.emoji_count - 1) * self.EXTRA_WIDTH
+
     @property
     def emoji_count(self):
-        """Count the number of emoji/characters in this unit."""
-        # Simple approach: count grapheme clusters
-        # For emojis, this is a reasonable approximation
-        emojis = re.findall(EMOJI_PATTERN, self.text)
-        # Filter out empty matches
-        count = len([e for e in emojis if e.strip()])
-        return max(1, count)  # At least 1
+        """Number of emoji/characters in this unit."""
+        return self._metrics.emoji_count
 
     @property
     def display_width(self):
-        """Calculate display width based on emoji count."""
-        return self.BASE_WIDTH + (self.emoji_count - 1) * self.EXTRA_WIDTH
+        """Display width based on emoji count."""
+        return self._display_width
 
     @property
     def is_black_hole(self):
-        """Check if this unit contains a black hole emoji."""
-        return any(bh in self.text for bh in BLACK_HOLE_EMOJIS)
+        """Whether this unit contains a black hole emoji."""
+        return self._metrics.is_black_hole
 
     def accumulate_time(self, delta_seconds):
         """Accumulate time delta."""
@@ -81,82 +157,296 @@ class QuantumUnit:
         return (self.elapsed_time_sec + self.local_distortion) * PLANCK_TIME_MAGNIFIER
 
 
+def _stored_column(name):
+    """Property reading/writing one float64 column of the unit's store row."""
+    def getter(self):
+        return float(getattr(self._store, name)[self._row])
+
+    def setter(self, value):
+        getattr(self._store, name)[self._row] = value
+
+    return property(getter, setter)
+
+
+class ArrayBackedUnit(QuantumUnit):
+    """
+    A QuantumUnit whose numeric state lives in an ArrayUnitStore row.
+    Units are switched to this class when added to a model using the
+    "numpy" backend, and switched back (with their values copied out)
+    when they leave it, so the plain backend keeps fast attribute access.
+    """
+    __slots__ = ()
+    x = _stored_column("x")
+    y = _stored_column("y")
+    elapsed_time_sec = _stored_column("elapsed_time_sec")
+    local_distortion = _stored_column("local_distortion")
+
+    @property
+    def superposition_symbol(self):
+        return self._store.symbols[self._store.superposition[self._row]]
+
+    @superposition_symbol.setter
+    def superposition_symbol(self, symbol):
+        self._store.superposition[self._row] = self._store.code_of(symbol)
+
+    @QuantumUnit.text.setter
+    def text(self, value):
+        QuantumUnit.text.fset(self, value)
+        self._store.black_hole[self._row] = 1 if self.is_black_hole else 0
+
+    @classmethod
+    def attach(cls, unit, store):
+        """Move a plain unit's state into a new store row."""
+        unit._row = store.append(
+            unit, unit.x, unit.y, unit.elapsed_time_sec, unit.local_distortion,
+            unit.superposition_symbol, unit.is_black_hole
+        )
+        unit._store = store
+        unit.__class__ = cls
+
+    def remove_from_store(self):
+        """Detach this unit and free its row, keeping the other rows valid."""
+        store, row = self._store, self._row
+        self.detach()
+        moved = store.remove_row(row)
+        if moved is not None:
+            moved._row = row
+
+    def detach(self):
+        """Copy state back onto the unit and turn it into a plain QuantumUnit."""
+        values = (self.x, self.y, self.elapsed_time_sec, self.local_distortion, self.superposition_symbol)
+        self.__class__ = QuantumUnit
+        self.x, self.y, self.elapsed_time_sec, self.local_distortion, self.superposition_symbol = values
+        del self._store, self._row
+
+
 class QuantumModel:
     """
     Manages the state of the Quantum Chronometer:
     - Time tracking
     - List of units
     - Calculation of time distortion (Quantum Gravity Effects)
+
+    backend: "python" keeps each unit's state on the unit object;
+             "numpy" keeps it in an ArrayUnitStore and vectorizes the tick;
+             "parallel" is "numpy" with the gravity term computed by a
+             pool of `workers` processes (see parallel.py). Call close()
+             when done with it.
+    seed: seeds the superposition noise and the units made by create_unit,
+          so a run with the same seed and inputs is reproducible.
+    clock: time source (seconds) for start_time and the movement effect.
     """
-    def __init__(self):
+    BACKENDS = ("python", "numpy", "parallel")
+
+    def __init__(self, backend="python", seed=None, clock=time.time, workers=None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {self.BACKENDS}")
+        self.backend = backend
+        self.store = ArrayUnitStore(SUPERPOSITION_SYMBOLS) if backend != "python" else None
+        self.gravity = None
+        if backend == "parallel":
+            self.gravity = ParallelGravity(GRAVITY_THRESHOLD, CLOSE_GRAVITY_FACTOR, GRAVITY_FALLOFF, workers)
+        self._noise_bounds = None
+        if self.store is not None:
+            self._noise_bounds = np.array([
+                SUPERPOSITION_NOISE.get(symbol, SUPERPOSITION_NOISE['~']) for symbol in self.store.symbols
+            ])
+        self._component_rows = None  # (cache key, rows, starts, sizes) for vectorized entanglement
+        self._gravity_cache = None   # (store layout version, proximity_delta) for the array backends
+        self._gravity_moved = {}     # unit_id -> position when the cache was computed, for moved units
+        self.clock = clock
+        self.reseed(seed)
         self.units = []
-        self.start_time = time.time()
+        self._units_by_id = {}  # unit_id -> unit, kept in sync with self.units
+        self.start_time = clock()
         self.time_distortion = 0.0
-        self.entangled_pairs = []  # List of (unit_id1, unit_id2) tuples
+        self.entanglement = EntanglementGraph()
         self.external_distortion = 0.0 # From network (Phase 5.1)
+        self.last_flow_delta = 0.0  # Elapsed time every unit gained in the last tick
+        # Spatial index for neighbour queries; cell size matches the gravity
+        # threshold so a query only touches the 3x3 cells around a unit.
+        self._grid = SpatialHashGrid(GRAVITY_THRESHOLD)
+        # Pairs within GRAVITY_THRESHOLD, kept current as units are added or moved
+        self.proximity = ProximityTracker(self._grid, GRAVITY_THRESHOLD)
+        # Recent positions of the units that moved, for the movement effect
+        self.motion = MotionTracker()
+        # Per-phase tick timing; swap in a TickProfiler to enable
+        self.profiler = NULL_PROFILER
         
+    def reseed(self, seed=None):
+        """
+        Restart the model's random streams. Superposition noise and new
+        units (create_unit) draw from separate generators, so replaying a
+        run does not depend on how many units were created in it.
+        """
+        self.seed = seed
+        self.noise = SuperpositionNoise(SUPERPOSITION_NOISE, '~', seed)
+        self.unit_random = random.Random(None if seed is None else f"units-{seed}")
+        self._rng = np.random.default_rng(seed) if self.store is not None else None
+
+    def get_random_state(self):
+        """JSON-serializable state of every random stream (see set_random_state)."""
+        return {
+            "noise": self.noise.get_state(),
+            "units": self.unit_random.getstate(),
+            "numpy": self._rng.bit_generator.state if self._rng is not None else None,
+        }
+
+    def set_random_state(self, state):
+        """Resume the random streams from get_random_state(), also after a JSON round trip."""
+        self.noise.set_state(state["noise"])
+        version, internal, gauss_next = state["units"]
+        self.unit_random.setstate((version, tuple(internal), gauss_next))
+        if self._rng is not None and state.get("numpy") is not None:
+            self._rng.bit_generator.state = state["numpy"]
+
+    def create_unit(self, text, x, y):
+        """New unit (not yet added) whose id and symbol come from the model's seeded generator."""
+        return QuantumUnit(text, x, y, rng=self.unit_random, clock=self.clock)
+
     def add_unit(self, unit):
+        if self.store is not None:
+            cached = self._cached_proximity()
+            ArrayBackedUnit.attach(unit, self.store)
+            if cached is not None:
+                # New last row; refreshed with its neighbours like a move
+                self._gravity_cache = (self.store.layout_version, np.append(cached, 0.0))
+                self._gravity_moved.setdefault(unit.id, (unit.x, unit.y))
         self.units.append(unit)
+        self._units_by_id[unit.id] = unit
+        self._grid.insert(unit)
+        self.proximity.track(unit)
+
+    def remove_unit(self, unit_id):
+        """
+        Remove a unit by ID, along with every entanglement that references it.
+        Returns True if the unit existed.
+        """
+        unit = self._units_by_id.pop(unit_id, None)
+        if unit is None:
+            return False
+        self.units.remove(unit)
+        self._grid.remove(unit_id)
+        self.proximity.untrack(unit_id)
+        self.motion.forget(unit_id)
+        if self.store is not None:
+            cached = self._cached_proximity()
+            self._gravity_moved.pop(unit_id, None)
+            if cached is not None:
+                for other, _ in self._grid.neighbors(unit.x, unit.y, GRAVITY_THRESHOLD):
+                    self._gravity_moved.setdefault(other.id, (other.x, other.y))
+            row, last = unit._row, self.store.size - 1
+            unit.remove_from_store()
+            if cached is not None:
+                cached[row] = cached[last]  # Mirrors the store moving its last row into the gap
+                self._gravity_cache = (self.store.layout_version, cached[:last])
+        self.entanglement.remove_unit(unit_id)
+        return True
+
+    def _clear_store(self):
+        if self.store is not None:
+            for unit in self.store.units:
+                unit.detach()
+            self.store.clear()
+
+    def close(self):
+        """Stop the "parallel" backend's worker processes. The model stays usable."""
+        if self.gravity is not None:
+            self.gravity.close()
+
+    def reset(self):
+        """Remove all units and entanglements and clear the distortion."""
+        self._clear_store()
+        self.units = []
+        self._units_by_id = {}
+        self.entanglement.clear()
+        self._grid.clear()
+        self.proximity.clear()
+        self.motion.clear()
+        self.time_distortion = 0.0
+
+    @property
+    def entangled_pairs(self):
+        """List of (unit_id1, unit_id2) tuples, without duplicates."""
+        return self.entanglement.pairs()
 
     def entangle_units(self, unit_id1, unit_id2):
-        """Create an entanglement between two units."""
-        unit1 = self.get_unit_by_id(unit_id1)
-        unit2 = self.get_unit_by_id(unit_id2)
-        if unit1 and unit2 and unit_id1 != unit_id2:
-            self.entangled_pairs.append((unit_id1, unit_id2))
-            return True
+        """
+        Create an entanglement between two units.
+        Returns False if either unit is unknown or the pair already exists.
+        """
+        if unit_id1 in self._units_by_id and unit_id2 in self._units_by_id:
+            return self.entanglement.add(unit_id1, unit_id2)
         return False
 
+    def are_entangled(self, unit_id1, unit_id2):
+        """True if the two units are directly entangled."""
+        return self.entanglement.are_entangled(unit_id1, unit_id2)
+
     def get_entangled_pairs(self):
         """Return list of entangled unit pairs as (unit1, unit2) tuples."""
-        pairs = []
-        for id1, id2 in self.entangled_pairs:
-            unit1 = self.get_unit_by_id(id1)
-            unit2 = self.get_unit_by_id(id2)
-            if unit1 and unit2:
-                pairs.append((unit1, unit2))
-        return pairs
+        units = self._units_by_id
+        return [(units[id1], units[id2]) for id1, id2 in self.entanglement]
 
     def get_unit_by_id(self, unit_id):
         """Retrieve a unit by its unique ID."""
-        for unit in self.units:
-            if unit.id == unit_id:
-                return unit
-        return None
+        return self._units_by_id.get(unit_id)
 
-    def update_unit_position(self, unit_id, new_x, new_y):
-        """Update a unit's position by ID. Returns True if successful."""
+    def update_unit_position(self, unit_id, new_x, new_y, now=None):
+        """
+        Update a unit's position by ID. Returns True if successful.
+        now: time of the move (default: self.clock()), for the movement effect.
+        """
         unit = self.get_unit_by_id(unit_id)
         if unit:
-            unit.x = new_x
-            unit.y = new_y
+            self._set_position(unit, new_x, new_y, self.clock() if now is None else now)
             return True
         return False
         
     def move_unit(self, unit, new_x, new_y):
         """Direct move (deprecated, use update_unit_position for ID-based)."""
+        if unit.id not in self._units_by_id:
+            return
+        self._set_position(unit, new_x, new_y, self.clock())
+
+    def _set_position(self, unit, new_x, new_y, now):
+        self.motion.record(unit.id, unit.x, unit.y, new_x, new_y, now)
+        if self._gravity_cache is not None:
+            self._gravity_moved.setdefault(unit.id, (unit.x, unit.y))
         unit.x = new_x
         unit.y = new_y
+        self._grid.update(unit)
+        self.proximity.track(unit)
         
     def collapse_wave_function(self):
         """Resets the time distortion to zero (Observation Effect)."""
         self.time_distortion = 0.0
 
-    def get_proximity_pairs(self, threshold=100):
+    def units_near(self, x, y, radius):
+        """Yield (unit, distance) for every unit closer than radius to (x, y)."""
+        return self._grid.neighbors(x, y, radius)
+
+    def get_proximity_pairs(self, threshold=GRAVITY_THRESHOLD):
         """
         Returns list of (unit1, unit2) tuples for units within threshold distance.
         Used for drawing proximity lines in the view.
         """
-        pairs = []
-        for i, unit1 in enumerate(self.units):
-            for unit2 in self.units[i+1:]:
-                distance = math.sqrt(
-                    (unit1.x - unit2.x)**2 + 
-                    (unit1.y - unit2.y)**2
-                )
-                if distance < threshold:
-                    pairs.append((unit1, unit2))
-        return pairs
+        if self.store is not None:
+            owners = self.store.units
+            return [
+                (owners[i], owners[j])
+                for rows1, rows2, _ in self.store.pairs_within(threshold)
+                for i, j in zip(rows1.tolist(), rows2.tolist())
+            ]
+        return [(unit1, unit2) for unit1, unit2, _ in self._grid.pairs_within(threshold)]
+
+    def take_proximity_changes(self):
+        """
+        ProximityChanges (added, removed, updated) of the proximity pairs
+        since the previous call. All three lists are empty when nothing
+        moved, so the view can skip redrawing the proximity lines.
+        """
+        return self.proximity.take_changes()
         
     def calculate_magnified_time(self, current_time):
         """
@@ -167,79 +457,247 @@ class QuantumModel:
         distorted_time = elapsed_sec + self.time_distortion
         return distorted_time * PLANCK_TIME_MAGNIFIER
 
-    def update_unit_times(self, dt, is_observing=False, mouse_pos=None):
+    def update_unit_times(self, dt, is_observing=False, mouse_pos=None, now=None):
         """
         Applies 'Quantum Gravity Effects' to time measurement.
         dt: time step (e.g., 0.05s)
         is_observing: if True, time moves forward
         mouse_pos: (x, y) tuple for proximity intensity calculation
+        now: time of this tick (default: self.clock())
         """
+        if now is None:
+            now = self.clock()
+        if self.store is not None:
+            return self._update_unit_times_vectorized(dt, is_observing, mouse_pos, now)
+
         total_delta = 0.0
+        profiler = self.profiler
         
-        # Calculate Mouse Proximity Intensity
-        proximity_intensity = 0.0
-        if mouse_pos:
-            mx, my = mouse_pos
-            # Find closest unit
-            min_dist = float('inf')
+        with profiler.phase("observation"):
+            # Calculate Mouse Proximity Intensity
+            proximity_intensity = 0.0
+            if mouse_pos:
+                mx, my = mouse_pos
+                # Find closest unit
+                min_dist = float('inf')
+                for unit in self.units:
+                    dist = math.sqrt((unit.x - mx)**2 + (unit.y - my)**2)
+                    if dist < min_dist:
+                        min_dist = dist
+                
+                # Closer = Higher Intensity (Max 1.0 at 0 dist, 0.0 at >300px)
+                if min_dist < 300:
+                    proximity_intensity = (300 - min_dist) / 300.0
+
+        with profiler.phase("gravity"):
+            # 2. Proximity/Gravity Effect (only neighbouring grid cells can be in range)
+            proximity_deltas = []
             for unit in self.units:
-                dist = math.sqrt((unit.x - mx)**2 + (unit.y - my)**2)
-                if dist < min_dist:
-                    min_dist = dist
+                proximity_delta = 0.0
+                for other_unit, distance in self._grid.neighbors(unit.x, unit.y, GRAVITY_THRESHOLD):
+                    if unit is not other_unit:
+                        safe_dist = max(distance, 1.0)
+                        proximity_delta += CLOSE_GRAVITY_FACTOR / (safe_dist / GRAVITY_FALLOFF)
+                proximity_deltas.append(proximity_delta)
+
+        with profiler.phase("local_effects"):
+            # 3. Superposition Effect, drawn for the whole board at once
+            superposition_deltas = self.noise.draw([unit.superposition_symbol for unit in self.units])
+
+            # Flow rate depends on proximity intensity (base 0.5 + 0.5 * intensity)
+            flow_delta = dt * (0.5 + 0.5 * proximity_intensity)
+            self.last_flow_delta = flow_delta if is_observing else 0.0
+
+            # Apply time flow to units
+            for unit, proximity_delta, superposition_delta in zip(self.units, proximity_deltas, superposition_deltas):
+                # Time only increments if observing
+                if is_observing:
+                    unit.accumulate_time(flow_delta)
+                
+                # 4. Black Hole Effect
+                black_hole_delta = 0.0
+                if unit.is_black_hole:
+                    black_hole_delta = BLACK_HOLE_FACTOR
+                    
+                local_delta = proximity_delta + superposition_delta + black_hole_delta
+                unit.local_distortion = local_delta
+                total_delta += local_delta
+
+            # 1. Movement Effect: only the units moved within the velocity window
+            units = self._units_by_id
+            for unit_id, speed in zip(*self.motion.speeds(now)):
+                movement_delta = movement_distortion(speed)
+                units[unit_id].local_distortion += movement_delta
+                total_delta += movement_delta
+        
+        with profiler.phase("entanglement"):
+            # 5. Entanglement: every connected group shares its mean distortion
+            for component in self.entanglement.components():
+                members = [units[unit_id] for unit_id in component]
+                avg_distortion = sum(unit.local_distortion for unit in members) / len(members)
+                for unit in members:
+                    unit.local_distortion = avg_distortion
             
-            # Closer = Higher Intensity (Max 1.0 at 0 dist, 0.0 at >300px)
-            if min_dist < 300:
-                proximity_intensity = (300 - min_dist) / 300.0
+        self.time_distortion = total_delta + self.external_distortion
 
-        # Apply time flow to units
-        for unit in self.units:
-            # Time only increments if observing
+    def _update_unit_times_vectorized(self, dt, is_observing, mouse_pos, now):
+        """
+        Same effects as update_unit_times, computed column-wise over the
+        ArrayUnitStore.
+        """
+        store = self.store
+        n = store.size
+        if n == 0:
+            self.time_distortion = self.external_distortion
+            self.last_flow_delta = 0.0
+            return
+        x = store.x[:n]
+        y = store.y[:n]
+        profiler = self.profiler
+
+        with profiler.phase("observation"):
+            proximity_intensity = 0.0
+            if mouse_pos:
+                mx, my = mouse_pos
+                min_dist = float(np.hypot(x - mx, y - my).min())
+                if min_dist < 300:
+                    proximity_intensity = (300 - min_dist) / 300.0
+
+        with profiler.phase("gravity"):
+            # 2. Proximity/Gravity Effect
+            proximity_delta = self.proximity_columns()
+
+        with profiler.phase("local_effects"):
+            self.last_flow_delta = 0.0
             if is_observing:
-                # Flow rate depends on proximity intensity (base 0.1 + 0.9 * intensity)
-                # If continuous observe button is on, we might assume max intensity or standard flow
                 flow_factor = 0.5 + 0.5 * proximity_intensity
-                unit.accumulate_time(dt * flow_factor)
-            
-            # 1. Movement Effect (simulated by random flux for now as we don't track velocity explicitly)
-            movement_fuzz_delta = math.sin(time.time()) * 0.001
-            
-            # 2. Proximity/Gravity Effect
-            proximity_delta = 0.0
-            for other_unit in self.units:
-                if unit is not other_unit:
-                    distance = math.sqrt(
-                        (unit.x - other_unit.x)**2 + 
-                        (unit.y - other_unit.y)**2
-                    )
-                    if distance < 100:
-                        safe_dist = max(distance, 1.0)
-                        proximity_delta += CLOSE_GRAVITY_FACTOR / (safe_dist / 50.0)
-            
+                self.last_flow_delta = dt * flow_factor
+                store.elapsed_time_sec[:n] += self.last_flow_delta
+
             # 3. Superposition Effect
-            if unit.superposition_symbol == '+':
-                superposition_delta = uniform(0.001, 0.005)
-            elif unit.superposition_symbol == '*':
-                superposition_delta = uniform(-0.002, 0.002)
-            else:  # '~'
-                superposition_delta = uniform(-0.005, -0.001)
-            
+            bounds = self.superposition_bounds()
+            superposition_delta = self._rng.uniform(bounds[:, 0], bounds[:, 1])
+
             # 4. Black Hole Effect
-            black_hole_delta = 0.0
-            if unit.is_black_hole:
-                black_hole_delta = BLACK_HOLE_FACTOR
-                
-            local_delta = movement_fuzz_delta + proximity_delta + superposition_delta + black_hole_delta
-            unit.local_distortion = local_delta
-            total_delta += local_delta
-        
-        # 5. Entanglement: share distortion between entangled pairs
-        for unit1, unit2 in self.get_entangled_pairs():
-            avg_distortion = (unit1.local_distortion + unit2.local_distortion) / 2
-            unit1.local_distortion = avg_distortion
-            unit2.local_distortion = avg_distortion
-            
+            local = self.local_distortion_columns(proximity_delta, superposition_delta)
+
+            # 1. Movement Effect: only the rows of units moved within the velocity window
+            moved, speeds = self.motion.speeds(now)
+            if moved:
+                units = self._units_by_id
+                rows = np.fromiter((units[unit_id]._row for unit_id in moved), dtype=np.intp, count=len(moved))
+                local[rows] += movement_distortion(np.array(speeds))
+            total_delta = float(local.sum())
+
+        with profiler.phase("entanglement"):
+            # 5. Entanglement: one mean per connected component
+            self.entangle_columns(local)
+
+        store.local_distortion[:n] = local
         self.time_distortion = total_delta + self.external_distortion
 
+    # The column-wise stages below need an array backend. They take and
+    # return one value per store row; superposition_delta and local may
+    # also carry a leading trajectory axis (see ensemble.py).
+
+    def proximity_columns(self):
+        """
+        proximity_delta of every store row, as a read-only array. Kept
+        between calls: while no unit is added or removed, only the rows of
+        moved units and of their old and new neighbours are recomputed.
+        """
+        store = self.store
+        cache = self._gravity_cache
+        moved = self._gravity_moved
+        if (cache is None or cache[0] != store.layout_version
+                or len(moved) > GRAVITY_REFRESH_FRACTION * store.size):
+            proximity_delta = self._all_proximity_columns()
+        else:
+            proximity_delta = cache[1]
+            self._refresh_proximity_rows(proximity_delta, moved)
+        self._gravity_cache = (store.layout_version, proximity_delta)
+        self._gravity_moved = {}
+        columns = proximity_delta.view()
+        columns.flags.writeable = False
+        return columns
+
+    def _cached_proximity(self):
+        """proximity_delta kept by proximity_columns, or None if the store layout changed since."""
+        cache = self._gravity_cache
+        if cache is None or cache[0] != self.store.layout_version:
+            return None
+        if len(self._gravity_moved) > GRAVITY_REFRESH_FRACTION * self.store.size:
+            self._gravity_cache = None  # Recomputed in full next tick anyway
+            return None
+        return cache[1]
+
+    def _all_proximity_columns(self):
+        store = self.store
+        n = store.size
+        if self.gravity is not None:
+            return self.gravity.proximity(store.x[:n], store.y[:n])
+        proximity_delta = np.zeros(n)
+        for rows1, rows2, distance in store.pairs_within(GRAVITY_THRESHOLD):
+            pull = CLOSE_GRAVITY_FACTOR / (np.maximum(distance, 1.0) / GRAVITY_FALLOFF)
+            proximity_delta += np.bincount(rows1, weights=pull, minlength=n)
+            proximity_delta += np.bincount(rows2, weights=pull, minlength=n)
+        return proximity_delta
+
+    def _refresh_proximity_rows(self, proximity_delta, moved):
+        """Recompute, in place, the rows a set of moves can have changed."""
+        grid = self._grid
+        units = self._units_by_id
+        affected = {}
+        for unit_id, (old_x, old_y) in moved.items():
+            unit = units[unit_id]
+            affected[unit_id] = unit
+            for x, y in ((old_x, old_y), (unit.x, unit.y)):
+                for other, _ in grid.neighbors(x, y, GRAVITY_THRESHOLD):
+                    affected[other.id] = other
+        for unit in affected.values():
+            pull = 0.0
+            for other, distance in grid.neighbors(unit.x, unit.y, GRAVITY_THRESHOLD):
+                if other is not unit:
+                    pull += CLOSE_GRAVITY_FACTOR / (max(distance, 1.0) / GRAVITY_FALLOFF)
+            proximity_delta[unit._row] = pull
+
+    def superposition_bounds(self):
+        """(low, high) superposition noise range of every store row, as an (n, 2) array."""
+        return self._noise_bounds[self.store.superposition[:self.store.size]]
+
+    def local_distortion_columns(self, proximity_delta, superposition_delta):
+        """Local distortion of units at rest, before entanglement: adds the black hole effect."""
+        black_hole_delta = self.store.black_hole[:self.store.size] * BLACK_HOLE_FACTOR
+        return proximity_delta + superposition_delta + black_hole_delta
+
+    def entangle_columns(self, local):
+        """Replace every entangled row of `local` (in place) with its component's mean."""
+        rows, starts, sizes = self._entangled_component_rows()
+        if len(rows):
+            sums = np.add.reduceat(local[..., rows], starts, axis=-1)
+            local[..., rows] = np.repeat(sums / sizes, sizes, axis=-1)
+
+    def _entangled_component_rows(self):
+        """
+        Store rows of every entangled unit grouped by component, the offset
+        of each component's first row in that array and the size of each
+        component. Rebuilt only when the graph or the store layout changes.
+        """
+        key = (self.entanglement.version, self.store.layout_version)
+        if self._component_rows is None or self._component_rows[0] != key:
+            units = self._units_by_id
+            rows, starts, sizes = [], [], []
+            for component in self.entanglement.components():
+                starts.append(len(rows))
+                rows.extend(units[unit_id]._row for unit_id in component)
+                sizes.append(len(component))
+            self._component_rows = (
+                key,
+                np.array(rows, dtype=np.intp),
+                np.array(starts, dtype=np.intp),
+                np.array(sizes, dtype=np.intp),
+            )
+        return self._component_rows[1:]
 
     def save_state(self, accumulated_time=0.0):
         """
@@ -259,30 +717,89 @@ class QuantumModel:
         return {
             "units": units_data,
             "accumulated_time": accumulated_time,
-            "entangled_pairs": list(self.entangled_pairs),
+            "entangled_pairs": self.entanglement.pairs(),
             "time_distortion": self.time_distortion,
         }
 
+    def capture_state(self, accumulated_time=0.0):
+        """
+        Capture the board now and return a function that builds the
+        save_state() dictionary later, from any thread. Only the unit and
+        pair lists are copied here (plus the position columns on the array
+        backends, in store row order), not a dict per unit.
+        A plain unit's position is read when the function runs, so it may
+        already show a move made after the capture; moves are absolute, so
+        replaying the journaled move on top gives the same board.
+        """
+        pairs = self.entanglement.pairs()
+        time_distortion = self.time_distortion
+        store = self.store
+        if store is None:
+            units = list(self.units)
+            columns = None
+        else:
+            n = store.size
+            units = list(store.units)
+            columns = (store.x[:n].copy(), store.y[:n].copy(), store.superposition[:n].copy())
+
+        def build():
+            if columns is None:
+                positions = [(unit.x, unit.y, unit.superposition_symbol) for unit in units]
+            else:
+                symbols = store.symbols
+                positions = zip(columns[0].tolist(), columns[1].tolist(),
+                                [symbols[code] for code in columns[2].tolist()])
+            return {
+                "units": [
+                    {"id": unit.id, "text": unit.text, "x": x, "y": y, "superposition_symbol": symbol}
+                    for unit, (x, y, symbol) in zip(units, positions)
+                ],
+                "accumulated_time": accumulated_time,
+                "entangled_pairs": pairs,
+                "time_distortion": time_distortion,
+            }
+
+        return build
+
     def load_state(self, state):
         """
         Restore model state from a dictionary (e.g., loaded from JSON).
         """
-        self.units = []
-        self.entangled_pairs = []
+        records = (
+            (unit_data.get("id"), unit_data["text"], unit_data["x"], unit_data["y"],
+             unit_data.get("superposition_symbol"))
+            for unit_data in state.get("units", [])
+        )
+        self.load_units(records, state.get("entangled_pairs", []), state.get("time_distortion", 0.0))
+
+    def load_units(self, records, entangled_pairs=(), time_distortion=0.0):
+        """
+        Replace the board with units built from (id, text, x, y,
+        superposition_symbol) records, then entangle the given id pairs.
+        A None id or symbol keeps the unit's generated default. Shared by
+        the JSON and binary snapshot loaders. Every unit is built before
+        the board is cleared, so a record that fails leaves it unchanged.
+        """
+        # Restore ID and superposition if provided
+        units = [
+            QuantumUnit(text, x, y, unit_id, superposition_symbol, self.unit_random, self.clock)
+            for unit_id, text, x, y, superposition_symbol in records
+        ]
+        entangled_pairs = [(unit_id1, unit_id2) for unit_id1, unit_id2 in entangled_pairs]
+        self._clear_store()
+        self.units = units
+        self.entanglement.clear()
         
-        for unit_data in state.get("units", []):
-            unit = QuantumUnit(
-                unit_data["text"],
-                unit_data["x"],
-                unit_data["y"]
-            )
-            # Restore ID and superposition if provided
-            if "id" in unit_data:
-                unit.id = unit_data["id"]
-            if "superposition_symbol" in unit_data:
-                unit.superposition_symbol = unit_data["superposition_symbol"]
-            self.units.append(unit)
+        if self.store is not None:
+            for unit in units:
+                ArrayBackedUnit.attach(unit, self.store)
+        self._units_by_id = {unit.id: unit for unit in self.units}
+        self._grid.rebuild(self.units)
+        self.proximity.rebuild(self.units)
+        self.motion.clear()
         
-        self.entangled_pairs = [tuple(pair) for pair in state.get("entangled_pairs", [])]
-        self.time_distortion = state.get("time_distortion", 0.0)
+        # Pairs are de-duplicated; pairs naming units that are not on the board are dropped
+        for unit_id1, unit_id2 in entangled_pairs:
+            self.entangle_units(unit_id1, unit_id2)
+        self.time_distortion = time_distortion
 
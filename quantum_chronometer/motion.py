@@ -0,0 +1,89 @@
+"""
+Per-unit motion tracking for the movement effect.
+
+Every position update is kept as a (time, x, y) sample in a small ring
+buffer for the unit. A unit's speed is its displacement over the last
+`window` seconds divided by the window, with the path between samples
+interpolated linearly, so one drop after a long drag reads as a movement
+spread over the window that fades out as the window slides past it.
+
+Only units moved within the window have a buffer, so a tick costs
+O(moved units) however large the board is. Has no numpy dependency.
+"""
+import math
+from collections import deque
+
+VELOCITY_WINDOW = 0.5  # Seconds a unit's speed is averaged over
+MOTION_HISTORY = 16    # Samples kept per unit; older ones fall out of the ring buffer
+
+
+def _position_at(track, t):
+    """Position of a track at time t, interpolated between samples."""
+    newer = None
+    for sample in reversed(track):
+        if sample[0] <= t:
+            if newer is None or newer[0] == sample[0]:
+                return sample[1], sample[2]
+            f = (t - sample[0]) / (newer[0] - sample[0])
+            return sample[1] + (newer[1] - sample[1]) * f, sample[2] + (newer[2] - sample[2]) * f
+        newer = sample
+    return newer[1], newer[2]  # Before the oldest sample kept
+
+
+class MotionTracker:
+    """
+    Ring buffers of recent positions for the units that moved within the
+    last `window` seconds; the others are at rest and cost nothing.
+    """
+
+    def __init__(self, window=VELOCITY_WINDOW, history=MOTION_HISTORY):
+        self.window = window
+        self.history = history
+        self.tracks = {}  # unit_id -> deque of (time, x, y), oldest first
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def record(self, unit_id, old_x, old_y, x, y, now):
+        """A unit moved from (old_x, old_y) to (x, y) at time `now`."""
+        track = self.tracks.get(unit_id)
+        if track is None or now - track[-1][0] >= self.window:
+            # At rest until now: spread the move over the window
+            track = self.tracks[unit_id] = deque(maxlen=self.history)
+            track.append((now - self.window, old_x, old_y))
+        track.append((now, x, y))
+
+    def forget(self, unit_id):
+        self.tracks.pop(unit_id, None)
+
+    def clear(self):
+        self.tracks = {}
+
+    def speeds(self, now):
+        """
+        (unit_ids, speeds in px/s) of every unit that moved within the
+        window before `now`. Units at rest again are dropped.
+        """
+        start = now - self.window
+        unit_ids, speeds, rested = [], [], []
+        for unit_id, track in self.tracks.items():
+            if track[-1][0] <= start:
+                rested.append(unit_id)
+                continue
+            x0, y0 = _position_at(track, start)
+            x1, y1 = _position_at(track, now)
+            unit_ids.append(unit_id)
+            speeds.append(math.hypot(x1 - x0, y1 - y0) / self.window)
+        for unit_id in rested:
+            del self.tracks[unit_id]
+        return unit_ids, speeds
+
+    def get_state(self):
+        """JSON-serializable copy of the buffers (see set_state)."""
+        return {unit_id: [list(sample) for sample in track] for unit_id, track in self.tracks.items()}
+
+    def set_state(self, state):
+        self.tracks = {
+            unit_id: deque((tuple(sample) for sample in samples), maxlen=self.history)
+            for unit_id, samples in state.items()
+        }
@@ -0,0 +1,66 @@
+"""
+Batched superposition noise for the plain-object ("python") backend.
+
+Instead of one if/elif on the symbol and one uniform() call per unit, a
+tick's noise for the whole board is drawn by SuperpositionNoise: units are
+grouped by symbol and every group is drawn with one vectorized call from
+the stage's own generator. Without numpy it falls back to one uniform()
+call per unit, still without the per-unit branching.
+"""
+import random
+
+from .store import np
+
+
+class SuperpositionNoise:
+    """
+    ranges: symbol -> (low, high) uniform noise range.
+    default: symbol whose range is used for symbols not in `ranges`.
+    seed: seeds the stage's generator (see reseed).
+
+    The generator is a numpy Generator when numpy is installed and a
+    random.Random otherwise, so a seeded run only reproduces on a machine
+    where the same one is available.
+    """
+
+    def __init__(self, ranges, default, seed=None):
+        if default not in ranges:
+            raise ValueError(f"Unknown default symbol {default!r}, expected one of {list(ranges)}")
+        self.ranges = dict(ranges)
+        self.default = default
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        self.generator = np.random.default_rng(seed) if np is not None else random.Random(seed)
+
+    def get_state(self):
+        """JSON-serializable generator state."""
+        if np is not None:
+            return self.generator.bit_generator.state
+        return self.generator.getstate()
+
+    def set_state(self, state):
+        """Resume from get_state(), also after a JSON round trip."""
+        if np is not None:
+            self.generator.bit_generator.state = state
+        else:
+            version, internal, gauss_next = state
+            self.generator.setstate((version, tuple(internal), gauss_next))
+
+    def draw(self, symbols):
+        """One noise value per entry of `symbols`, as a list of floats."""
+        ranges = self.ranges
+        if np is None:
+            fallback = ranges[self.default]
+            uniform = self.generator.uniform
+            return [uniform(*ranges.get(symbol, fallback)) for symbol in symbols]
+
+        codes = np.array(symbols, dtype=str)
+        noise = np.empty(len(codes))
+        groups = {symbol: codes == symbol for symbol in ranges}
+        groups[self.default] |= ~np.logical_or.reduce(list(groups.values()))  # Unknown symbols
+        uniform = self.generator.uniform
+        for symbol, members in groups.items():
+            low, high = ranges[symbol]
+            noise[members] = uniform(low, high, int(members.sum()))
+        return noise.tolist()
@@ -0,0 +1,174 @@
+"""
+Process-pool gravity for very large boards (the "parallel" backend).
+
+The board is cut into vertical tiles holding about the same number of
+units. Each tile is handed to a worker process together with a halo: the
+units within GRAVITY_THRESHOLD of its edges, whose pull on the tile's own
+units crosses the border. Once per tick the positions are bucketed by
+tile and copied, in tile order, into a multiprocessing.shared_memory
+segment that every worker maps, so a tile and the neighbouring tiles its
+halo reaches into are one contiguous row range: a worker only reads that
+range, and the total work stays linear in the number of units. Each
+worker writes proximity_delta for the rows it owns straight back into
+the same segment. Only the segment name and row ranges are pickled, and
+tiles never overlap in the rows they own, so no locking is needed.
+
+Requires numpy.
+"""
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .store import np, pairs_within
+
+PARALLEL_MIN_UNITS = 50000  # Smaller boards are computed in-process; start-up and copies dominate
+TILES_PER_WORKER = 4        # More tiles than workers, so a dense tile does not hold up the rest
+QUANTILE_SAMPLE = 65536     # Positions sampled to place the tile edges
+
+_segments = {}  # Worker side: segment name -> SharedMemory, the one in use
+
+
+def _columns(buf, capacity, n):
+    """x, y and output views of the first n rows of a segment."""
+    data = np.ndarray((3, capacity), dtype=np.float64, buffer=buf)
+    return data[0, :n], data[1, :n], data[2, :n]
+
+
+def tile_proximity(x, y, own_start, own_stop, lo, hi, threshold, strength, falloff):
+    """
+    proximity_delta of rows own_start..own_stop of `x`, `y` (a tile, whose
+    units lie in lo <= x < hi), from their neighbours closer than
+    `threshold` among those rows and the other rows within `threshold` of
+    the tile (its halo). Returns one delta per owned row.
+    """
+    near = (x >= lo - threshold) & (x < hi + threshold)
+    near[own_start:own_stop] = True
+    rows = np.flatnonzero(near)
+    count = len(rows)
+    pull = np.zeros(count)
+    for rows1, rows2, distance in pairs_within(x[rows], y[rows], threshold):
+        weights = strength / (np.maximum(distance, 1.0) / falloff)
+        pull += np.bincount(rows1, weights=weights, minlength=count)
+        pull += np.bincount(rows2, weights=weights, minlength=count)
+    return pull[(rows >= own_start) & (rows < own_stop)]
+
+
+def _tile_task(name, capacity, n, start, stop, own_start, own_stop, lo, hi, threshold, strength, falloff):
+    """Worker entry point: compute one tile from its row range and write it into the segment."""
+    segment = _segments.get(name)
+    if segment is None:
+        for old in _segments.values():
+            old.close()  # Replaced by a larger segment
+        _segments.clear()
+        segment = _segments[name] = shared_memory.SharedMemory(name=name)
+    x, y, out = _columns(segment.buf, capacity, n)
+    out[own_start:own_stop] = tile_proximity(x[start:stop], y[start:stop], own_start - start, own_stop - start,
+                                             lo, hi, threshold, strength, falloff)
+    return own_stop - own_start
+
+
+def _release(executor, segments):
+    executor.shutdown(wait=True, cancel_futures=True)
+    for segment in segments:
+        segment.close()
+        segment.unlink()
+
+
+class ParallelGravity:
+    """
+    threshold, strength, falloff: the gravity term; a pair closer than
+        threshold pulls each of its units by strength / (distance / falloff).
+    workers: worker processes (default: one per CPU).
+    min_units: boards smaller than this are computed in-process.
+
+    Workers are started on first use and live until close().
+    """
+
+    def __init__(self, threshold, strength, falloff, workers=None, min_units=PARALLEL_MIN_UNITS):
+        if np is None:
+            raise ImportError("Parallel gravity requires numpy")
+        self.threshold = threshold
+        self.strength = strength
+        self.falloff = falloff
+        self.workers = workers or os.cpu_count() or 1
+        self.min_units = min_units
+        self._executor = None
+        self._segments = []  # Current segment last; a list so the finalizer sees replacements
+        self._capacity = 0
+        self._finalizer = None
+
+    def _ensure_started(self, n):
+        if self._executor is None:
+            # Spawned, not forked: the caller may already run other threads (Qt, networking)
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            self._finalizer = weakref.finalize(self, _release, self._executor, self._segments)
+        if n > self._capacity:
+            capacity = max(n, 2 * self._capacity)
+            segment = shared_memory.SharedMemory(create=True, size=3 * capacity * 8)
+            for old in self._segments:
+                old.close()
+                old.unlink()
+            self._segments[:] = [segment]
+            self._capacity = capacity
+        return self._segments[-1]
+
+    def tile_edges(self, x):
+        """Edges of the vertical tiles, -inf to inf, with about equal unit counts in each."""
+        tiles = self.workers * TILES_PER_WORKER
+        sample = x[::max(1, len(x) // QUANTILE_SAMPLE)]
+        inner = np.unique(np.quantile(sample, np.linspace(0.0, 1.0, tiles + 1)[1:-1]))
+        return np.concatenate(([-np.inf], inner, [np.inf]))
+
+    def tile_ranges(self, edges, bounds):
+        """
+        (start, stop, own_start, own_stop, lo, hi) of every non-empty tile,
+        given the tile edges and where each tile's rows start in tile
+        order: the tile owns rows own_start..own_stop, and start..stop
+        also covers every neighbouring tile its halo reaches into.
+        """
+        threshold = self.threshold
+        first = np.searchsorted(edges[1:], edges[:-1] - threshold, side="right").tolist()
+        last = np.searchsorted(edges[:-1], edges[1:] + threshold, side="left").tolist()
+        edges = edges.tolist()
+        return [
+            (bounds[first[t]], bounds[last[t]], bounds[t], bounds[t + 1], edges[t], edges[t + 1])
+            for t in range(len(edges) - 1)
+            if bounds[t + 1] > bounds[t]
+        ]
+
+    def proximity(self, x, y):
+        """proximity_delta for every unit, as a new array."""
+        n = len(x)
+        if n < self.min_units:
+            return tile_proximity(x, y, 0, n, -np.inf, np.inf, self.threshold, self.strength, self.falloff)
+        segment = self._ensure_started(n)
+        shared_x, shared_y, out = _columns(segment.buf, self._capacity, n)
+        # Bucket the rows by tile: a stable sort of small integer keys is a radix sort
+        edges = self.tile_edges(x)
+        tile = np.searchsorted(edges[1:-1], x, side="right").astype(np.int16)
+        order = np.argsort(tile, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(tile, minlength=len(edges) - 1)))).tolist()
+        np.take(x, order, out=shared_x)
+        np.take(y, order, out=shared_y)
+        futures = [
+            self._executor.submit(_tile_task, segment.name, self._capacity, n, *tile_range,
+                                  self.threshold, self.strength, self.falloff)
+            for tile_range in self.tile_ranges(edges, bounds)
+        ]
+        owned = sum(future.result() for future in futures)
+        if owned != n:
+            raise RuntimeError(f"Parallel gravity covered {owned} of {n} units")
+        proximity_delta = np.empty(n)
+        proximity_delta[order] = out
+        return proximity_delta
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self._executor = None
+            self._segments = []
+            self._capacity = 0
@@ -0,0 +1,128 @@
+"""
+Table of remote instances and the distortion they report.
+
+Each instance tags its packets with a random instance id and an
+increasing sequence number. The table keeps one entry per instance,
+ignores packets older than the newest one seen (reordered or duplicated
+datagrams), evicts instances not heard from within the TTL and combines
+the remaining values into one external distortion.
+
+Has no Qt dependency.
+"""
+import os
+import time
+from collections import OrderedDict
+
+AGGREGATIONS = ("sum", "mean", "max", "ewma")
+DEFAULT_AGGREGATION = "mean"
+PEER_TTL = 3.0     # Seconds without a packet after which a peer is dropped
+EWMA_ALPHA = 0.2   # Weight of a new value in each peer's moving average
+SEQ_MODULUS = 2 ** 32
+
+
+def new_instance_id():
+    """Random 64-bit id for this process; collisions are negligible even with hundreds of peers."""
+    return int.from_bytes(os.urandom(8), "little")
+
+
+def seq_newer(seq, last):
+    """True if `seq` comes after `last`, allowing the 32-bit counter to wrap."""
+    return 0 < (seq - last) % SEQ_MODULUS < SEQ_MODULUS // 2
+
+
+class PeerEntry:
+    __slots__ = ("seq", "value", "smoothed", "last_seen")
+
+    def __init__(self, seq, value, now):
+        self.seq = seq
+        self.value = value
+        self.smoothed = value
+        self.last_seen = now
+
+
+class PeerTable:
+    """
+    aggregation: "sum", "mean" or "max" of the peers' latest values, or
+                 "ewma", the mean of each peer's exponentially weighted
+                 moving average (steadier with noisy peers).
+    """
+
+    def __init__(self, aggregation=DEFAULT_AGGREGATION, ttl=PEER_TTL, ewma_alpha=EWMA_ALPHA,
+                 clock=time.monotonic):
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {aggregation!r}, expected one of {AGGREGATIONS}")
+        self.aggregation = aggregation
+        self.ttl = ttl
+        self.ewma_alpha = ewma_alpha
+        self.clock = clock
+        self._peers = OrderedDict()  # peer id -> PeerEntry, least recently seen first
+        self._aggregate = 0.0
+        self._dirty = False
+        self.stale_packets = 0  # Packets ignored because a newer one was already seen
+
+    def __len__(self):
+        return len(self._peers)
+
+    def __contains__(self, peer):
+        return peer in self._peers
+
+    def get(self, peer):
+        return self._peers.get(peer)
+
+    def update(self, peer, seq, value, now=None):
+        """Record a packet. Returns False if it is older than the peer's latest."""
+        if now is None:
+            now = self.clock()
+        entry = self._peers.get(peer)
+        if entry is None:
+            self._peers[peer] = PeerEntry(seq, value, now)
+        else:
+            if not seq_newer(seq, entry.seq):
+                self.stale_packets += 1
+                return False
+            entry.seq = seq
+            entry.value = value
+            entry.smoothed += self.ewma_alpha * (value - entry.smoothed)
+            entry.last_seen = now
+            self._peers.move_to_end(peer)
+        self._dirty = True
+        return True
+
+    def expire(self, now=None):
+        """Drop peers not seen for `ttl` seconds. Returns their ids."""
+        if now is None:
+            now = self.clock()
+        peers = self._peers
+        expired = []
+        # Entries are ordered by last_seen, so only the expired ones are visited
+        while peers:
+            peer, entry = next(iter(peers.items()))
+            if now - entry.last_seen < self.ttl:
+                break
+            del peers[peer]
+            expired.append(peer)
+        if expired:
+            self._dirty = True
+        return expired
+
+    def aggregate(self):
+        """Combined distortion of all live peers (0.0 with none)."""
+        if self._dirty:
+            self._dirty = False
+            entries = self._peers.values()
+            if not entries:
+                self._aggregate = 0.0
+            elif self.aggregation == "sum":
+                self._aggregate = sum(entry.value for entry in entries)
+            elif self.aggregation == "mean":
+                self._aggregate = sum(entry.value for entry in entries) / len(entries)
+            elif self.aggregation == "max":
+                self._aggregate = max(entry.value for entry in entries)
+            else:
+                self._aggregate = sum(entry.smoothed for entry in entries) / len(entries)
+        return self._aggregate
+
+    def clear(self):
+        self._peers.clear()
+        self._aggregate = 0.0
+        self._dirty = False
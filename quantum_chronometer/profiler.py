@@ -0,0 +1,167 @@
+import time
+from collections import deque
+
+FRAME_BUDGET_MS = 50.0  # One QTimer interval
+DEFAULT_WINDOW = 600    # Samples kept per histogram (30 s of frames at 20 Hz)
+EXPORT_EVERY = 20       # Frames between exporter callbacks (once a second at 20 Hz)
+
+
+class RollingHistogram:
+    """Keeps the most recent `window` samples (in ns) and reports percentiles."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0  # Samples ever recorded, including those that rolled out
+
+    def add(self, ns):
+        self.samples.append(ns)
+        self.count += 1
+
+    def percentile(self, p, ordered=None):
+        """Nearest-rank percentile in ns (0 when empty)."""
+        ordered = ordered if ordered is not None else sorted(self.samples)
+        if not ordered:
+            return 0
+        rank = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered))) - 1))
+        return ordered[rank]
+
+    def summary(self):
+        """p50/p95/p99/max and the last sample, in milliseconds."""
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "last_ms": self.samples[-1] / 1e6 if self.samples else 0.0,
+            "p50_ms": self.percentile(50, ordered) / 1e6,
+            "p95_ms": self.percentile(95, ordered) / 1e6,
+            "p99_ms": self.percentile(99, ordered) / 1e6,
+            "max_ms": ordered[-1] / 1e6 if ordered else 0.0,
+        }
+
+
+class _PhaseTimer:
+    """Context manager timing one phase with perf_counter_ns."""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class TickProfiler:
+    """
+    Opt-in per-phase tick instrumentation.
+    Code wraps its phases in `with profiler.phase("name"):`; a frame is the
+    span between begin_frame() and end_frame(). Frames longer than the
+    budget are counted as dropped. Every `export_every` frames each
+    registered exporter is called with snapshot().
+    """
+    enabled = True
+
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, window=DEFAULT_WINDOW, export_every=EXPORT_EVERY):
+        self.budget_ns = int(budget_ms * 1e6)
+        self.window = window
+        self.export_every = export_every
+        self.phases = {}  # name -> RollingHistogram
+        self.frames = RollingHistogram(window)
+        self.dropped_frames = 0
+        self._frame_start = None
+        self._exporters = []
+
+    def phase(self, name):
+        return _PhaseTimer(self, name)
+
+    def record(self, name, ns):
+        histogram = self.phases.get(name)
+        if histogram is None:
+            histogram = self.phases[name] = RollingHistogram(self.window)
+        histogram.add(ns)
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        elapsed = time.perf_counter_ns() - self._frame_start
+        self._frame_start = None
+        self.frames.add(elapsed)
+        if elapsed > self.budget_ns:
+            self.dropped_frames += 1
+        if self._exporters and self.frames.count % self.export_every == 0:
+            snapshot = self.snapshot()
+            for exporter in list(self._exporters):
+                exporter(snapshot)
+
+    def add_exporter(self, callback):
+        """Register callback(snapshot) to be called every `export_every` frames."""
+        self._exporters.append(callback)
+
+    def remove_exporter(self, callback):
+        if callback in self._exporters:
+            self._exporters.remove(callback)
+
+    def snapshot(self):
+        return {
+            "frames": self.frames.count,
+            "dropped_frames": self.dropped_frames,
+            "budget_ms": self.budget_ns / 1e6,
+            "frame": self.frames.summary(),
+            "phases": {name: histogram.summary() for name, histogram in self.phases.items()},
+        }
+
+    def reset(self):
+        self.phases = {}
+        self.frames = RollingHistogram(self.window)
+        self.dropped_frames = 0
+        self._frame_start = None
+
+
+class NullProfiler:
+    """Default profiler that records nothing, keeping instrumentation near free."""
+    enabled = False
+
+    class _NullPhase:
+        __slots__ = ()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    _PHASE = _NullPhase()
+
+    def phase(self, name):
+        return self._PHASE
+
+    def record(self, name, ns):
+        pass
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def format_snapshot(snapshot):
+    """Multi-line text summary of a snapshot, used by the on-screen overlay."""
+    frame = snapshot["frame"]
+    lines = [
+        f"frame p50 {frame['p50_ms']:.1f}  p95 {frame['p95_ms']:.1f}  p99 {frame['p99_ms']:.1f} ms",
+        f"dropped {snapshot['dropped_frames']}/{snapshot['frames']} (> {snapshot['budget_ms']:.0f} ms)",
+    ]
+    for name, stats in sorted(snapshot["phases"].items(), key=lambda item: -item[1]["p95_ms"]):
+        lines.append(f"{name:<14} p50 {stats['p50_ms']:6.2f}  p95 {stats['p95_ms']:6.2f} ms")
+    return "\n".join(lines)
@@ -0,0 +1,159 @@
+from collections import namedtuple
+
+BULK_REBUILD_FRACTION = 0.25  # Above this share of dirty units, rescan every pair at once...
+BULK_REBUILD_MIN_UNITS = 64   # ...as long as at least this many units are dirty
+
+# Pair changes since the last take_changes():
+#   added:   (unit1, unit2) pairs that came within range
+#   removed: (id1, id2) keys of pairs that went out of range (or lost a unit)
+#   updated: (unit1, unit2) pairs that stayed in range while an end moved
+#   reset:   True if the pair set was rebuilt; `added` then holds every
+#            current pair and anything seen before should be discarded
+ProximityChanges = namedtuple("ProximityChanges", ["added", "removed", "updated", "reset"])
+
+
+class ProximityTracker:
+    """
+    Set of unit pairs closer than `threshold`, maintained incrementally.
+    Adding or moving a unit only marks it dirty; the next query re-checks
+    the dirty units' neighbourhoods in the spatial grid, so keeping the
+    pair set current costs O(moved units) instead of a full pair scan.
+    Pair keys are (id1, id2) with id1 <= id2.
+    """
+
+    def __init__(self, grid, threshold):
+        self.grid = grid
+        self.threshold = threshold
+        self.units = {}      # unit_id -> unit, for every tracked unit
+        self.partners = {}   # unit_id -> set of unit_ids in range
+        self._dirty = set()  # Units added or moved since the pairs were resolved
+        self._added = set()
+        self._removed = set()
+        self._moved = set()
+        self._reset = True   # Nothing has been reported yet
+
+    @staticmethod
+    def _key(unit_id1, unit_id2):
+        return (unit_id1, unit_id2) if unit_id1 <= unit_id2 else (unit_id2, unit_id1)
+
+    def __len__(self):
+        self._resolve()
+        return sum(len(others) for others in self.partners.values()) // 2
+
+    def pairs(self):
+        """List of (unit1, unit2) pairs currently in range, ordered by key."""
+        self._resolve()
+        units = self.units
+        return [
+            (units[unit_id1], units[unit_id2])
+            for unit_id1, others in self.partners.items()
+            for unit_id2 in others
+            if unit_id1 < unit_id2
+        ]
+
+    def _link(self, unit_id1, unit_id2):
+        self.partners.setdefault(unit_id1, set()).add(unit_id2)
+        self.partners.setdefault(unit_id2, set()).add(unit_id1)
+        if self._reset:
+            return
+        key = self._key(unit_id1, unit_id2)
+        if key in self._removed:
+            self._removed.discard(key)  # Dropped and re-added since the last take
+        else:
+            self._added.add(key)
+
+    def _unlink(self, unit_id1, unit_id2):
+        for a, b in ((unit_id1, unit_id2), (unit_id2, unit_id1)):
+            others = self.partners[a]
+            others.discard(b)
+            if not others:
+                del self.partners[a]
+        if self._reset:
+            return
+        key = self._key(unit_id1, unit_id2)
+        if key in self._added:
+            self._added.discard(key)
+        else:
+            self._removed.add(key)
+
+    def track(self, unit):
+        """Mark a unit that was just added or moved; its pairs are re-checked lazily."""
+        self.units[unit.id] = unit
+        self._dirty.add(unit.id)
+
+    def untrack(self, unit_id):
+        """Drop a removed unit and every pair it belongs to."""
+        self._resolve()
+        for other_id in list(self.partners.get(unit_id, ())):
+            self._unlink(unit_id, other_id)
+        self.units.pop(unit_id, None)
+        self._moved.discard(unit_id)
+
+    def clear(self):
+        self.units = {}
+        self.partners = {}
+        self._dirty = set()
+        self._mark_reset()
+
+    def rebuild(self, units):
+        self.clear()
+        for unit in units:
+            self.track(unit)
+
+    def _mark_reset(self):
+        self._reset = True
+        self._added = set()
+        self._removed = set()
+        self._moved = set()
+
+    def _resolve(self):
+        """Bring the pair set up to date with the dirty units' positions (the grid must be current)."""
+        dirty = self._dirty
+        if not dirty:
+            return
+        self._dirty = set()
+        if len(dirty) >= BULK_REBUILD_MIN_UNITS and len(dirty) > BULK_REBUILD_FRACTION * len(self.units):
+            # Cheaper to rescan every pair once than to query each unit
+            self.partners = {}
+            for unit1, unit2, _ in self.grid.pairs_within(self.threshold):
+                self.partners.setdefault(unit1.id, set()).add(unit2.id)
+                self.partners.setdefault(unit2.id, set()).add(unit1.id)
+            self._mark_reset()
+            return
+        for unit_id in dirty:
+            unit = self.units[unit_id]
+            in_range = {
+                other.id
+                for other, _ in self.grid.neighbors(unit.x, unit.y, self.threshold)
+                if other is not unit
+            }
+            old = self.partners.get(unit_id, set())
+            for other_id in old - in_range:
+                self._unlink(unit_id, other_id)
+            for other_id in in_range - old:
+                self._link(unit_id, other_id)
+        if not self._reset:
+            self._moved |= dirty
+
+    def take_changes(self):
+        """Return the ProximityChanges accumulated since the last call and reset them."""
+        self._resolve()
+        units = self.units
+        if self._reset:
+            changes = ProximityChanges(self.pairs(), [], [], True)
+        else:
+            updated_keys = set()
+            for unit_id in self._moved:
+                for other_id in self.partners.get(unit_id, ()):
+                    updated_keys.add(self._key(unit_id, other_id))
+            changes = ProximityChanges(
+                [(units[id1], units[id2]) for id1, id2 in self._added],
+                list(self._removed),
+                [(units[id1], units[id2]) for id1, id2 in updated_keys - self._added],
+                False,
+            )
+        self._reset = False
+        self._added = set()
+        self._removed = set()
+        self._moved = set()
+        return changes
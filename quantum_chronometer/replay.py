@@ -0,0 +1,276 @@
+"""
+Deterministic session recording and replay.
+
+A SessionRecorder listens to a SimulationEngine and streams everything
+needed to re-run the session exactly to a JSON Lines file: a header with
+the model's seed and random state and the starting board, then one line
+per input (with the clock time it arrived at) and per tick. Lines are
+written in chunks as the session runs, so a crash loses at most the last
+chunk. SessionReplayer re-runs a recording on a
+fresh engine driven by a ManualClock, as fast as the CPU allows, and
+checks each tick's distortion against the recorded one, so a reported
+anomaly can be reproduced and bisected:
+
+    python -m quantum_chronometer.replay session.jsonl --seek 1200
+
+While replaying it keeps a keyframe (the captured engine state) every
+`keyframe_every` ticks; seek() restores the nearest keyframe at or before
+the target and only replays the ticks after it.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+from .engine import SimulationEngine
+from .journal import apply_event
+from .model import QuantumModel
+
+RECORDING_VERSION = 4  # 2: batched python backend noise; 3: movement effect from tracked positions; 4: streamed JSON Lines
+KEYFRAME_EVERY = 100  # Ticks between replay keyframes
+FLUSH_EVERY = 200     # Frames a recorder buffers before writing them out...
+FLUSH_INTERVAL = 1.0  # ...or seconds, whichever comes first
+
+
+class ManualClock:
+    """Clock that only moves when set or advanced, for tests and replay."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def capture_engine(engine):
+    """JSON-serializable copy of everything the next ticks depend on."""
+    model = engine.model
+    return {
+        "state": engine.save_state(),
+        "elapsed": [unit.elapsed_time_sec for unit in model.units],
+        "start_time": model.start_time,
+        "external_distortion": model.external_distortion,
+        "random": model.get_random_state(),
+        "motion": model.motion.get_state(),
+        "tick_count": engine.tick_count,
+        "observing": engine.is_observing,
+        "observation_intensity": engine.observation_intensity,
+        "mouse": [engine.mouse_x, engine.mouse_y],
+        "last_observation_time": engine.last_observation_time,
+    }
+
+
+def restore_engine(engine, captured):
+    """Put the engine back into a state returned by capture_engine()."""
+    model = engine.model
+    engine.load_state(captured["state"])
+    for unit, elapsed in zip(model.units, captured["elapsed"]):
+        unit.elapsed_time_sec = elapsed
+    model.start_time = captured["start_time"]
+    model.external_distortion = captured["external_distortion"]
+    model.set_random_state(captured["random"])
+    model.motion.set_state(captured["motion"])
+    engine.tick_count = captured["tick_count"]
+    engine.is_observing = captured["observing"]
+    engine.observation_intensity = captured["observation_intensity"]
+    engine.mouse_x, engine.mouse_y = captured["mouse"]
+    engine.last_observation_time = captured["last_observation_time"]
+
+
+def load_recording(path):
+    """
+    Read a file written by SessionRecorder into one dict: the header's
+    fields plus "frames", the [clock time, event] list. A recording cut
+    short by a crash is read up to its last complete line.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            recording = json.loads(f.readline())
+        except ValueError as e:
+            raise ValueError(f"{path} is not a session recording") from e
+        if not isinstance(recording, dict) or recording.get("version") != RECORDING_VERSION:
+            version = recording.get("version") if isinstance(recording, dict) else None
+            raise ValueError(f"Unsupported recording version {version!r}")
+        frames = recording["frames"] = []
+        for line in f:
+            if not line.endswith("\n"):
+                break  # Torn write at crash time
+            try:
+                frames.append(json.loads(line))
+            except ValueError:
+                break
+    return recording
+
+
+class SessionRecorder:
+    """
+    Records an engine's inputs and ticks from now on to `path`. Reseeds
+    the model (with `seed`, or a fresh random one) so the run is
+    reproducible. Frames are kept in memory only until the next chunk is
+    written: every `flush_every` frames or `flush_interval` seconds.
+    Call save() when done.
+    """
+
+    def __init__(self, engine, path, seed=None, flush_every=FLUSH_EVERY, flush_interval=FLUSH_INTERVAL):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        engine.model.reseed(seed)
+        self.engine = engine
+        self.path = path
+        self.seed = seed
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.ticks = 0
+        self._pending = []  # Encoded frames not written yet
+        self._file = open(path, 'w', encoding='utf-8')
+        header = {
+            "version": RECORDING_VERSION,
+            "seed": seed,
+            "backend": engine.model.backend,
+            "dt": engine.dt,
+            "start": capture_engine(engine),
+        }
+        self._pending.append(json.dumps(header, ensure_ascii=False, separators=(",", ":")))
+        self.flush()
+        engine.add_listener(self)
+
+    def record(self, event):
+        """Engine listener callback."""
+        if event["op"] == "tick":
+            self.ticks += 1
+        now = event.get("now")
+        if now is None:
+            now = self.engine.clock()
+        self._pending.append(json.dumps([now, event], ensure_ascii=False, separators=(",", ":")))
+        if (len(self._pending) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write the buffered frames out to the file."""
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._pending = []
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def stop(self):
+        """Stop recording; the frames so far are written out."""
+        if self in self.engine.listeners:
+            self.engine.remove_listener(self)
+        if not self._file.closed:
+            self.flush()
+
+    def save(self):
+        """Stop recording and close the file, which already holds every frame."""
+        self.stop()
+        self._file.close()
+
+
+class SessionReplayer:
+    """
+    Re-runs a recording (as produced by SessionRecorder) on its own engine.
+    `tick` is the number of recorded ticks replayed so far; `divergence` is
+    the first tick whose distortion differed from the recording, or None.
+    """
+
+    def __init__(self, recording, keyframe_every=KEYFRAME_EVERY):
+        self.frames = recording["frames"]
+        self.total_ticks = sum(1 for _, event in self.frames if event["op"] == "tick")
+        self.keyframe_every = keyframe_every
+        self.clock = ManualClock()
+        # Same backend as the recording, since the two draw their noise differently
+        model = QuantumModel(recording["backend"], clock=self.clock)
+        self.engine = SimulationEngine(model, dt=recording["dt"], clock=self.clock)
+        self.divergence = None
+        self.keyframes = {0: (0, recording["start"])}  # tick -> (frame position, captured state)
+        self._restore(0)
+
+    def _restore(self, tick):
+        position, captured = self.keyframes[tick]
+        restore_engine(self.engine, captured)
+        self.tick = tick
+        self.position = position
+
+    @property
+    def finished(self):
+        return self.position >= len(self.frames)
+
+    def step(self, ticks=1):
+        """Replay until `ticks` more ticks have run or the recording ends. Returns the ticks run."""
+        frames = self.frames
+        engine = self.engine
+        clock = self.clock
+        ran = 0
+        while ran < ticks and self.position < len(frames):
+            now, event = frames[self.position]
+            self.position += 1
+            clock.now = now
+            if event["op"] != "tick":
+                apply_event(engine, event)
+                continue
+            engine.step()
+            self.tick += 1
+            ran += 1
+            if self.divergence is None and engine.model.time_distortion != event["distortion"]:
+                self.divergence = self.tick
+            if self.tick % self.keyframe_every == 0 and self.tick not in self.keyframes:
+                self.keyframes[self.tick] = (self.position, capture_engine(engine))
+        return ran
+
+    def run(self):
+        """Replay the rest of the recording. Returns the ticks run."""
+        return self.step(math.inf)
+
+    def seek(self, tick):
+        """
+        Move to the state right after `tick` ticks, restoring the nearest
+        keyframe unless the current position is already closer.
+        Returns the tick reached (less than `tick` past the end).
+        """
+        if tick < 0:
+            raise ValueError(f"Cannot seek to tick {tick}")
+        keyframe = max(k for k in self.keyframes if k <= tick)
+        if not keyframe <= self.tick <= tick:
+            self._restore(keyframe)
+        self.step(tick - self.tick)
+        return self.tick
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded Quantum Chronometer session")
+    parser.add_argument("recording", help="File written with --record")
+    parser.add_argument("--seek", type=int, metavar="TICK", help="Stop after this tick")
+    parser.add_argument("--keyframe-every", type=int, default=KEYFRAME_EVERY)
+    args = parser.parse_args(argv)
+
+    recording = load_recording(args.recording)
+    replayer = SessionReplayer(recording, args.keyframe_every)
+    start = time.perf_counter()
+    if args.seek is None:
+        replayer.run()
+    else:
+        replayer.seek(args.seek)
+    elapsed = time.perf_counter() - start
+
+    engine = replayer.engine
+    simulated = replayer.tick * engine.dt
+    speedup = simulated / elapsed if elapsed > 0 else math.inf
+    print(f"Replayed {replayer.tick}/{replayer.total_ticks} ticks (seed {recording['seed']}) "
+          f"in {elapsed:.3f}s, {speedup:.0f}x real time")
+    print(f"Units: {len(engine.model.units)}  Distortion: {engine.model.time_distortion:+.6f}  "
+          f"Observed time: {engine.accumulated_time:.2f}s")
+    if replayer.divergence is None:
+        print("Replay matches the recording")
+        return 0
+    print(f"Replay diverged from the recording at tick {replayer.divergence}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Compact binary snapshot format (.qcs), an alternative to the JSON state
+for large boards. JSON stays the interchange format; both hold the same
+state.
+
+Layout (little-endian):
+
+    header          HEADER: magic, version, flags, unit/string/pair counts,
+                    accumulated_time, time_distortion
+    string table    string_count x (u32 byte length, UTF-8 bytes); unit
+                    texts, superposition symbols and non-UUID ids
+    unit records    unit_count x RECORD: 16-byte id, x, y, text index,
+                    symbol index, id kind
+    entanglement    pair_count x PAIR: indices of the two unit records
+
+Snapshots are written with buffered, chunked writes, never holding the
+whole file in memory, and read back through mmap so records are decoded
+straight from the mapped pages.
+"""
+import mmap
+import struct
+
+MAGIC = b"QCSN"
+VERSION = 1
+SNAPSHOT_EXTENSION = ".qcs"
+
+HEADER = struct.Struct("<4sHHIIIdd")
+STRING_LENGTH = struct.Struct("<I")
+RECORD = struct.Struct("<16sddIIB3x")
+PAIR = struct.Struct("<II")
+CHUNK_RECORDS = 4096  # Records packed per write() call
+
+ID_UUID = 0    # id field holds the 16 raw bytes of a canonical UUID string
+ID_STRING = 1  # id field holds a u32 string table index (ids that are not UUIDs)
+
+
+def is_snapshot_path(path):
+    """True if `path` names a binary snapshot rather than a JSON state file."""
+    return str(path).lower().endswith(SNAPSHOT_EXTENSION)
+
+
+def _format_id(id_bytes):
+    """Canonical UUID string for 16 raw bytes (same as str(uuid.UUID(bytes=...)), faster)."""
+    h = id_bytes.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _compress_id(unit_id):
+    """16-byte form of a canonical UUID string, or None if the id is anything else."""
+    if not isinstance(unit_id, str) or len(unit_id) != 36:
+        return None
+    try:
+        id_bytes = bytes.fromhex(unit_id.replace("-", ""))
+    except ValueError:
+        return None
+    # Only ids that round-trip exactly (lower case, dashes in place) are compressed
+    return id_bytes if len(id_bytes) == 16 and _format_id(id_bytes) == unit_id else None
+
+
+def write_snapshot(model, path, accumulated_time=0.0):
+    """Write the model's state to `path` in the binary snapshot format."""
+    strings = {}  # string -> index
+
+    def intern(value):
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    # First pass: build the string table and the compact per-unit fields
+    units = model.units
+    rows = []
+    for unit in units:
+        id_bytes = _compress_id(unit.id)
+        if id_bytes is None:
+            id_bytes, id_kind = STRING_LENGTH.pack(intern(unit.id)).ljust(16, b"\0"), ID_STRING
+        else:
+            id_kind = ID_UUID
+        rows.append((id_bytes, intern(unit.text), intern(unit.superposition_symbol), id_kind))
+
+    index_of = {unit.id: i for i, unit in enumerate(units)}
+    pairs = [(index_of[id1], index_of[id2]) for id1, id2 in model.entanglement]
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(units), len(strings), len(pairs),
+                            accumulated_time, model.time_distortion))
+        for value in strings:
+            data = value.encode("utf-8")
+            f.write(STRING_LENGTH.pack(len(data)))
+            f.write(data)
+
+        chunk = bytearray()
+        for unit, (id_bytes, text_index, symbol_index, id_kind) in zip(units, rows):
+            chunk += RECORD.pack(id_bytes, unit.x, unit.y, text_index, symbol_index, id_kind)
+            if len(chunk) >= CHUNK_RECORDS * RECORD.size:
+                f.write(chunk)
+                chunk.clear()
+        for index1, index2 in pairs:
+            chunk += PAIR.pack(index1, index2)
+            if len(chunk) >= CHUNK_RECORDS * PAIR.size:
+                f.write(chunk)
+                chunk.clear()
+        f.write(chunk)
+
+
+def _read_strings(view, offset, count):
+    strings = []
+    for _ in range(count):
+        (length,) = STRING_LENGTH.unpack_from(view, offset)
+        offset += STRING_LENGTH.size
+        strings.append(bytes(view[offset:offset + length]).decode("utf-8"))
+        offset += length
+    return strings, offset
+
+
+def load_snapshot(model, path):
+    """
+    Replace the model's state with the snapshot at `path`.
+    Returns the saved accumulated_time. Raises ValueError for files that
+    are not snapshots, are truncated or hold out-of-range indices; the
+    model is left unchanged then.
+    """
+    with open(path, "rb") as f:
+        if not f.seek(0, 2):
+            raise ValueError(f"{path} is empty, not a snapshot")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return _load_view(model, view, path)
+            finally:
+                view.release()
+
+
+def _load_view(model, view, path):
+    if len(view) < HEADER.size:
+        raise ValueError(f"{path} is too short to be a snapshot")
+    (magic, version, _flags, unit_count, string_count, pair_count,
+     accumulated_time, time_distortion) = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a Quantum Chronometer snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+
+    try:
+        strings, offset = _read_strings(view, HEADER.size, string_count)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"{path} has a corrupt string table") from e
+    records_end = offset + unit_count * RECORD.size
+    if len(view) < records_end + pair_count * PAIR.size:
+        raise ValueError(f"{path} is truncated")
+
+    # Every record and pair is decoded and checked before the model is
+    # touched, so a corrupt file leaves the current board as it was.
+    # unpack_from reads straight from the mapping without taking slices,
+    # so no buffer export outlives the mmap if loading fails part way.
+    unpack_from = RECORD.unpack_from
+    ids = []
+    records = []
+    for position in range(offset, records_end, RECORD.size):
+        id_bytes, x, y, text_index, symbol_index, id_kind = unpack_from(view, position)
+        if id_kind == ID_UUID:
+            unit_id = _format_id(id_bytes)
+        elif id_kind == ID_STRING:
+            unit_id = _string_at(strings, STRING_LENGTH.unpack_from(id_bytes)[0], path)
+        else:
+            raise ValueError(f"{path} has a unit record with unknown id kind {id_kind}")
+        ids.append(unit_id)
+        records.append((unit_id, _string_at(strings, text_index, path), x, y,
+                        _string_at(strings, symbol_index, path)))
+
+    entangled_pairs = []
+    for position in range(records_end, records_end + pair_count * PAIR.size, PAIR.size):
+        index1, index2 = PAIR.unpack_from(view, position)
+        if index1 >= unit_count or index2 >= unit_count:
+            raise ValueError(f"{path} has an entanglement pair past the {unit_count} unit records")
+        entangled_pairs.append((ids[index1], ids[index2]))
+
+    model.load_units(records, entangled_pairs, time_distortion)
+    return accumulated_time
+
+
+def _string_at(strings, index, path):
+    if index >= len(strings):
+        raise ValueError(f"{path} refers to string {index} of a {len(strings)}-entry string table")
+    return strings[index]
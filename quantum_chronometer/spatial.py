@@ -0,0 +1,109 @@
+import math
+
+
+class SpatialHashGrid:
+    """
+    Uniform grid (cell list) index over unit positions.
+    Units are bucketed into square cells of `cell_size` pixels, so a
+    neighbourhood query only has to look at the few cells around a point
+    instead of every unit on the board.
+    """
+
+    def __init__(self, cell_size=100):
+        self.cell_size = float(cell_size)
+        self.cells = {}        # (cx, cy) -> {unit_id: unit}
+        self.unit_cells = {}   # unit_id -> (cx, cy)
+
+    def __len__(self):
+        return len(self.unit_cells)
+
+    def cell_of(self, x, y):
+        """Return the (cx, cy) key of the cell containing (x, y)."""
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, unit):
+        key = self.cell_of(unit.x, unit.y)
+        self.cells.setdefault(key, {})[unit.id] = unit
+        self.unit_cells[unit.id] = key
+
+    def remove(self, unit_id):
+        """Remove a unit by ID. Returns True if it was indexed."""
+        key = self.unit_cells.pop(unit_id, None)
+        if key is None:
+            return False
+        bucket = self.cells[key]
+        del bucket[unit_id]
+        if not bucket:
+            del self.cells[key]
+        return True
+
+    def update(self, unit):
+        """Re-bucket a unit after its position changed."""
+        key = self.cell_of(unit.x, unit.y)
+        old_key = self.unit_cells.get(unit.id)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self.remove(unit.id)
+        self.cells.setdefault(key, {})[unit.id] = unit
+        self.unit_cells[unit.id] = key
+
+    def clear(self):
+        self.cells.clear()
+        self.unit_cells.clear()
+
+    def rebuild(self, units):
+        self.clear()
+        for unit in units:
+            self.insert(unit)
+
+    def _reach(self, radius):
+        """Number of cells to look at on each side for a given radius."""
+        return max(1, math.ceil(radius / self.cell_size))
+
+    def neighbors(self, x, y, radius):
+        """
+        Yield (unit, distance) for every indexed unit strictly closer than
+        `radius` to the point (x, y).
+        """
+        cx, cy = self.cell_of(x, y)
+        reach = self._reach(radius)
+        cells = self.cells
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                bucket = cells.get((cx + dx, cy + dy))
+                if not bucket:
+                    continue
+                for unit in bucket.values():
+                    distance = math.sqrt((unit.x - x)**2 + (unit.y - y)**2)
+                    if distance < radius:
+                        yield unit, distance
+
+    def pairs_within(self, radius):
+        """
+        Yield (unit1, unit2, distance) once for every pair of indexed units
+        closer than `radius`. Each cell is only compared against itself and
+        the "forward" half of its neighbourhood, so no pair is visited twice.
+        """
+        reach = self._reach(radius)
+        forward = [(dx, dy)
+                   for dx in range(0, reach + 1)
+                   for dy in range(-reach, reach + 1)
+                   if dx > 0 or dy > 0]
+        cells = self.cells
+        for (cx, cy), bucket in cells.items():
+            members = list(bucket.values())
+            for i, unit1 in enumerate(members):
+                for unit2 in members[i+1:]:
+                    distance = math.sqrt((unit1.x - unit2.x)**2 + (unit1.y - unit2.y)**2)
+                    if distance < radius:
+                        yield unit1, unit2, distance
+            for dx, dy in forward:
+                other = cells.get((cx + dx, cy + dy))
+                if not other:
+                    continue
+                for unit1 in members:
+                    for unit2 in other.values():
+                        distance = math.sqrt((unit1.x - unit2.x)**2 + (unit1.y - unit2.y)**2)
+                        if distance < radius:
+                            yield unit1, unit2, distance
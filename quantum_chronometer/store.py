@@ -0,0 +1,155 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; QuantumModel falls back to plain objects
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Cell keys are packed as cx * CELL_KEY_STRIDE + cy so neighbouring cells are
+# a constant offset apart in the sorted key array.
+CELL_KEY_STRIDE = 1 << 32
+MAX_PAIRS_PER_CHUNK = 1 << 20  # Bounds temporary memory on dense boards
+
+
+class ArrayUnitStore:
+    """
+    Structure-of-arrays storage for unit state.
+    Positions, elapsed time and local distortion live in contiguous float64
+    columns; the superposition symbol and black hole flag are int8 codes.
+    Row i of every column belongs to `units[i]`.
+    """
+
+    def __init__(self, symbols, capacity=64):
+        if np is None:
+            raise ImportError("The array unit store requires numpy")
+        self.symbols = list(symbols)
+        self.codes = {symbol: code for code, symbol in enumerate(self.symbols)}
+        self.size = 0
+        self.units = []
+        self.layout_version = 0  # Bumped whenever rows are added, removed or reordered
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.elapsed_time_sec = np.zeros(capacity)
+        self.local_distortion = np.zeros(capacity)
+        self.superposition = np.zeros(capacity, dtype=np.int8)
+        self.black_hole = np.zeros(capacity, dtype=np.int8)
+
+    def __len__(self):
+        return self.size
+
+    def code_of(self, symbol):
+        # Unknown symbols behave like the last one, as in the scalar update
+        return self.codes.get(symbol, len(self.symbols) - 1)
+
+    def _columns(self):
+        return ("x", "y", "elapsed_time_sec", "local_distortion", "superposition", "black_hole")
+
+    def reserve(self, capacity):
+        """Grow every column so it can hold at least `capacity` rows."""
+        if capacity <= len(self.x):
+            return
+        new_capacity = max(capacity, 2 * len(self.x))
+        for name in self._columns():
+            old = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=old.dtype)
+            grown[:self.size] = old[:self.size]
+            setattr(self, name, grown)
+
+    def append(self, owner, x, y, elapsed_time_sec, local_distortion, symbol, is_black_hole):
+        """Append one row owned by `owner` and return its index."""
+        row = self.size
+        self.reserve(row + 1)
+        self.x[row] = x
+        self.y[row] = y
+        self.elapsed_time_sec[row] = elapsed_time_sec
+        self.local_distortion[row] = local_distortion
+        self.superposition[row] = self.code_of(symbol)
+        self.black_hole[row] = 1 if is_black_hole else 0
+        self.units.append(owner)
+        self.size += 1
+        self.layout_version += 1
+        return row
+
+    def remove_row(self, row):
+        """
+        Remove a row by moving the last row into its place.
+        Returns the owner that now occupies `row` (or None if row was last).
+        """
+        last = self.size - 1
+        moved = None
+        if row != last:
+            for name in self._columns():
+                column = getattr(self, name)
+                column[row] = column[last]
+            moved = self.units[last]
+            self.units[row] = moved
+        self.units.pop()
+        self.size -= 1
+        self.layout_version += 1
+        return moved
+
+    def clear(self):
+        self.size = 0
+        self.units = []
+        self.layout_version += 1
+
+    def pairs_within(self, threshold):
+        """
+        Yield (rows1, rows2, distance) arrays covering every unordered pair
+        of rows closer than `threshold`, each pair exactly once.
+        """
+        return pairs_within(self.x[:self.size], self.y[:self.size], threshold)
+
+
+def pairs_within(x, y, threshold):
+    """
+    Yield (rows1, rows2, distance) arrays covering every unordered pair of
+    points in the coordinate arrays `x`, `y` closer than `threshold`, each
+    pair exactly once. Points are bucketed into square cells of side
+    `threshold` and sorted by cell; every cell is compared with itself and
+    the forward half of its 3x3 neighbourhood. Results come in bounded
+    chunks so dense clusters do not exhaust memory.
+    """
+    n = len(x)
+    if n < 2:
+        return
+    keys = (np.floor(x / threshold).astype(np.int64) * CELL_KEY_STRIDE
+            + np.floor(y / threshold).astype(np.int64))
+    order = np.argsort(keys, kind="stable")
+    sx = x[order]
+    sy = y[order]
+    cell_keys, cell_start, cell_count = np.unique(keys[order], return_index=True, return_counts=True)
+    row_cell = np.repeat(np.arange(len(cell_keys)), cell_count)
+    rows = np.arange(n)
+
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        if dx == 0 and dy == 0:
+            # Same cell: only partners sorted after this row
+            start = rows + 1
+            counts = (cell_start + cell_count)[row_cell] - start
+        else:
+            target = cell_keys + (dx * CELL_KEY_STRIDE + dy)
+            pos = np.minimum(np.searchsorted(cell_keys, target), len(cell_keys) - 1)
+            found = cell_keys[pos] == target
+            start = cell_start[pos][row_cell]
+            counts = np.where(found, cell_count[pos], 0)[row_cell]
+        ends = np.cumsum(counts)
+        if ends[-1] == 0:
+            continue
+        # Split the rows so no chunk expands to more than MAX_PAIRS_PER_CHUNK candidates
+        lo = 0
+        while lo < n:
+            base = ends[lo - 1] if lo else 0
+            hi = int(np.searchsorted(ends, base + MAX_PAIRS_PER_CHUNK, side="right"))
+            hi = min(max(hi, lo + 1), n)
+            chunk_counts = counts[lo:hi]
+            total = int(ends[hi - 1] - base)
+            if total:
+                i = np.repeat(rows[lo:hi], chunk_counts)
+                first = np.cumsum(chunk_counts) - chunk_counts
+                j = np.arange(total) - np.repeat(first - start[lo:hi], chunk_counts)
+                distance = np.hypot(sx[i] - sx[j], sy[i] - sy[j])
+                mask = distance < threshold
+                if mask.any():
+                    yield order[i[mask]], order[j[mask]], distance[mask]
+            lo = hi
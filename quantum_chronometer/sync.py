@@ -0,0 +1,506 @@
+"""
+Shared-board synchronization between instances (units added, moved and
+removed, entanglements, resets).
+
+StateSync listens to the local SimulationEngine and sends its board
+changes as delta packets: moves of the same unit between two polls are
+merged, and the ops are packed into datagrams of at most `mtu` bytes,
+each with the next sequence number; the first deltas carry the board the
+instance started with. Receivers apply deltas in sequence order. A gap,
+seen in a later delta or in the sender's heartbeat, is answered with a
+NACK; the sender retransmits from its history, or sends a full snapshot if
+the missing deltas are no longer there. A peer heard from for the first
+time is treated as a gap from its first delta, so a late joiner catches up
+the same way.
+
+A snapshot holds the units an instance owns (the ones that were not added
+by a peer) and their entanglements, zlib-compressed and split into
+MTU-sized chunks that the receiver reassembles. Each instance also sends
+one every `snapshot_interval` seconds if the board changed since the last.
+Changes an instance made to other instances' units are only in its
+deltas, so a late joiner that falls back to a snapshot sees those units as
+their owners' snapshots have them.
+
+Has no Qt dependency.
+"""
+import math
+import struct
+import time
+import zlib
+from collections import OrderedDict, deque, namedtuple
+
+from .model import QuantumUnit
+from .peers import SEQ_MODULUS, new_instance_id, seq_newer
+from .transport import DatagramTransport
+from .wire import (
+    FLAG_HEARTBEAT, HEADER, KIND_DELTA, KIND_NACK, KIND_SNAPSHOT, pack_header, unpack_header
+)
+
+SYNC_PORT = 50056
+SYNC_MTU = 1200               # Max datagram size; stays clear of fragmentation on Ethernet and most tunnels
+HISTORY_SIZE = 1024           # Sent deltas kept for retransmission
+MAX_PENDING_DELTAS = 1024     # Out-of-order deltas buffered per peer before asking for a snapshot
+PACKETS_PER_POLL = 64         # Datagrams sent per poll; the rest wait, so big snapshots do not flood receivers
+NACK_INTERVAL = 0.2           # Min seconds between retransmission requests to one peer
+HEARTBEAT_INTERVAL = 1.0      # Max seconds without a packet, so receivers notice a lost last delta
+SNAPSHOT_INTERVAL = 30.0      # Seconds between periodic snapshots (only if the board changed)
+SNAPSHOT_MIN_INTERVAL = 1.0   # Min seconds between snapshots sent on request
+SNAPSHOT_TIMEOUT = 5.0        # Seconds to wait for the rest of a snapshot before asking again
+
+OP_ADD, OP_MOVE, OP_REMOVE, OP_ENTANGLE, OP_RESET = range(1, 6)
+
+_OP = struct.Struct("<B")
+_STRING_LENGTH = struct.Struct("<H")
+_POSITION = struct.Struct("<dd")
+NACK = struct.Struct("<QIH")   # Target instance, first missing seq, count (0: send a snapshot)
+CHUNK = struct.Struct("<IHH")  # Snapshot id, chunk index, chunk count; the header seq is the snapshot's base
+
+# Board changes one StateSync.poll() applied from peers: added and moved are
+# units, removed are unit ids. With reset the board was cleared and the lists
+# are empty; redraw everything from the model.
+SyncChanges = namedtuple("SyncChanges", ["added", "moved", "removed", "reset"])
+
+
+def _pack_string(value):
+    data = value.encode("utf-8")
+    return _STRING_LENGTH.pack(len(data)) + data
+
+
+def encode_op(op):
+    """Bytes for one op tuple, e.g. (OP_MOVE, unit_id, x, y)."""
+    code = op[0]
+    if code == OP_ADD:
+        _, unit_id, text, x, y, symbol = op
+        return (_OP.pack(code) + _pack_string(unit_id) + _pack_string(text) + _POSITION.pack(x, y)
+                + _pack_string(symbol))
+    if code == OP_MOVE:
+        _, unit_id, x, y = op
+        return _OP.pack(code) + _pack_string(unit_id) + _POSITION.pack(x, y)
+    if code == OP_REMOVE:
+        return _OP.pack(code) + _pack_string(op[1])
+    if code == OP_ENTANGLE:
+        return _OP.pack(code) + _pack_string(op[1]) + _pack_string(op[2])
+    if code == OP_RESET:
+        return _OP.pack(code)
+    raise ValueError(f"Unknown sync op {code!r}")
+
+
+def decode_ops(data, offset=0):
+    """List of op tuples packed in data[offset:]. Raises ValueError if malformed."""
+    ops = []
+    end = len(data)
+    try:
+        def string():
+            nonlocal offset
+            (length,) = _STRING_LENGTH.unpack_from(data, offset)
+            offset += _STRING_LENGTH.size
+            if offset + length > end:
+                raise ValueError("Truncated string")
+            value = bytes(data[offset:offset + length]).decode("utf-8")
+            offset += length
+            return value
+
+        def position():
+            nonlocal offset
+            x, y = _POSITION.unpack_from(data, offset)
+            offset += _POSITION.size
+            return x, y
+
+        while offset < end:
+            code = data[offset]
+            offset += 1
+            if code == OP_ADD:
+                unit_id, text = string(), string()
+                x, y = position()
+                ops.append((code, unit_id, text, x, y, string()))
+            elif code == OP_MOVE:
+                unit_id = string()
+                ops.append((code, unit_id) + position())
+            elif code == OP_REMOVE:
+                ops.append((code, string()))
+            elif code == OP_ENTANGLE:
+                ops.append((code, string(), string()))
+            elif code == OP_RESET:
+                ops.append((code,))
+            else:
+                raise ValueError(f"Unknown sync op {code}")
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed sync ops: {e}") from e
+    return ops
+
+
+class _RemotePeer:
+    __slots__ = ("applied", "pending", "last_request", "assembly")
+
+    def __init__(self):
+        self.applied = 0           # Seq of the last delta applied
+        self.pending = {}          # seq -> ops received ahead of a gap
+        self.last_request = -math.inf
+        self.assembly = None       # [snapshot id, base seq, chunk count, {index: bytes}, started]
+
+
+class _ChangeSet:
+    """Accumulates what one poll applied, for SyncChanges."""
+
+    def __init__(self):
+        self.added = {}
+        self.moved = {}
+        self.removed = {}
+        self.reset = False
+
+    def clear_board(self):
+        self.added.clear()
+        self.moved.clear()
+        self.removed.clear()
+        self.reset = True
+
+    def result(self, model):
+        if self.reset:
+            return SyncChanges([], [], [], True)
+        get = model.get_unit_by_id
+        added = [unit for unit in map(get, self.added) if unit is not None]
+        moved = [unit for unit_id, unit in zip(self.moved, map(get, self.moved))
+                 if unit is not None and unit_id not in self.added]
+        return SyncChanges(added, moved, list(self.removed), False)
+
+
+class StateSync:
+    """
+    Keeps the engine's board in sync with the StateSync of other instances.
+    sock: bound UDP socket (see transport.broadcast_socket); destinations:
+    addresses every packet is sent to, e.g. [('<broadcast>', SYNC_PORT)].
+    Call start(), then poll() once per tick on the engine's thread.
+    """
+
+    def __init__(self, engine, sock, destinations, instance_id=None, mtu=SYNC_MTU,
+                 history_size=HISTORY_SIZE, heartbeat_interval=HEARTBEAT_INTERVAL,
+                 snapshot_interval=SNAPSHOT_INTERVAL, clock=time.monotonic):
+        self.engine = engine
+        self.destinations = list(destinations)
+        self.instance_id = instance_id if instance_id is not None else new_instance_id()
+        self.mtu = mtu
+        self.history_size = history_size
+        self.heartbeat_interval = heartbeat_interval
+        self.snapshot_interval = snapshot_interval
+        self.clock = clock
+        self.transport = DatagramTransport(sock, self._decode, keep_all=True)
+
+        self.seq = 0                    # Seq of the last delta sent
+        self.owners = {}                # unit_id -> instance id, for units added by peers
+        self.peers = {}                 # instance id -> _RemotePeer
+        self._outgoing = []             # Local ops not packed yet
+        self._pending_moves = {}        # unit_id -> index in _outgoing of its move
+        self._history = OrderedDict()   # seq -> delta packet
+        self._send_queue = deque()
+        self._send_count = 0
+        self._applying = False          # Ignore engine events caused by applying remote ops
+        self._changed = False           # Board changed since the last snapshot
+        self._snapshot_requested = False
+        self._snapshot_id = 0
+        now = clock()
+        self._last_sent = now
+        self._last_snapshot = now
+        self._last_requested_snapshot = -math.inf
+        self._outgoing.extend(self._board_ops())  # The board we start with goes out as the first deltas
+
+        # Counters
+        self.deltas_sent = 0
+        self.deltas_applied = 0
+        self.retransmits = 0
+        self.snapshots_sent = 0
+        self.snapshots_applied = 0
+        self.requests_sent = 0
+        self.malformed = 0
+
+        engine.add_listener(self)
+
+    def start(self):
+        return self.transport.start()
+
+    def stop(self):
+        self.engine.remove_listener(self)
+        self.transport.stop()
+
+    # --- Local changes (engine listener) ---
+
+    def record(self, event):
+        """Engine listener callback: queue local board changes for the next poll."""
+        if self._applying:
+            return
+        op = event["op"]
+        if op == "add":
+            self._queue_op((OP_ADD, event["id"], event["text"], event["x"], event["y"], event["symbol"]))
+        elif op == "move":
+            unit_id = event["id"]
+            move = (OP_MOVE, unit_id, event["x"], event["y"])
+            index = self._pending_moves.get(unit_id)
+            if index is None:
+                self._pending_moves[unit_id] = len(self._outgoing)
+                self._queue_op(move)
+            else:
+                self._outgoing[index] = move
+        elif op == "remove":
+            self.owners.pop(event["id"], None)
+            self._pending_moves.pop(event["id"], None)
+            self._queue_op((OP_REMOVE, event["id"]))
+        elif op == "entangle":
+            self._queue_op((OP_ENTANGLE, event["a"], event["b"]))
+        elif op in ("reset", "load"):
+            # A loaded board replaces the shared one: clear it, then send ours
+            self.owners.clear()
+            self._pending_moves.clear()
+            self._queue_op((OP_RESET,))
+            if op == "load":
+                self._outgoing.extend(self._board_ops())
+
+    def _queue_op(self, op):
+        self._outgoing.append(op)
+        self._changed = True
+
+    def _board_ops(self):
+        """Ops that recreate the units this instance owns, with their entanglements."""
+        owners = self.owners
+        model = self.engine.model
+        ops = [(OP_ADD, unit.id, unit.text, unit.x, unit.y, unit.superposition_symbol)
+               for unit in model.units if unit.id not in owners]
+        ids = {op[1] for op in ops}
+        ops.extend((OP_ENTANGLE, id1, id2) for id1, id2 in model.entangled_pairs
+                   if id1 in ids or id2 in ids)
+        return ops
+
+    # --- Poll (engine thread) ---
+
+    def poll(self, now=None):
+        """
+        Apply what peers sent since the last poll, send local changes,
+        retransmissions, heartbeats and snapshots. Returns SyncChanges.
+        """
+        if now is None:
+            now = self.clock()
+        changes = _ChangeSet()
+        resent = set()
+        for sender, packet in self.transport.drain():
+            kind, flags, seq, body = packet
+            if kind == KIND_NACK:
+                self._handle_request(body, resent)
+                continue
+            peer = self.peers.get(sender)
+            if peer is None:
+                peer = self.peers[sender] = _RemotePeer()
+            if kind == KIND_SNAPSHOT:
+                self._receive_chunk(peer, sender, seq, body, changes, now)
+            elif not flags & FLAG_HEARTBEAT:
+                self._receive_delta(peer, sender, seq, body, changes)
+            self._check_gap(peer, sender, seq, now)
+
+        self._flush_ops()
+        if self._snapshot_requested and now - self._last_requested_snapshot >= SNAPSHOT_MIN_INTERVAL:
+            self._last_requested_snapshot = now
+            self._send_snapshot(now)
+        elif self._changed and now - self._last_snapshot >= self.snapshot_interval:
+            self._send_snapshot(now)
+        if not self._send_queue and now - self._last_sent >= self.heartbeat_interval:
+            self._send_queue.append(pack_header(KIND_DELTA, self.instance_id, self.seq, FLAG_HEARTBEAT))
+        self._send_packets(now)
+        return changes.result(self.engine.model)
+
+    def _decode(self, data, addr):
+        """Runs on the transport thread: parse everything, drop our own packets."""
+        kind, flags, instance, seq = unpack_header(data)
+        if instance == self.instance_id:
+            return None
+        if kind == KIND_DELTA:
+            body = () if flags & FLAG_HEARTBEAT else decode_ops(data, HEADER.size)
+        elif kind == KIND_SNAPSHOT:
+            snapshot_id, index, count = CHUNK.unpack_from(data, HEADER.size)
+            if index >= count:
+                raise ValueError(f"Chunk {index} of {count}")
+            body = (snapshot_id, index, count, data[HEADER.size + CHUNK.size:])
+        elif kind == KIND_NACK:
+            target, first, count = NACK.unpack_from(data, HEADER.size)
+            if target != self.instance_id:
+                return None
+            body = (first, count)
+        else:
+            return None
+        return instance, (kind, flags, seq, body)
+
+    def _receive_delta(self, peer, sender, seq, ops, changes):
+        if not seq_newer(seq, peer.applied):
+            return  # Duplicate or retransmitted twice
+        if len(peer.pending) < MAX_PENDING_DELTAS:
+            peer.pending[seq] = ops
+        self._advance(peer, sender, changes)
+
+    def _advance(self, peer, sender, changes):
+        """Apply buffered deltas that continue the applied sequence."""
+        pending = peer.pending
+        while pending:
+            following = (peer.applied + 1) % SEQ_MODULUS
+            ops = pending.pop(following, None)
+            if ops is None:
+                break
+            self._apply(sender, ops, changes)
+            peer.applied = following
+            self.deltas_applied += 1
+
+    def _check_gap(self, peer, sender, latest, now):
+        """Ask `sender` for what is missing up to its seq `latest`."""
+        if peer.assembly is not None and now - peer.assembly[4] < SNAPSHOT_TIMEOUT:
+            return  # A snapshot is on its way
+        if len(peer.pending) >= MAX_PENDING_DELTAS:
+            self._request(peer, sender, 0, 0, now)
+        elif seq_newer(latest, peer.applied):
+            first = (peer.applied + 1) % SEQ_MODULUS
+            # Missing run: from first up to the next delta we already hold, or to latest
+            count = (latest - peer.applied) % SEQ_MODULUS
+            for seq in peer.pending:
+                count = min(count, (seq - first) % SEQ_MODULUS)
+            if count:
+                self._request(peer, sender, first, min(count, 0xFFFF), now)
+
+    def _request(self, peer, sender, first, count, now):
+        if now - peer.last_request < NACK_INTERVAL:
+            return
+        peer.last_request = now
+        self._send_queue.appendleft(pack_header(KIND_NACK, self.instance_id, 0)
+                                    + NACK.pack(sender, first, count))
+        self.requests_sent += 1
+
+    def _handle_request(self, body, resent):
+        first, count = body
+        history = self._history
+        if count == 0 or first not in history:
+            self._snapshot_requested = True  # Asked for, or too old to retransmit
+            return
+        for offset in range(count):
+            seq = (first + offset) % SEQ_MODULUS
+            packet = history.get(seq)
+            if packet is None or seq in resent:
+                continue
+            resent.add(seq)
+            self._send_queue.append(packet)
+            self.retransmits += 1
+
+    def _receive_chunk(self, peer, sender, base, body, changes, now):
+        snapshot_id, index, count, chunk = body
+        assembly = peer.assembly
+        if assembly is None or assembly[0] != snapshot_id:
+            if assembly is not None and not seq_newer(snapshot_id, assembly[0]):
+                return  # Late chunk of an older snapshot
+            assembly = peer.assembly = [snapshot_id, base, count, {}, now]
+        chunks = assembly[3]
+        chunks[index] = chunk
+        if len(chunks) < count:
+            return
+        peer.assembly = None
+        try:
+            ops = decode_ops(zlib.decompress(b"".join(chunks[i] for i in range(count))))
+        except (zlib.error, ValueError, KeyError):
+            self.malformed += 1
+            return
+        self._apply_snapshot(peer, sender, base, ops, changes)
+
+    def _apply_snapshot(self, peer, sender, base, ops, changes):
+        if not seq_newer(base, peer.applied):
+            return  # Already applied every delta the snapshot covers
+        # Units of this sender that are no longer on its board
+        listed = {op[1] for op in ops if op[0] == OP_ADD}
+        gone = [(OP_REMOVE, unit_id) for unit_id, owner in self.owners.items()
+                if owner == sender and unit_id not in listed]
+        self._apply(sender, gone + ops, changes)
+        self.snapshots_applied += 1
+        peer.applied = base
+        for seq in [seq for seq in peer.pending if not seq_newer(seq, base)]:
+            del peer.pending[seq]
+        self._advance(peer, sender, changes)
+
+    def _apply(self, sender, ops, changes):
+        """Apply remote ops through the engine (so journal and recorder see them)."""
+        engine = self.engine
+        model = engine.model
+        owners = self.owners
+        self._applying = True
+        try:
+            for op in ops:
+                code = op[0]
+                if code == OP_ADD:
+                    _, unit_id, text, x, y, symbol = op
+                    if model.get_unit_by_id(unit_id) is None:
+                        engine.add_unit(QuantumUnit(text, x, y, unit_id, symbol))
+                        changes.added[unit_id] = True
+                    elif engine.move_unit(unit_id, x, y):
+                        changes.moved[unit_id] = True
+                    owners[unit_id] = sender
+                elif code == OP_MOVE:
+                    if engine.move_unit(op[1], op[2], op[3]):
+                        changes.moved[op[1]] = True
+                elif code == OP_REMOVE:
+                    if engine.remove_unit(op[1]):
+                        owners.pop(op[1], None)
+                        changes.removed[op[1]] = True
+                elif code == OP_ENTANGLE:
+                    engine.entangle_units(op[1], op[2])
+                elif code == OP_RESET:
+                    engine.reset()
+                    owners.clear()
+                    changes.clear_board()
+        finally:
+            self._applying = False
+        self._changed = True
+
+    def _flush_ops(self):
+        """Pack the queued local ops into MTU-sized delta packets."""
+        if not self._outgoing:
+            return
+        room = self.mtu - HEADER.size
+        body = bytearray()
+        for op in self._outgoing:
+            encoded = encode_op(op)
+            if body and len(body) + len(encoded) > room:
+                self._queue_delta(body)
+                body = bytearray()
+            body += encoded
+        self._queue_delta(body)
+        self._outgoing = []
+        self._pending_moves.clear()
+
+    def _queue_delta(self, body):
+        self.seq = (self.seq + 1) % SEQ_MODULUS
+        packet = pack_header(KIND_DELTA, self.instance_id, self.seq) + bytes(body)
+        history = self._history
+        history[self.seq] = packet
+        if len(history) > self.history_size:
+            history.popitem(last=False)
+        self._send_queue.append(packet)
+        self.deltas_sent += 1
+
+    def _send_snapshot(self, now):
+        """Queue the owned board as compressed, MTU-sized chunks based on the current seq."""
+        self._snapshot_requested = False
+        self._changed = False
+        self._last_snapshot = now
+        data = zlib.compress(b"".join(encode_op(op) for op in self._board_ops()))
+        room = self.mtu - HEADER.size - CHUNK.size
+        count = max(1, math.ceil(len(data) / room))
+        if count > 0xFFFF:
+            print(f"Sync: Board too large for a snapshot ({len(data)} bytes)")
+            return
+        self._snapshot_id = (self._snapshot_id + 1) % SEQ_MODULUS
+        header = pack_header(KIND_SNAPSHOT, self.instance_id, self.seq)
+        for index in range(count):
+            self._send_queue.append(header + CHUNK.pack(self._snapshot_id, index, count)
+                                    + data[index * room:(index + 1) * room])
+        self.snapshots_sent += 1
+
+    def _send_packets(self, now):
+        queue = self._send_queue
+        if not queue:
+            return
+        send = self.transport.send
+        for _ in range(min(PACKETS_PER_POLL, len(queue))):
+            packet = queue.popleft()
+            self._send_count += 1
+            for destination in self.destinations:
+                send((self._send_count, destination), packet, destination)
+        self._last_sent = now
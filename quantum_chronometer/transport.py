@@ -0,0 +1,190 @@
+"""
+Asyncio UDP transport running in its own event-loop thread.
+
+Outgoing datagrams go through a coalescing send queue: send() from any
+thread replaces a datagram still pending under the same key, and the loop
+thread writes everything pending in one pass, so the caller never blocks
+in sendto. Incoming datagrams are decoded on the loop thread and only the
+latest value per peer is kept until drain() collects them, normally once
+per tick, so a burst of packets costs the UI thread one batch. Streams
+where every datagram matters use keep_all, which queues them instead.
+
+Has no Qt dependency.
+"""
+import asyncio
+import socket
+import threading
+
+START_TIMEOUT = 5.0  # Seconds start() waits for the event loop to come up
+MAX_BACKLOG = 10000  # Datagrams queued in keep_all mode before new ones are dropped
+
+
+def broadcast_socket(port):
+    """UDP socket that can broadcast, bound to `port` on all interfaces (if the port is free)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    
+    # Bind to all interfaces
+    try:
+        sock.bind(('', port))
+        print(f"Network: Listening on port {port}")
+    except Exception as e:
+        print(f"Network: Failed to bind port {port}: {e}")
+    return sock
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, owner):
+        self.owner = owner
+
+    def datagram_received(self, data, addr):
+        self.owner._received(data, addr)
+
+    def error_received(self, exc):
+        self.owner.errors += 1
+        self.owner.last_error = exc
+
+
+class DatagramTransport:
+    """
+    sock: UDP socket, already configured and bound; owned by the transport
+          from start() on and closed by stop().
+    decode: callable(data, addr) -> (peer, value), or None for datagrams
+            to drop. Runs on the loop thread; exceptions count as drops.
+    keep_all: queue every decoded (peer, value) for drain(), up to
+              max_backlog, instead of keeping the latest value per peer.
+    """
+
+    def __init__(self, sock, decode, keep_all=False, max_backlog=MAX_BACKLOG):
+        self.sock = sock
+        self.decode = decode
+        self.keep_all = keep_all
+        self.max_backlog = max_backlog
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> (data, addr), written by the next flush
+        self._flush_scheduled = False
+        self._latest = [] if keep_all else {}  # peer -> value in order of arrival, or (peer, value) list
+        self._loop = None
+        self._transport = None
+        self._thread = None
+
+        # Counters (written by the loop thread, except coalesced)
+        self.received = 0
+        self.dropped = 0
+        self.sent = 0
+        self.coalesced = 0  # Sends replaced by a newer one before they went out
+        self.overflowed = 0  # keep_all datagrams dropped because drain() fell behind
+        self.errors = 0
+        self.last_error = None
+
+    @property
+    def running(self):
+        return self._transport is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the event-loop thread. Returns False if the endpoint could not be created."""
+        if self._thread is not None:
+            return self.running
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="udp-transport", daemon=True)
+        self._thread.start()
+        ready.wait(START_TIMEOUT)
+        return self.running
+
+    def stop(self):
+        """Stop the loop thread and close the socket."""
+        loop = self._loop
+        if loop is not None and self._thread.is_alive():
+            try:
+                loop.call_soon_threadsafe(loop.stop)
+            except RuntimeError:
+                pass  # Loop already closed
+            self._thread.join()
+        else:
+            self.sock.close()
+
+    def send(self, key, data, addr):
+        """
+        Queue `data` for `addr` without blocking. A datagram still pending
+        under the same key is replaced. Returns False if the transport is
+        not running.
+        """
+        loop = self._loop
+        if loop is None or self._transport is None:
+            return False
+        with self._lock:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = (data, addr)
+            if self._flush_scheduled:
+                return True
+            self._flush_scheduled = True
+        try:
+            loop.call_soon_threadsafe(self._flush)
+        except RuntimeError:
+            return False
+        return True
+
+    def drain(self):
+        """
+        Latest decoded value per peer since the last drain, oldest first
+        ({peer: value}), or with keep_all every (peer, value) in arrival order.
+        """
+        with self._lock:
+            latest, self._latest = self._latest, ([] if self.keep_all else {})
+        return latest
+
+    # --- Loop thread ---
+
+    def _run(self, ready):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self._transport, _ = loop.run_until_complete(
+                loop.create_datagram_endpoint(lambda: _DatagramProtocol(self), sock=self.sock)
+            )
+        except Exception as e:
+            self.last_error = e
+            print(f"Network: Transport failed to start: {e}")
+            self.sock.close()
+            loop.close()
+            ready.set()
+            return
+        self._loop = loop
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._transport.close()
+            loop.run_until_complete(asyncio.sleep(0))  # Let the transport finish closing
+            loop.close()
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flush_scheduled = False
+        for data, addr in pending.values():
+            self._transport.sendto(data, addr)  # Socket errors go to error_received
+            self.sent += 1
+
+    def _received(self, data, addr):
+        try:
+            decoded = self.decode(data, addr)
+        except Exception:
+            decoded = None
+        if decoded is None:
+            self.dropped += 1
+            return
+        with self._lock:
+            latest = self._latest
+            if self.keep_all:
+                if len(latest) >= self.max_backlog:
+                    self.overflowed += 1
+                    return
+                latest.append(decoded)
+            else:
+                peer, value = decoded
+                latest.pop(peer, None)  # Re-insert so the order follows arrival
+                latest[peer] = value
+        self.received += 1
@@ -1,10 +1,12 @@
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QLineEdit, QApplication, QPushButton, QDialog, QGridLayout,
-    QScrollArea, QTabWidget, QFrame, QComboBox
+    QScrollArea, QTabWidget, QFrame, QComboBox, QToolTip
 )
-from PySide6.QtCore import Qt, QTimer, QPoint, Signal, QMimeData
-from PySide6.QtGui import QDrag, QPixmap, QPainter, QFont, QColor, QPen
+from PySide6.QtCore import Qt, QTimer, QPoint, QRect, Signal, QMimeData, QEvent, QElapsedTimer
+from PySide6.QtGui import QDrag, QPixmap, QPainter, QFont, QColor, QPen, QRegion
+
+from .profiler import NULL_PROFILER
 
 # --- Styling Constants ---
 COLOR_BACKGROUND = "#0b0f19"
@@ -16,6 +18,7 @@ COLOR_HEADER = "#00f0ff"
 COLOR_BUTTON = "#1e3a5f"
 COLOR_BUTTON_HOVER = "#2a5a8f"
 FONT_FAMILY = "Consolas"
+DRAG_MOVE_INTERVAL_MS = 50  # A dragged unit reports its position at most this often (one sim tick)
 
 # Superposition symbol colors
 SUPERPOSITION_COLORS = {
@@ -324,12 +327,42 @@ class EmojiPickerDialog(QDialog):
 
 
 
+def unit_tooltip(superposition_symbol, local_time_str):
+    return f"Superposition: {superposition_symbol}\nLocal Time: {local_time_str}"
+
+
 class DraggableUnitWidget(QWidget):
     """
     Visual representation of a quantum unit with its own local time display.
     Supports multi-emoji text and colored glow based on superposition.
     """
     unit_moved = Signal(str, int, int)  # unit_id, new_x, new_y
+
+    TIME_LABEL_TOP = 55  # Local time text is drawn below this y offset
+    _paint_cache = None  # Fonts, pens and colors shared by every unit widget
+
+    @classmethod
+    def paint_resources(cls):
+        """
+        Fonts, pens and colors used by paintEvent, built once on first paint
+        (QFont needs a running QApplication) and shared by all instances.
+        """
+        if cls._paint_cache is None:
+            cls._paint_cache = {
+                "emoji_font": QFont("Segoe UI Emoji", 20),
+                "time_font": QFont(FONT_FAMILY, 8),
+                "symbol_font": QFont("Arial", 12, QFont.Bold),
+                "emoji_pen": QPen(QColor(255, 255, 255)),
+                "time_pen": QPen(QColor(COLOR_TEXT_LOCAL_TIME)),
+                "default_glow": QColor(0, 240, 255, 30),
+                "default_symbol_pen": QPen(QColor(255, 255, 255, 180)),
+                "symbol_pens": {
+                    '+': QPen(QColor(0, 255, 255)),   # Cyan
+                    '*': QPen(QColor(200, 100, 255)), # Purple
+                    '~': QPen(QColor(255, 70, 70)),   # Red
+                },
+            }
+        return cls._paint_cache
     
     def __init__(self, unit_id, text, superposition_symbol='+', display_width=60, parent=None):
         super().__init__(parent)
@@ -343,7 +376,6 @@ class DraggableUnitWidget(QWidget):
         self.widget_width = max(110, self.orb_width) # Ensure at least 110px for time text
         self.setFixedSize(self.widget_width, 80)
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setToolTip(f"Superposition: {superposition_symbol}")
         
         self.drag_start_position = None
         self.show_symbol = True
@@ -352,50 +384,63 @@ class DraggableUnitWidget(QWidget):
         self.show_symbol = show
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    @classmethod
+    def paint_unit(cls, painter, rect, orb_width, text, superposition_symbol, local_time_str, show_symbol):
+        """Draw one unit (orb, emoji, local time, symbol) into `rect`."""
+        res = cls.paint_resources()
         
         # Get glow color based on superposition symbol
-        glow_color = SUPERPOSITION_COLORS.get(self.superposition_symbol, QColor(0, 240, 255, 30))
+        glow_color = SUPERPOSITION_COLORS.get(superposition_symbol, res["default_glow"])
         
         # Draw glow/background ellipse
         painter.setBrush(glow_color)
         painter.setPen(Qt.NoPen)
         
-        # Center the orb in the widget
-        orb_x = (self.width() - self.orb_width) // 2
-        painter.drawEllipse(orb_x, 5, self.orb_width, 50)
+        # Center the orb in the rect
+        orb_x = rect.x() + (rect.width() - orb_width) // 2
+        painter.drawEllipse(orb_x, rect.y() + 5, orb_width, 50)
         
         # Draw emoji
-        painter.setFont(QFont("Segoe UI Emoji", 20))
-        painter.setPen(QColor(255, 255, 255))
-        painter.drawText(self.rect().adjusted(0, 5, 0, -20), Qt.AlignCenter, self.emoji_text)
+        painter.setFont(res["emoji_font"])
+        painter.setPen(res["emoji_pen"])
+        painter.drawText(rect.adjusted(0, 5, 0, -20), Qt.AlignCenter, text)
         
         # Draw local time below
-        painter.setFont(QFont(FONT_FAMILY, 8))
-        painter.setPen(QColor(COLOR_TEXT_LOCAL_TIME))
-        painter.drawText(self.rect().adjusted(0, 55, 0, 0), Qt.AlignHCenter | Qt.AlignTop, self.local_time_str)
+        painter.setFont(res["time_font"])
+        painter.setPen(res["time_pen"])
+        painter.drawText(rect.adjusted(0, cls.TIME_LABEL_TOP, 0, 0), Qt.AlignHCenter | Qt.AlignTop, local_time_str)
         
         # Draw Superposition Symbol (Top Right)
-        if self.show_symbol:
-            # Color logic
-            symbol_color = QColor(255, 255, 255, 180) # Default
-            if self.superposition_symbol == '+':
-                symbol_color = QColor(0, 255, 255) # Cyan
-            elif self.superposition_symbol == '*':
-                symbol_color = QColor(200, 100, 255) # Purple
-            elif self.superposition_symbol == '~':
-                symbol_color = QColor(255, 70, 70) # Red
-
-            painter.setFont(QFont("Arial", 12, QFont.Bold))
-            painter.setPen(symbol_color)
-            painter.drawText(self.rect().adjusted(0, 5, -8, 0), Qt.AlignRight | Qt.AlignTop, self.superposition_symbol)
+        if show_symbol:
+            painter.setFont(res["symbol_font"])
+            painter.setPen(res["symbol_pens"].get(superposition_symbol, res["default_symbol_pen"]))
+            painter.drawText(rect.adjusted(0, 5, -8, 0), Qt.AlignRight | Qt.AlignTop, superposition_symbol)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.paint_unit(painter, self.rect(), self.orb_width, self.emoji_text,
+                        self.superposition_symbol, self.local_time_str, self.show_symbol)
+
+    def event(self, event):
+        # Build the tooltip only when it is about to be shown
+        if event.type() == QEvent.ToolTip:
+            self.setToolTip(unit_tooltip(self.superposition_symbol, self.local_time_str))
+        return super().event(event)
         
     def update_local_time(self, time_str):
+        """
+        Store a new local time string without repainting; the whiteboard
+        batches the repaint. Returns False if the string did not change.
+        """
+        if time_str == self.local_time_str:
+            return False
         self.local_time_str = time_str
-        self.setToolTip(f"Superposition: {self.superposition_symbol}\nLocal Time: {time_str}")
-        self.update()  # Trigger repaint
+        return True
+
+    def time_label_rect(self):
+        """Area of the local time text, in whiteboard coordinates."""
+        return self.geometry().adjusted(0, self.TIME_LABEL_TOP, 0, 0)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -424,39 +469,159 @@ class DraggableUnitWidget(QWidget):
         drag.exec(Qt.MoveAction)
 
 
+class PaintedUnit:
+    """
+    A unit drawn by the whiteboard itself (painter renderer) instead of by
+    its own child widget. Provides the parts of DraggableUnitWidget's
+    interface the whiteboard uses: width(), move(), geometry() and the
+    local time label methods.
+    """
+    __slots__ = ("unit_id", "emoji_text", "superposition_symbol", "local_time_str",
+                 "orb_width", "widget_width", "left", "top")
+
+    HEIGHT = 80
+
+    def __init__(self, unit_id, text, superposition_symbol='+', display_width=60):
+        self.unit_id = unit_id
+        self.emoji_text = text
+        self.superposition_symbol = superposition_symbol
+        self.local_time_str = "00:00:00"
+        self.orb_width = max(60, display_width)
+        self.widget_width = max(110, self.orb_width)
+        self.left = 0
+        self.top = 0
+
+    def width(self):
+        return self.widget_width
+
+    def move(self, x, y):
+        self.left = x
+        self.top = y
+
+    def geometry(self):
+        return QRect(self.left, self.top, self.widget_width, self.HEIGHT)
+
+    def contains(self, pos):
+        return (self.left <= pos.x() < self.left + self.widget_width
+                and self.top <= pos.y() < self.top + self.HEIGHT)
+
+    def update_local_time(self, time_str):
+        if time_str == self.local_time_str:
+            return False
+        self.local_time_str = time_str
+        return True
+
+    def time_label_rect(self):
+        return self.geometry().adjusted(0, DraggableUnitWidget.TIME_LABEL_TOP, 0, 0)
+
+    def paint(self, painter, show_symbol, rect=None):
+        DraggableUnitWidget.paint_unit(
+            painter, rect if rect is not None else self.geometry(), self.orb_width,
+            self.emoji_text, self.superposition_symbol, self.local_time_str, show_symbol
+        )
+
+
 class QuantumWhiteboardWidget(QWidget):
-    """The main display area with the grid and proximity lines."""
+    """
+    The main display area with the grid and proximity lines.
+    Units are drawn either as one child widget each ("widgets") or all in
+    the whiteboard's own paint pass with hit-testing for drag ("painter").
+    The painter renderer stays fast with many hundreds of units.
+    """
     
     unit_dropped = Signal(str, QPoint)  # For new units (text, position)
     unit_moved = Signal(str, int, int)  # For existing units (unit_id, x, y)
 
-    def __init__(self):
+    RENDERERS = ("widgets", "painter")
+
+    def __init__(self, renderer="widgets"):
         super().__init__()
+        if renderer not in self.RENDERERS:
+            raise ValueError(f"Unknown renderer {renderer!r}, expected one of {self.RENDERERS}")
+        self.renderer = renderer
         self.setAcceptDrops(True)
         self.setStyleSheet(f"background-color: {COLOR_BACKGROUND}; border: 1px solid {COLOR_GRID}; border-radius: 10px;")
-        self.unit_widgets = {}  # unit_id -> DraggableUnitWidget
-        self.proximity_pairs = []  # List of ((x1,y1), (x2,y2)) for drawing lines
+        self.unit_widgets = {}  # unit_id -> DraggableUnitWidget, or PaintedUnit with the painter renderer
+        self._drag_unit = None  # PaintedUnit under a left-button press
+        self._drag_start_position = None
+        self._drag_move_timer = QElapsedTimer()  # Since the last position reported during a drag
+        self.proximity_pairs = {}  # pair key -> ((x1,y1), (x2,y2)) for drawing lines
         self.grid_type = "Square"  # Square, Circle, Hexagon
         self.show_symbols = True
+        self.profiler = NULL_PROFILER  # Replaced by the controller when profiling
+        self._grid_cache = None  # (key, QPixmap) of the rendered background grid
 
     def toggle_symbols(self, show):
         self.show_symbols = show
+        if self.renderer == "painter":
+            self.update()
+            return
         for widget in self.unit_widgets.values():
             widget.set_show_symbol(show)
 
     def set_grid_type(self, grid_type):
         self.grid_type = grid_type
+        self._grid_cache = None
         self.update()
 
     def set_proximity_pairs(self, pairs):
         """Set the pairs of units to draw lines between."""
-        self.proximity_pairs = pairs
+        self.proximity_pairs = dict(enumerate(pairs))
         self.update()  # Trigger repaint
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    @staticmethod
+    def _line_rect(line):
+        (x1, y1), (x2, y2) = line
+        return QRect(QPoint(int(min(x1, x2)), int(min(y1, y2))),
+                     QPoint(int(max(x1, x2)), int(max(y1, y2)))).adjusted(-2, -2, 2, 2)
+
+    def update_proximity_lines(self, lines, removed=(), reset=False):
+        """
+        Apply proximity line changes. `lines` maps a pair key to
+        ((x1, y1), (x2, y2)) for new or moved lines and `removed` lists keys
+        to drop; with reset, `lines` replaces every line. Only the areas of
+        changed lines are repainted, and nothing at all when there are none.
+        """
+        if reset:
+            self.proximity_pairs = dict(lines)
+            self.update()
+            return
+        current = self.proximity_pairs
+        dirty = QRegion()
+        for key in removed:
+            line = current.pop(key, None)
+            if line is not None:
+                dirty = dirty.united(self._line_rect(line))
+        for key, line in lines.items():
+            old = current.get(key)
+            if old is not None:
+                dirty = dirty.united(self._line_rect(old))
+            current[key] = line
+            dirty = dirty.united(self._line_rect(line))
+        if not dirty.isEmpty():
+            self.update(dirty)
+
+    def resizeEvent(self, event):
+        self._grid_cache = None
+        super().resizeEvent(event)
+
+    def _grid_pixmap(self):
+        """
+        Background and grid, rendered once per (grid_type, size, device pixel
+        ratio) and reused by every repaint until a resize or set_grid_type.
+        """
+        dpr = self.devicePixelRatioF()
+        key = (self.grid_type, self.width(), self.height(), dpr)
+        if self._grid_cache is None or self._grid_cache[0] != key:
+            self._grid_cache = (key, self._render_grid(self.width(), self.height(), dpr))
+        return self._grid_cache[1]
+
+    def _render_grid(self, width, height, dpr):
+        pixmap = QPixmap(max(1, round(width * dpr)), max(1, round(height * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(QColor(COLOR_BACKGROUND))
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
-        painter.fillRect(self.rect(), QColor(COLOR_BACKGROUND))
         
         # Draw Grid
         pen = QPen(QColor(COLOR_GRID))
@@ -466,10 +631,10 @@ class QuantumWhiteboardWidget(QWidget):
         grid_size = 40
         
         if self.grid_type == "Square":
-            for x in range(0, self.width(), grid_size):
-                painter.drawLine(x, 0, x, self.height())
-            for y in range(0, self.height(), grid_size):
-                painter.drawLine(0, y, self.width(), y)
+            for x in range(0, width, grid_size):
+                painter.drawLine(x, 0, x, height)
+            for y in range(0, height, grid_size):
+                painter.drawLine(0, y, width, y)
                 
         elif self.grid_type == "Circle":
             # Draw lines connecting centers first
@@ -478,16 +643,16 @@ class QuantumWhiteboardWidget(QWidget):
             pen_lines.setStyle(Qt.DotLine)
             painter.setPen(pen_lines)
             
-            for x in range(0, self.width(), grid_size):
-                painter.drawLine(x, 0, x, self.height())
-            for y in range(0, self.height(), grid_size):
-                painter.drawLine(0, y, self.width(), y)
+            for x in range(0, width, grid_size):
+                painter.drawLine(x, 0, x, height)
+            for y in range(0, height, grid_size):
+                painter.drawLine(0, y, width, y)
                 
             # Draw dots at intersections
             painter.setBrush(QColor(COLOR_GRID))
             painter.setPen(Qt.NoPen)
-            for x in range(0, self.width(), grid_size):
-                for y in range(0, self.height(), grid_size):
+            for x in range(0, width, grid_size):
+                for y in range(0, height, grid_size):
                     painter.drawEllipse(x-2, y-2, 4, 4)
                     
         elif self.grid_type == "Hexagon":
@@ -499,8 +664,8 @@ class QuantumWhiteboardWidget(QWidget):
             horiz_dist = w
             vert_dist = 3/4 * h
             
-            rows = int(self.height() / vert_dist) + 2
-            cols = int(self.width() / horiz_dist) + 2
+            rows = int(height / vert_dist) + 2
+            cols = int(width / horiz_dist) + 2
             
             hex_pen = QPen(QColor(COLOR_GRID))
             hex_pen.setWidth(1)
@@ -544,6 +709,18 @@ class QuantumWhiteboardWidget(QWidget):
                         p1 = points[i]
                         p2 = points[(i + 1) % 6]
                         painter.drawLine(p1, p2)
+
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        with self.profiler.phase("repaint"):
+            self._paint_board(event.rect())
+
+    def _paint_board(self, exposed):
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._grid_pixmap())
+        painter.setRenderHint(QPainter.Antialiasing)
         
         # Draw Proximity Lines
         if self.proximity_pairs:
@@ -552,15 +729,92 @@ class QuantumWhiteboardWidget(QWidget):
             line_pen.setStyle(Qt.DashLine)
             painter.setPen(line_pen)
             
-            for (x1, y1), (x2, y2) in self.proximity_pairs:
+            for (x1, y1), (x2, y2) in self.proximity_pairs.values():
                 painter.drawLine(int(x1), int(y1), int(x2), int(y2))
 
+        # Draw units in insertion order (later units on top), painter renderer only
+        if self.renderer == "painter":
+            for unit in self.unit_widgets.values():
+                if exposed.intersects(unit.geometry()):
+                    unit.paint(painter, self.show_symbols)
+
+    def unit_at(self, pos):
+        """Topmost painted unit under `pos`, or None (always None with the widget renderer)."""
+        if self.renderer != "painter":
+            return None
+        for unit in reversed(self.unit_widgets.values()):
+            if unit.contains(pos):
+                return unit
+        return None
+
+    def event(self, event):
+        if event.type() == QEvent.ToolTip and self.renderer == "painter":
+            unit = self.unit_at(event.pos())
+            if unit is not None:
+                QToolTip.showText(event.globalPos(), unit_tooltip(unit.superposition_symbol, unit.local_time_str), self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_unit = self.unit_at(event.pos())
+            self._drag_start_position = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_unit = None
+        super().mouseReleaseEvent(event)
+
+    def mouseMoveEvent(self, event):
+        unit = self._drag_unit
+        if (unit is None or not (event.buttons() & Qt.LeftButton)
+                or (event.pos() - self._drag_start_position).manhattanLength() < QApplication.startDragDistance()):
+            # Let the main window keep tracking the mouse for observation
+            super().mouseMoveEvent(event)
+            return
+        self._drag_unit = None
+
+        drag = QDrag(self)
+        mime_data = QMimeData()
+        # Same payload as DraggableUnitWidget so dropEvent handles both renderers
+        mime_data.setText(f"MOVE:{unit.unit_id}:{unit.emoji_text}")
+        drag.setMimeData(mime_data)
+
+        pixmap = QPixmap(unit.widget_width, unit.HEIGHT)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        unit.paint(painter, self.show_symbols, pixmap.rect())
+        painter.end()
+        drag.setPixmap(pixmap)
+        drag.setHotSpot(QPoint(30, 40))
+
+        drag.exec(Qt.MoveAction)
+
     def dragEnterEvent(self, event):
         if event.mimeData().hasText():
+            self._drag_move_timer.start()
             event.accept()
         else:
             event.ignore()
 
+    def dragMoveEvent(self, event):
+        """
+        Move a dragged unit along with the cursor, reporting its position
+        every DRAG_MOVE_INTERVAL_MS so the model sees the path of the drag
+        (and its speed), not only where it is dropped.
+        """
+        text = event.mimeData().text()
+        if text.startswith("MOVE:") and self._drag_move_timer.hasExpired(DRAG_MOVE_INTERVAL_MS):
+            self._drag_move_timer.restart()
+            unit_id = text.split(":")[1]
+            position = event.position().toPoint()
+            self.unit_moved.emit(unit_id, position.x(), position.y())
+            self.move_unit_widget(unit_id, position.x(), position.y())
+        event.accept()
+
     def dropEvent(self, event):
         text = event.mimeData().text()
         position = event.position().toPoint()
@@ -569,16 +823,19 @@ class QuantumWhiteboardWidget(QWidget):
             parts = text.split(":")
             unit_id = parts[1]
             self.unit_moved.emit(unit_id, position.x(), position.y())
-            
-            if unit_id in self.unit_widgets:
-                widget = self.unit_widgets[unit_id]
-                widget.move(position.x() - widget.width()//2, position.y() - 40)
+            self.move_unit_widget(unit_id, position.x(), position.y())
         else:
             self.unit_dropped.emit(text, position)
         
         event.accept()
 
     def add_unit_widget(self, unit_id, text, x, y, superposition_symbol='+', display_width=60):
+        if self.renderer == "painter":
+            unit = PaintedUnit(unit_id, text, superposition_symbol, display_width)
+            unit.move(x - unit.width()//2, y - 40)
+            self.unit_widgets[unit_id] = unit
+            self.update(unit.geometry())
+            return unit
         widget = DraggableUnitWidget(unit_id, text, superposition_symbol, display_width, self)
         widget.move(x - widget.width()//2, y - 40)
         widget.set_show_symbol(self.show_symbols)
@@ -586,9 +843,48 @@ class QuantumWhiteboardWidget(QWidget):
         self.unit_widgets[unit_id] = widget
         return widget
 
+    def move_unit_widget(self, unit_id, x, y):
+        """Center a unit on (x, y) (its emoji orb, as in add_unit_widget)."""
+        widget = self.unit_widgets.get(unit_id)
+        if widget is None:
+            return
+        old_rect = widget.geometry()
+        widget.move(x - widget.width()//2, y - 40)
+        if self.renderer == "painter":
+            self.update(QRegion(old_rect).united(widget.geometry()))
+
+    def remove_unit_widget(self, unit_id):
+        widget = self.unit_widgets.pop(unit_id, None)
+        if widget is None:
+            return
+        if self.renderer == "painter":
+            self.update(widget.geometry())
+        else:
+            widget.deleteLater()
+
+    def clear_units(self):
+        """Remove every unit from the board."""
+        if self.renderer == "widgets":
+            for widget in self.unit_widgets.values():
+                widget.deleteLater()
+        self.unit_widgets.clear()
+        self.update()
+
     def update_unit_time(self, unit_id, time_str):
-        if unit_id in self.unit_widgets:
-            self.unit_widgets[unit_id].update_local_time(time_str)
+        self.update_unit_times({unit_id: time_str})
+
+    def update_unit_times(self, labels):
+        """
+        Apply a {unit_id: time_str} batch and repaint only the time labels
+        that changed, in a single update.
+        """
+        dirty = QRegion()
+        for unit_id, time_str in labels.items():
+            widget = self.unit_widgets.get(unit_id)
+            if widget is not None and widget.update_local_time(time_str):
+                dirty = dirty.united(widget.time_label_rect())
+        if not dirty.isEmpty():
+            self.update(dirty)
 
 
 class QuantumView(QMainWindow):
@@ -605,7 +901,7 @@ class QuantumView(QMainWindow):
     grid_changed = Signal(str)
     symbols_toggled = Signal(bool)
 
-    def __init__(self, controller):
+    def __init__(self, controller, renderer="widgets"):
         super().__init__()
         self.controller = controller
         self.setWindowTitle("Quantum Chronometer")
@@ -643,7 +939,7 @@ class QuantumView(QMainWindow):
         layout.addWidget(header)
 
         # 4. Whiteboard
-        self.whiteboard = QuantumWhiteboardWidget()
+        self.whiteboard = QuantumWhiteboardWidget(renderer)
         layout.addWidget(self.whiteboard, 1)
 
         # 5. Bottom Bar: Add Button + Observe Button
@@ -851,6 +1147,16 @@ class QuantumView(QMainWindow):
         """)
         self.setCentralWidget(central_widget)
         
+        # Profiler overlay (only shown when the tick profiler is enabled)
+        self.profiler_label = QLabel(self.whiteboard)
+        self.profiler_label.setFont(QFont(FONT_FAMILY, 8))
+        self.profiler_label.setStyleSheet(
+            f"color: {COLOR_TEXT_LOCAL_TIME}; background-color: rgba(11, 15, 25, 200); padding: 4px;"
+        )
+        self.profiler_label.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.profiler_label.move(8, 8)
+        self.profiler_label.hide()
+        
         # Track mouse for proximity observation
         self.setMouseTracking(True)
         central_widget.setMouseTracking(True)
@@ -873,13 +1179,34 @@ class QuantumView(QMainWindow):
     def add_visual_unit(self, unit_id, text, x, y, superposition_symbol='+', display_width=60):
         return self.whiteboard.add_unit_widget(unit_id, text, x, y, superposition_symbol, display_width)
 
+    def move_visual_unit(self, unit_id, x, y):
+        self.whiteboard.move_unit_widget(unit_id, x, y)
+
+    def remove_visual_unit(self, unit_id):
+        self.whiteboard.remove_unit_widget(unit_id)
+
     def update_unit_local_time(self, unit_id, time_str):
         self.whiteboard.update_unit_time(unit_id, time_str)
 
+    def update_unit_local_times(self, labels):
+        """Update several unit time labels ({unit_id: time_str}) in one repaint."""
+        self.whiteboard.update_unit_times(labels)
+
     def set_proximity_pairs(self, pairs):
         """Update the proximity line data on the whiteboard."""
         self.whiteboard.set_proximity_pairs(pairs)
 
+    def update_proximity_lines(self, lines, removed=(), reset=False):
+        """Apply added/moved/removed proximity lines, repainting only what changed."""
+        self.whiteboard.update_proximity_lines(lines, removed, reset)
+
+    def set_profiler_overlay(self, text):
+        """Show tick profiler statistics in the top-left corner of the whiteboard."""
+        self.profiler_label.setText(text)
+        self.profiler_label.adjustSize()
+        self.profiler_label.show()
+        self.profiler_label.raise_()
+
     def handle_symbols_toggled(self, checked):
         self.symbols_button.setText(f"Symbols: {'ON' if checked else 'OFF'}")
         self.whiteboard.toggle_symbols(checked)
@@ -0,0 +1,107 @@
+"""
+Binary wire protocol for instance-to-instance packets, and the policy
+deciding when the local distortion is worth broadcasting.
+
+Every packet starts with the same fixed header (little-endian):
+
+    magic     4s   b"QCHR"
+    version   u8
+    kind      u8   KIND_* constant
+    flags     u16  FLAG_* bits
+    instance  u64  sender's instance id
+    seq       u32  sender's sequence number (wraps)
+
+A distortion packet is the header followed by the value as a float64,
+28 bytes in all, decoded with a single struct call. The board sync
+packets (KIND_DELTA, KIND_SNAPSHOT, KIND_NACK) carry bodies defined in
+sync.py.
+"""
+import struct
+import time
+
+MAGIC = b"QCHR"
+VERSION = 1
+
+HEADER = struct.Struct("<4sBBHQI")
+DISTORTION = struct.Struct("<4sBBHQId")  # HEADER + float64 value
+
+KIND_DISTORTION = 1
+KIND_DELTA = 2      # Board changes; with FLAG_HEARTBEAT, only the sender's latest seq
+KIND_SNAPSHOT = 3   # One chunk of a full board snapshot
+KIND_NACK = 4       # Request to retransmit deltas (or send a snapshot)
+
+FLAG_HEARTBEAT = 0x0001  # Sent because the heartbeat interval elapsed, not because the value changed
+
+SEND_DELTA = 0.01       # Min change in distortion worth a packet
+SEND_MAX_RATE = 10.0    # Max packets per second
+SEND_HEARTBEAT = 1.0    # Max seconds between packets, so peers do not expire us
+
+
+def unpack_header(data):
+    """(kind, flags, instance, seq) of a packet. Raises ValueError for foreign or malformed data."""
+    if len(data) < HEADER.size:
+        raise ValueError(f"Packet too short ({len(data)} bytes)")
+    magic, version, kind, flags, instance, seq = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a Quantum Chronometer packet")
+    if version != VERSION:
+        raise ValueError(f"Unsupported packet version {version}")
+    return kind, flags, instance, seq
+
+
+def pack_header(kind, instance, seq, flags=0):
+    return HEADER.pack(MAGIC, VERSION, kind, flags, instance, seq)
+
+
+def pack_distortion(instance, seq, value, flags=0):
+    return DISTORTION.pack(MAGIC, VERSION, KIND_DISTORTION, flags, instance, seq, value)
+
+
+def unpack_distortion(data):
+    """(instance, seq, value, flags) of a distortion packet. Raises ValueError for anything else."""
+    if len(data) != DISTORTION.size:
+        raise ValueError(f"Distortion packet has {len(data)} bytes, expected {DISTORTION.size}")
+    magic, version, kind, flags, instance, seq, value = DISTORTION.unpack(data)
+    if magic != MAGIC or version != VERSION or kind != KIND_DISTORTION:
+        raise ValueError("Not a distortion packet")
+    return instance, seq, value, flags
+
+
+class SendPolicy:
+    """
+    Decides whether a new local value goes on the wire: only if it moved
+    by at least `delta` since the last packet, never more than `max_rate`
+    packets per second, and at least every `heartbeat` seconds regardless.
+    """
+
+    def __init__(self, delta=SEND_DELTA, max_rate=SEND_MAX_RATE, heartbeat=SEND_HEARTBEAT,
+                 clock=time.monotonic):
+        self.delta = delta
+        self.min_interval = 1.0 / max_rate
+        self.heartbeat = heartbeat
+        self.clock = clock
+        self.last_value = None
+        self.last_sent = None
+        self.suppressed = 0  # Values not sent
+
+    def decide(self, value, now=None):
+        """Flags to send `value` with, or None to skip it. A send is assumed to happen."""
+        if now is None:
+            now = self.clock()
+        last_sent = self.last_sent
+        if last_sent is None:
+            flags = 0
+        elif now - last_sent < self.min_interval:
+            flags = None
+        elif abs(value - self.last_value) >= self.delta:
+            flags = 0
+        elif now - last_sent >= self.heartbeat:
+            flags = FLAG_HEARTBEAT
+        else:
+            flags = None
+        if flags is None:
+            self.suppressed += 1
+            return None
+        self.last_value = value
+        self.last_sent = now
+        return flags
@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+import unittest
+from quantum_chronometer import benchmark
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """Smoke tests for the benchmark harness (tiny sizes only)."""
+
+    def test_build_model_layouts(self):
+        for layout in benchmark.LAYOUTS:
+            model = benchmark.build_model(layout, 20)
+            self.assertEqual(len(model.units), 20)
+        entangled = benchmark.build_model("entangled", 20)
+        self.assertGreaterEqual(len(entangled.entangled_pairs), 19)
+
+    def test_report_is_json_serializable(self):
+        report = benchmark.run_benchmarks(sizes=[10], repeat=1)
+        operations = {r["operation"] for r in report["results"]}
+        self.assertEqual(operations, {"update_unit_times", "drag_tick", "get_proximity_pairs",
+                                      "save_state", "load_state", "emoji_count"})
+        self.assertEqual(len(report["results"]), len(benchmark.LAYOUTS) * 6)
+        json.dumps(report)
+
+    def test_layout_size_caps(self):
+        report = benchmark.run_benchmarks(sizes=[10, 10**6], layouts=["overlapping"], repeat=1)
+        self.assertEqual({r["units"] for r in report["results"]}, {10})
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": [{"layout": "uniform", "units": 10, "backend": "python",
+                                 "operation": "save_state", "median_ms": 1.0}]}
+        current = {"results": [{"layout": "uniform", "units": 10, "backend": "python",
+                                "operation": "save_state", "median_ms": 2.0}]}
+        self.assertEqual(len(benchmark.compare_results(baseline, current)), 1)
+        self.assertEqual(benchmark.compare_results(baseline, baseline), [])
+
+    def test_main_writes_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.json")
+            ret = benchmark.main(["--sizes", "10", "--layouts", "uniform", "--repeat", "1", "--output", path])
+            self.assertEqual(ret, 0)
+            with open(path, encoding='utf-8') as f:
+                self.assertIn("results", json.load(f))
+            self.assertEqual(benchmark.main(["--sizes", "10", "--layouts", "uniform",
+                                             "--repeat", "1", "--compare", path, "--tolerance", "1000"]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import socket
+import time
+import unittest
+from quantum_chronometer.channel import DistortionChannel
+from quantum_chronometer.wire import SendPolicy, pack_distortion
+
+
+class TestDistortionChannel(unittest.TestCase):
+    """Tests for the Qt-free distortion broadcast core on loopback."""
+
+    def setUp(self):
+        sockets = []
+        for _ in range(3):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(("127.0.0.1", 0))
+            sockets.append(sock)
+        addresses = [sock.getsockname() for sock in sockets]
+        self.channels = [
+            DistortionChannel(sock, addresses, aggregation="sum", send_policy=SendPolicy(max_rate=1000.0))
+            for sock in sockets
+        ]
+        for channel in self.channels:
+            self.assertTrue(channel.start())
+
+    def tearDown(self):
+        for channel in self.channels:
+            channel.stop()
+
+    def poll_until(self, channel, expected, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            channel.poll()
+            if abs(channel.peers.aggregate() - expected) < 1e-9:
+                return True
+            time.sleep(0.005)
+        return False
+
+    def test_peers_are_aggregated_without_own_echo(self):
+        a, b, c = self.channels
+        self.assertTrue(a.send(0.25))
+        self.assertTrue(b.send(0.5))
+        self.assertTrue(c.send(1.0))
+        self.assertTrue(self.poll_until(a, 1.5))
+        self.assertEqual(len(a.peers), 2)
+        self.assertTrue(self.poll_until(c, 0.75))
+
+    def test_poll_reports_only_changes(self):
+        a, b, _c = self.channels
+        b.send(0.5)
+        self.assertTrue(self.poll_until(a, 0.5))
+        self.assertIsNone(a.poll())
+        self.assertEqual(a.apply({123: (1, 2.0)}), 2.5)
+
+    def test_garbage_is_dropped(self):
+        a, b, _c = self.channels
+        target = a.transport.sock.getsockname()
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(b"not a packet", target)
+            sock.sendto(pack_distortion(7, 1, 0.5) + bytes(100), target)
+        b.send(0.5)
+        self.assertTrue(self.poll_until(a, 0.5))
+        deadline = time.monotonic() + 5.0
+        while a.transport.dropped < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertGreaterEqual(a.transport.dropped, 2)
+        self.assertEqual(len(a.peers), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
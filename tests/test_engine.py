@@ -0,0 +1,105 @@
+import sys
+import unittest
+from quantum_chronometer.engine import SimulationEngine
+from quantum_chronometer.model import QuantumUnit
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestSimulationEngine(unittest.TestCase):
+    """Tests for the headless simulation engine."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.engine = SimulationEngine(dt=0.05, clock=self.clock)
+        self.engine.model.add_unit(QuantumUnit("🚀", 100, 100))
+        self.clock.now += 1.0  # Past the start-up observation window
+
+    def test_no_qt_dependency(self):
+        self.assertNotIn("PySide6.QtWidgets", sys.modules)
+
+    def test_time_only_flows_when_observed(self):
+        self.engine.step(10)
+        self.assertEqual(self.engine.accumulated_time, 0.0)
+        self.assertEqual(self.engine.tick_count, 10)
+
+        self.engine.set_observing(True)
+        self.engine.step(10)
+        self.assertAlmostEqual(self.engine.accumulated_time, 0.5)
+
+    def test_mouse_observation_window(self):
+        self.engine.observe_mouse(110, 100)
+        self.assertAlmostEqual(self.engine.observation_intensity, 0.95)
+        self.engine.step(1)
+        self.assertAlmostEqual(self.engine.accumulated_time, 0.05)
+
+        self.clock.now += 0.5
+        self.engine.step(1)
+        self.assertAlmostEqual(self.engine.accumulated_time, 0.05)
+
+    def test_run_until(self):
+        self.engine.set_observing(True)
+        self.assertEqual(self.engine.run_until(1.0), 20)
+        self.assertAlmostEqual(self.engine.simulated_time, 1.0)
+        self.assertEqual(self.engine.run_until(0.5), 0)
+
+    def test_advance_runs_fixed_substeps(self):
+        engine = SimulationEngine(dt=0.005, clock=self.clock)  # 200 Hz physics
+        self.assertEqual(engine.advance(1 / 30), 6)
+        self.assertAlmostEqual(engine.pending_time, 1 / 30 - 0.03)
+        self.assertEqual(engine.advance(1 / 30), 7)  # Leftovers carry over
+        self.assertEqual(engine.advance(1 / 30), 7)
+        self.assertEqual(engine.tick_count, 20)  # 0.1 s of real time at 200 Hz
+
+    def test_advance_slower_than_display(self):
+        engine = SimulationEngine(dt=0.1, clock=self.clock)  # 10 Hz physics, 30 Hz display
+        ticks = [engine.advance(1 / 30) for _ in range(6)]
+        self.assertEqual(sum(ticks), 2)
+        self.assertGreaterEqual(engine.interpolation_alpha, 0.0)
+        self.assertLess(engine.interpolation_alpha, 1.0)
+
+    def test_display_interpolates_between_ticks(self):
+        engine = SimulationEngine(dt=0.1, clock=self.clock)  # 10 Hz physics, 30 Hz display
+        engine.model.add_unit(QuantumUnit("A", 0, 0))
+        engine.set_observing(True)
+        shown, unit_times = [], []
+        for _ in range(12):
+            engine.advance(1 / 30)
+            shown.append(engine.display_magnified_time - engine.model.time_distortion)
+            unit = engine.model.units[0]
+            unit_times.append(unit.elapsed_time_sec - engine.display_unit_lag)
+        for values in (shown[2:], unit_times[2:]):  # From the first tick on
+            self.assertTrue(all(b > a for a, b in zip(values, values[1:])))  # Advances every frame
+        # Lags the simulation by at most one tick
+        self.assertLessEqual(shown[-1], engine.accumulated_time)
+        self.assertAlmostEqual(min(shown[-1] - (engine.accumulated_time - engine.dt), 0.0), 0.0)
+
+    def test_advance_caps_catch_up(self):
+        engine = SimulationEngine(dt=0.05, clock=self.clock, max_catch_up=0.25)
+        self.assertEqual(engine.advance(3.0), 5)
+        self.assertAlmostEqual(engine.dropped_time, 2.75)
+        self.assertLess(engine.pending_time, engine.dt)
+
+    def test_save_and_load_round_trip(self):
+        self.engine.set_observing(True)
+        self.engine.step(4)
+        state = self.engine.save_state()
+
+        other = SimulationEngine(clock=self.clock)
+        other.load_state(state)
+        self.assertAlmostEqual(other.accumulated_time, 0.2)
+        self.assertEqual(len(other.model.units), 1)
+
+        other.reset()
+        self.assertEqual(other.accumulated_time, 0.0)
+        self.assertEqual(other.model.units, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import unittest
+from quantum_chronometer.model import QuantumModel, QuantumUnit
+from quantum_chronometer.store import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+    from quantum_chronometer import ensemble
+    from quantum_chronometer.ensemble import EnsembleRunner, trajectory_engine
+
+
+def board_state():
+    model = QuantumModel()
+    layout = [("⚛️", 0, 0, '+'), ("🚀", 40, 10, '*'), ("🕳️", 70, 0, '~'),
+              ("🌌", 500, 500, '*'), ("🔮", 530, 480, '+'), ("⚛️", 900, 0, '~')]
+    for i, (text, x, y, symbol) in enumerate(layout):
+        model.add_unit(QuantumUnit(text, x, y, f"u{i}", symbol))
+    model.entangle_units("u0", "u3")
+    model.entangle_units("u3", "u5")
+    return model.save_state()
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestEnsembleRunner(unittest.TestCase):
+    """Tests for Monte Carlo ensembles of a saved board."""
+
+    def trajectories(self, state, runs, ticks, seed, start=0.0):
+        """(ticks, runs) totals and (ticks, runs, units) locals from real seeded engines."""
+        totals = np.zeros((ticks, runs))
+        locals_ = np.zeros((ticks, runs, len(state["units"])))
+        for k in range(runs):
+            engine = trajectory_engine(state, seed + k, start=start)
+            for tick in range(ticks):
+                engine.step()
+                engine.clock.advance(engine.dt)
+                totals[tick, k] = engine.model.time_distortion
+                locals_[tick, k] = [unit.local_distortion for unit in engine.model.units]
+        return totals, locals_
+
+    def test_trajectories_match_seeded_engines(self):
+        state = board_state()
+        runner = EnsembleRunner(state, runs=4, seed=10, start=2.0)
+        totals, locals_ = self.trajectories(state, 4, 30, 10, start=2.0)
+        for stats in runner.run(30):
+            expected = totals[stats.tick]
+            self.assertAlmostEqual(stats.distortion.mean, expected.mean(), places=12)
+            self.assertAlmostEqual(stats.distortion.variance, expected.var(), places=12)
+            np.testing.assert_allclose(stats.distortion.quantiles,
+                                       np.quantile(expected, runner.quantiles), atol=1e-12)
+            np.testing.assert_allclose(stats.units.mean, locals_[stats.tick].mean(axis=0), atol=1e-12)
+            np.testing.assert_allclose(stats.units.variance, locals_[stats.tick].var(axis=0), atol=1e-12)
+        self.assertEqual(runner.tick, 30)
+
+    def test_summary_covers_every_tick_and_run(self):
+        state = board_state()
+        runner = EnsembleRunner(state, runs=8, seed=3, bins=400)
+        for _ in runner.run(25):
+            pass
+        totals, locals_ = self.trajectories(state, 8, 25, 3)
+        summary = runner.summary()
+        self.assertEqual((summary["runs"], summary["ticks"]), (8, 25))
+        self.assertAlmostEqual(summary["distortion"]["mean"], totals.mean(), places=10)
+        self.assertAlmostEqual(summary["distortion"]["variance"], totals.var(), places=10)
+
+        samples = locals_.reshape(-1, len(state["units"]))
+        self.assertEqual([unit["id"] for unit in summary["units"]], [f"u{i}" for i in range(6)])
+        for i, unit in enumerate(summary["units"]):
+            self.assertAlmostEqual(unit["mean"], samples[:, i].mean(), places=10)
+            self.assertAlmostEqual(unit["variance"], samples[:, i].var(), places=10)
+            # Histogram quantiles are exact to within a bin
+            bin_width = runner._units.width[i] / 400
+            for point in runner.quantiles:
+                expected = np.quantile(samples[:, i], point, method="inverted_cdf")
+                self.assertLessEqual(abs(unit["quantiles"][str(point)] - expected), bin_width)
+        # Entangled units share one distortion
+        self.assertAlmostEqual(summary["units"][0]["mean"], summary["units"][5]["mean"], places=12)
+        json.dumps(summary)
+
+    def test_rejects_empty_ensemble(self):
+        with self.assertRaises(ValueError):
+            EnsembleRunner(board_state(), runs=0)
+
+    def test_cli_writes_summary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            board = os.path.join(tmp, "board.json")
+            output = os.path.join(tmp, "stats.json")
+            with open(board, 'w', encoding='utf-8') as f:
+                json.dump(board_state(), f)
+            with open(os.devnull, 'w') as devnull:
+                stdout, ensemble.sys.stdout = ensemble.sys.stdout, devnull
+                try:
+                    self.assertEqual(ensemble.main([board, "--runs", "5", "--ticks", "10", "--output", output]), 0)
+                finally:
+                    ensemble.sys.stdout = stdout
+            with open(output, 'r', encoding='utf-8') as f:
+                self.assertEqual(json.load(f)["ticks"], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
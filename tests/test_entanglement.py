@@ -0,0 +1,92 @@
+import unittest
+from quantum_chronometer.entanglement import EntanglementGraph
+from quantum_chronometer.model import QuantumModel, QuantumUnit
+
+
+class TestEntanglementGraph(unittest.TestCase):
+    """Tests for the entanglement adjacency graph."""
+
+    def setUp(self):
+        self.graph = EntanglementGraph()
+
+    def test_pairs_are_deduplicated(self):
+        self.assertTrue(self.graph.add("a", "b"))
+        self.assertFalse(self.graph.add("a", "b"))
+        self.assertFalse(self.graph.add("b", "a"))
+        self.assertFalse(self.graph.add("a", "a"))
+        self.assertEqual(self.graph.pairs(), [("a", "b")])
+
+    def test_direct_and_component_queries(self):
+        self.graph.add("a", "b")
+        self.graph.add("b", "c")
+        self.graph.add("x", "y")
+
+        self.assertTrue(self.graph.are_entangled("b", "a"))
+        self.assertFalse(self.graph.are_entangled("a", "c"))
+        self.assertIn(("c", "b"), self.graph)
+        self.assertTrue(self.graph.same_component("a", "c"))
+        self.assertFalse(self.graph.same_component("a", "x"))
+        self.assertEqual(sorted(sorted(c) for c in self.graph.components()), [["a", "b", "c"], ["x", "y"]])
+
+    def test_remove_unit_splits_component(self):
+        self.graph.add("a", "b")
+        self.graph.add("b", "c")
+        self.graph.remove_unit("b")
+
+        self.assertEqual(len(self.graph), 0)
+        self.assertEqual(self.graph.components(), [])
+        self.assertIsNone(self.graph.component_of("a"))
+
+
+class TestModelEntanglement(unittest.TestCase):
+    """Entangled units should share one distortion per connected group."""
+
+    def setUp(self):
+        self.model = QuantumModel()
+
+    def test_chain_reaches_shared_value(self):
+        units = [QuantumUnit("A", 0, 0), QuantumUnit("🕳️", 500, 500), QuantumUnit("C", 1000, 1000)]
+        for unit in units:
+            self.model.add_unit(unit)
+        self.model.entangle_units(units[0].id, units[1].id)
+        self.model.entangle_units(units[1].id, units[2].id)
+
+        self.model.update_unit_times(dt=0.1)
+
+        self.assertAlmostEqual(units[0].local_distortion, units[1].local_distortion)
+        self.assertAlmostEqual(units[1].local_distortion, units[2].local_distortion)
+        # The black hole offset is spread over the three members
+        self.assertAlmostEqual(units[0].local_distortion, 0.5 / 3, delta=0.01)
+
+    def test_entangle_unknown_or_duplicate(self):
+        unit1 = QuantumUnit("A", 0, 0)
+        unit2 = QuantumUnit("B", 0, 0)
+        self.model.add_unit(unit1)
+        self.model.add_unit(unit2)
+
+        self.assertFalse(self.model.entangle_units(unit1.id, "missing"))
+        self.assertTrue(self.model.entangle_units(unit1.id, unit2.id))
+        self.assertFalse(self.model.entangle_units(unit2.id, unit1.id))
+        self.assertTrue(self.model.are_entangled(unit2.id, unit1.id))
+
+    def test_load_state_with_many_pairs(self):
+        count = 2000
+        state = {
+            "units": [{"id": f"u{i}", "text": "A", "x": i * 200, "y": 0} for i in range(count)],
+            "entangled_pairs": [[f"u{i}", f"u{i + 1}"] for i in range(count - 1)]
+                               + [[f"u{i + 1}", f"u{i}"] for i in range(count - 1)]
+                               + [["u0", "ghost"]],
+        }
+        self.model.load_state(state)
+
+        self.assertEqual(len(self.model.entangled_pairs), count - 1)
+        self.assertEqual(len(self.model.entanglement.components()), 1)
+        self.model.update_unit_times(dt=0.1)
+        self.assertAlmostEqual(self.model.units[0].local_distortion, self.model.units[-1].local_distortion)
+
+        saved = self.model.save_state()
+        self.assertEqual(len(saved["entangled_pairs"]), count - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+from quantum_chronometer.engine import SimulationEngine
+from quantum_chronometer.journal import (
+    NULL_JOURNAL, SessionJournal, journal_path, latest_generation, recover
+)
+from quantum_chronometer.model import QuantumModel, QuantumUnit
+from quantum_chronometer.store import HAS_NUMPY
+
+
+class TestSessionJournal(unittest.TestCase):
+    """Tests for the append-only journal and crash recovery."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.engine = SimulationEngine()
+        self.journal = SessionJournal(self.dir, fsync_interval=0.01)
+        self.engine.add_listener(self.journal)
+
+    def tearDown(self):
+        self.journal.close()
+        self.tmp.cleanup()
+
+    def add(self, text, x, y):
+        unit = QuantumUnit(text, x, y)
+        self.engine.add_unit(unit)
+        return unit
+
+    def recovered(self):
+        other = SimulationEngine()
+        recover(other, self.dir)
+        return other
+
+    def test_replay_rebuilds_model(self):
+        a = self.add("🚀", 10, 20)
+        b = self.add("🕳️", 30, 40)
+        self.engine.move_unit(a.id, 15, 25)
+        self.engine.entangle_units(a.id, b.id)
+        self.engine.set_observing(True)
+        self.engine.observe_mouse(10, 10)  # Not journaled
+        self.engine.set_remote_distortion(0.5)
+        self.assertTrue(self.journal.flush(timeout=5))
+
+        other = self.recovered()
+        self.assertEqual(other.model.save_state(), self.engine.model.save_state())
+        self.assertTrue(other.is_observing)
+        self.assertEqual(other.model.external_distortion, 0.5)
+
+    def test_reset_is_replayed(self):
+        self.add("A", 0, 0)
+        self.engine.reset()
+        self.add("B", 5, 5)
+        self.journal.flush(timeout=5)
+        self.assertEqual([unit.text for unit in self.recovered().model.units], ["B"])
+
+    def test_compaction_starts_new_generation(self):
+        self.add("A", 0, 0)
+        self.engine.accumulated_time = 3.0
+        self.journal.compact(self.engine)
+        self.add("B", 5, 5)
+        self.journal.flush(timeout=5)
+
+        self.assertEqual(latest_generation(self.dir), 1)
+        self.assertFalse(os.path.exists(journal_path(self.dir, 0)))
+        other = self.recovered()
+        self.assertEqual(len(other.model.units), 2)
+        self.assertEqual(other.accumulated_time, 3.0)
+
+    def test_changes_after_compaction_capture_recover(self):
+        """The snapshot is built off the UI thread; later journaled changes still replay on top."""
+        a = self.add("A", 0, 0)
+        b = self.add("🕳️", 50, 0)
+        self.engine.entangle_units(a.id, b.id)
+        self.journal.compact(self.engine)
+        self.engine.move_unit(a.id, 300, 300)
+        self.engine.remove_unit(b.id)
+        self.add("C", 7, 7)
+        self.journal.flush(timeout=5)
+        self.assertEqual(self.recovered().model.save_state(), self.engine.model.save_state())
+
+    def test_capture_builds_save_state(self):
+        backends = ["python", "numpy"] if HAS_NUMPY else ["python"]
+        for backend in backends:
+            engine = SimulationEngine(QuantumModel(backend=backend))
+            units = [QuantumUnit(text, i * 40, -i) for i, text in enumerate(["A", "🕳️", "B"])]
+            for unit in units:
+                engine.add_unit(unit)
+            engine.entangle_units(units[0].id, units[2].id)
+            engine.accumulated_time = 1.5
+            build = engine.capture_state()
+            expected = engine.save_state()
+            engine.add_unit(QuantumUnit("D", 0, 0))  # After the capture
+            self.assertEqual(build(), expected, backend)
+
+    def test_load_starts_new_generation(self):
+        self.add("A", 0, 0)
+        other = SimulationEngine()
+        other.model.add_unit(QuantumUnit("B", 1, 1))
+        self.engine.load_state(other.save_state())
+        self.journal.flush(timeout=5)
+        self.assertEqual(latest_generation(self.dir), 1)
+        self.assertEqual([unit.text for unit in self.recovered().model.units], ["B"])
+
+    def test_torn_last_line_is_ignored(self):
+        self.add("A", 0, 0)
+        self.journal.close()
+        with open(journal_path(self.dir, 0), 'a', encoding='utf-8') as f:
+            f.write('{"op":"add","id":"x"')
+        self.assertEqual(recover(SimulationEngine(), self.dir), 1)
+
+    def test_recording_after_torn_tail_survives(self):
+        self.add("A", 0, 0)
+        self.journal.close()
+        with open(journal_path(self.dir, 0), 'a', encoding='utf-8') as f:
+            f.write('{"op":"add","id":"b","te')
+
+        engine = SimulationEngine()
+        self.assertEqual(recover(engine, self.dir), 1)
+        self.journal = SessionJournal(self.dir, fsync_interval=0.01)
+        engine.add_listener(self.journal)
+        for text in ("C", "D"):
+            engine.add_unit(QuantumUnit(text, 5, 5))
+        self.journal.close()
+
+        self.assertEqual([unit.text for unit in self.recovered().model.units], ["A", "C", "D"])
+
+    def test_tick_compacts_after_enough_events(self):
+        self.journal.compact_every = 3
+        for i in range(3):
+            self.add("A", i, i)
+        self.journal.tick(self.engine)
+        self.journal.flush(timeout=5)
+        self.assertEqual(latest_generation(self.dir), 1)
+        self.assertEqual(self.journal.events_since_compaction, 0)
+
+    def test_null_journal_is_inert(self):
+        NULL_JOURNAL.record({"op": "reset"})
+        NULL_JOURNAL.tick(self.engine)
+        self.assertTrue(NULL_JOURNAL.flush())
+        self.assertFalse(NULL_JOURNAL.enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
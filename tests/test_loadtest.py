@@ -0,0 +1,45 @@
+import unittest
+from quantum_chronometer.loadtest import falls_behind, percentiles, run_load
+
+
+class TestLoadTest(unittest.TestCase):
+    """Tests for the loopback load generator and its report."""
+
+    def check_report(self, report, peers):
+        sent = report["sent"]
+        self.assertEqual(report["peers_seen"], peers)
+        self.assertGreater(report["received"], 0)
+        self.assertLessEqual(report["received"], sent["valid"])
+        self.assertEqual(report["received"] + report["rejected"] + report["lost"],
+                         sent["valid"] + sent["malformed"] + sent["oversized"])
+        self.assertIsNotNone(report["transport_latency_ms"]["p50"])
+        self.assertIsNotNone(report["delivery_latency_ms"]["p99"])
+        self.assertGreater(report["polls"], 0)
+
+    def test_thread_peers_with_garbage(self):
+        report = run_load(4, 200.0, 0.3, workers=2, malformed=0.1, oversized=0.05, poll_interval=0.02)
+        self.check_report(report, 4)
+        self.assertGreater(report["sent"]["malformed"], 0)
+        self.assertGreater(report["rejected"], 0)
+        self.assertEqual(report["mode"], "threads")
+
+    def test_subprocess_peers(self):
+        report = run_load(3, 100.0, 0.3, workers=2, processes=True, poll_interval=0.02)
+        self.check_report(report, 3)
+        self.assertEqual(report["rejected"], 0)
+
+    def test_percentiles(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentiles(values), {"p50": 50, "p90": 90, "p99": 99, "max": 100})
+        self.assertEqual(percentiles([3.0])["p99"], 3.0)
+        self.assertEqual(percentiles([]), {"p50": None, "p90": None, "p99": None, "max": None})
+
+    def test_falls_behind(self):
+        report = {"drop_rate": 0.0, "transport_latency_ms": {"p99": 1.0}}
+        self.assertFalse(falls_behind(report))
+        self.assertTrue(falls_behind(dict(report, drop_rate=0.2)))
+        self.assertTrue(falls_behind(dict(report, transport_latency_ms={"p99": 80.0})))
+
+
+if __name__ == '__main__':
+    unittest.main()
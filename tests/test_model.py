@@ -54,6 +54,28 @@ class TestQuantumUnit(unittest.TestCase):
         self.assertEqual(unit1.display_width, 60)  # Base width for 1 emoji
         self.assertGreater(unit2.display_width, unit1.display_width)  # More emojis = wider
 
+    def test_text_change_updates_derived_values(self):
+        """Changing the text should re-measure emoji count, width and black hole flag."""
+        unit = QuantumUnit("🚀", 0, 0)
+        self.assertFalse(unit.is_black_hole)
+
+        unit.text = "🚀🕳"
+        self.assertEqual(unit.emoji_count, 2)
+        self.assertEqual(unit.display_width, 90)
+        self.assertTrue(unit.is_black_hole)
+
+    def test_units_share_text_metrics(self):
+        """Units with the same text should share one interned measurement."""
+        unit1 = QuantumUnit("".join(["🌌", "💡"]), 0, 0)
+        unit2 = QuantumUnit("🌌💡", 10, 10)
+        self.assertIs(unit1._metrics, unit2._metrics)
+        self.assertIs(unit1.text, unit2.text)
+
+    def test_unit_uses_slots(self):
+        unit = QuantumUnit("🚀", 0, 0)
+        with self.assertRaises(AttributeError):
+            unit.velocity = 1.0
+
 
 class TestQuantumModel(unittest.TestCase):
     """Tests for the QuantumModel (system-level behavior)."""
@@ -83,6 +105,30 @@ class TestQuantumModel(unittest.TestCase):
         fake_id = str(uuid.uuid4())
         self.assertIsNone(self.model.get_unit_by_id(fake_id))
 
+    def test_remove_unit(self):
+        """Removing a unit should drop it from lookups and its entanglements."""
+        unit1 = QuantumUnit("A", 0, 0)
+        unit2 = QuantumUnit("B", 10, 10)
+        unit3 = QuantumUnit("C", 20, 20)
+        for unit in (unit1, unit2, unit3):
+            self.model.add_unit(unit)
+        self.model.entangle_units(unit1.id, unit2.id)
+        self.model.entangle_units(unit2.id, unit3.id)
+
+        self.assertTrue(self.model.remove_unit(unit2.id))
+        self.assertFalse(self.model.remove_unit(unit2.id))
+        self.assertIsNone(self.model.get_unit_by_id(unit2.id))
+        self.assertEqual(len(self.model.units), 2)
+        self.assertEqual(self.model.entangled_pairs, [])
+        self.assertEqual(len(self.model.get_proximity_pairs()), 1)
+
+    def test_load_state_indexes_units_by_id(self):
+        self.model.add_unit(QuantumUnit("A", 0, 0))
+        self.model.load_state({"units": [{"id": "loaded", "text": "🌌", "x": 1, "y": 2}]})
+        self.assertEqual(self.model.get_unit_by_id("loaded").text, "🌌")
+        self.model.reset()
+        self.assertIsNone(self.model.get_unit_by_id("loaded"))
+
     def test_update_unit_position(self):
         """Model should update a unit's position by ID."""
         unit = QuantumUnit("🎯", 10, 10)
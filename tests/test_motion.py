@@ -0,0 +1,102 @@
+import unittest
+from quantum_chronometer.model import QuantumModel, QuantumUnit, movement_distortion
+from quantum_chronometer.motion import MotionTracker
+from quantum_chronometer.replay import ManualClock
+from quantum_chronometer.store import HAS_NUMPY
+
+
+class TestMotionTracker(unittest.TestCase):
+    """Tests for per-unit position history and speed estimation."""
+
+    def setUp(self):
+        self.tracker = MotionTracker(window=0.5, history=16)
+
+    def speed(self, now, unit_id="a"):
+        unit_ids, speeds = self.tracker.speeds(now)
+        return dict(zip(unit_ids, speeds)).get(unit_id, 0.0)
+
+    def test_single_drop_is_spread_over_the_window(self):
+        self.tracker.record("a", 0, 0, 100, 0, now=10.0)
+        self.assertAlmostEqual(self.speed(10.0), 200.0)
+        self.assertAlmostEqual(self.speed(10.25), 100.0)
+        self.assertAlmostEqual(self.speed(10.5), 0.0)
+        self.assertEqual(len(self.tracker), 0)  # At rest again, no longer tracked
+
+    def test_drag_events_are_interpolated(self):
+        for i in range(1, 11):  # 10 px every 0.1 s
+            self.tracker.record("a", 10 * (i - 1), 0, 10 * i, 0, now=1.0 + 0.1 * i)
+        self.assertAlmostEqual(self.speed(2.0), 100.0)
+        self.assertAlmostEqual(self.speed(2.05), 90.0)  # Interpolated half way into the 10 px of 1.5-1.6
+
+    def test_history_is_bounded(self):
+        for i in range(100):
+            self.tracker.record("a", i, 0, i + 1, 0, now=i * 0.001)
+        self.assertEqual(len(self.tracker.tracks["a"]), 16)
+        self.assertGreater(self.speed(0.1), 0.0)
+
+    def test_state_round_trip(self):
+        self.tracker.record("a", 0, 0, 30, 40, now=1.0)
+        other = MotionTracker(window=0.5)
+        other.set_state(self.tracker.get_state())
+        self.assertEqual(other.speeds(1.1), self.tracker.speeds(1.1))
+
+
+class TestMovementEffect(unittest.TestCase):
+    """Tests for the movement effect in the model tick."""
+
+    backend = "python"
+
+    def build(self, moved):
+        clock = ManualClock(5.0)
+        model = QuantumModel(self.backend, seed=1, clock=clock)
+        for i in range(3):
+            model.add_unit(QuantumUnit("A", i * 1000, 0 if i or not moved else -250, f"u{i}", '*'))
+        if moved:
+            model.update_unit_position("u0", 0, 0)
+        return model
+
+    def test_moved_units_run_slow(self):
+        moved, still = self.build(True), self.build(False)
+        for model in (moved, still):
+            model.update_unit_times(0.05, now=5.1)
+        # 250 px spread over the 0.5 s window; 0.1 s later 200 px of it are still inside
+        expected = movement_distortion(200 / 0.5)
+        self.assertLess(expected, 0.0)
+        self.assertAlmostEqual(moved.units[0].local_distortion - still.units[0].local_distortion, expected)
+        self.assertEqual(moved.units[1].local_distortion, still.units[1].local_distortion)
+        self.assertAlmostEqual(moved.time_distortion - still.time_distortion, expected)
+
+        moved.update_unit_times(0.05, now=6.0)
+        self.assertEqual(len(moved.motion), 0)
+
+    def test_removed_and_reset_units_are_forgotten(self):
+        model = self.build(True)
+        model.remove_unit("u0")
+        self.assertEqual(len(model.motion), 0)
+        model.update_unit_position("u1", 5, 5)
+        model.reset()
+        self.assertEqual(len(model.motion), 0)
+
+    def test_moving_a_unit_not_on_the_board_is_ignored(self):
+        model = self.build(False)
+        stray = QuantumUnit("A", 0, 0, "stray", '*')
+        model.move_unit(stray, 100, 100)
+        self.assertEqual(len(model.motion), 0)
+        model.update_unit_times(0.05, now=5.1)
+        self.assertEqual((stray.x, stray.y), (0, 0))
+
+    def test_speed_saturates(self):
+        self.assertEqual(movement_distortion(0.0), 0.0)
+        self.assertGreater(movement_distortion(1e9), -0.0500001)
+        self.assertLess(movement_distortion(1e9), -0.0499)
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestMovementEffectArrayBackend(TestMovementEffect):
+    """The movement effect on the numpy backend."""
+
+    backend = "numpy"
+
+
+if __name__ == '__main__':
+    unittest.main()
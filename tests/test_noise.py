@@ -0,0 +1,47 @@
+import json
+import unittest
+from quantum_chronometer.model import SUPERPOSITION_NOISE, QuantumModel, QuantumUnit
+from quantum_chronometer.noise import SuperpositionNoise
+
+
+class TestSuperpositionNoise(unittest.TestCase):
+    """Tests for the batched per-tick superposition noise stage."""
+
+    def setUp(self):
+        self.noise = SuperpositionNoise(SUPERPOSITION_NOISE, '~', seed=4)
+
+    def test_values_follow_each_symbols_range(self):
+        symbols = ['+', '*', '~', '?', None] * 200
+        values = self.noise.draw(symbols)
+        self.assertEqual(len(values), len(symbols))
+        for symbol, value in zip(symbols, values):
+            low, high = SUPERPOSITION_NOISE.get(symbol, SUPERPOSITION_NOISE['~'])
+            self.assertTrue(low <= value <= high, (symbol, value))
+        self.assertEqual(self.noise.draw([]), [])
+
+    def test_seeded_and_resumable(self):
+        symbols = ['+', '~', '*'] * 10
+        again = SuperpositionNoise(SUPERPOSITION_NOISE, '~', seed=4)
+        self.assertEqual(self.noise.draw(symbols), again.draw(symbols))
+
+        state = json.loads(json.dumps(self.noise.get_state()))
+        expected = self.noise.draw(symbols)
+        again.set_state(state)
+        self.assertEqual(again.draw(symbols), expected)
+
+    def test_unknown_default_rejected(self):
+        with self.assertRaises(ValueError):
+            SuperpositionNoise(SUPERPOSITION_NOISE, '#')
+
+    def test_model_tick_uses_the_stage(self):
+        model = QuantumModel(seed=9)
+        for i, symbol in enumerate(['+', '*', '~']):
+            model.add_unit(QuantumUnit("A", i * 1000, 0, f"u{i}", symbol))
+        noise = SuperpositionNoise(SUPERPOSITION_NOISE, '~', seed=9)
+        model.update_unit_times(0.05, now=0.0)  # sin(0): no movement effect
+        expected = noise.draw(['+', '*', '~'])
+        self.assertEqual([unit.local_distortion for unit in model.units], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+from quantum_chronometer.model import QuantumModel, QuantumUnit
+from quantum_chronometer.store import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestParallelGravity(unittest.TestCase):
+    """Tests for the process-pool gravity backend."""
+
+    def setUp(self):
+        self.model = QuantumModel(backend="parallel", seed=3, workers=2)
+        self.model.gravity.min_units = 0  # Always use the workers
+
+    def tearDown(self):
+        self.model.close()
+
+    def populate(self, count, seed=5):
+        rng = random.Random(seed)
+        reference = QuantumModel(backend="numpy", seed=3)
+        for i in range(count):
+            # Clusters straddling many tile edges, plus stacked units on one x
+            x = rng.gauss(rng.choice([0, 400, 800]), 150) if i % 10 else 250.0
+            y = rng.uniform(0, 600)
+            for model in (self.model, reference):
+                model.add_unit(QuantumUnit("🕳️" if i % 7 == 0 else "⚛️", x, y, f"u{seed}-{i}", '*'))
+        return reference
+
+    def test_matches_numpy_backend(self):
+        reference = self.populate(3000)
+        for model in (self.model, reference):
+            model.update_unit_times(0.05, is_observing=True, mouse_pos=(10, 10), now=1.0)
+        n = len(reference.units)
+        np.testing.assert_allclose(self.model.store.local_distortion[:n],
+                                   reference.store.local_distortion[:n], rtol=1e-12, atol=1e-12)
+        self.assertAlmostEqual(self.model.time_distortion, reference.time_distortion, places=9)
+
+    def proximity_in_process(self):
+        gravity = self.model.gravity
+        n = len(self.model.units)
+        x, y = self.model.store.x[:n], self.model.store.y[:n]
+        parallel = gravity.proximity(x, y)
+        gravity.min_units = n + 1
+        try:
+            return parallel, gravity.proximity(x, y)
+        finally:
+            gravity.min_units = 0
+
+    def test_board_can_grow_and_shrink(self):
+        self.populate(200)
+        self.model.update_unit_times(0.05, now=1.0)
+        self.populate(2000, seed=6)  # Outgrows the first shared segment
+        self.model.update_unit_times(0.05, now=2.0)
+        self.assertEqual(len(self.model.units), 2200)
+        parallel, in_process = self.proximity_in_process()
+        np.testing.assert_allclose(parallel, in_process, rtol=1e-12)
+        for unit in list(self.model.units)[:2100]:
+            self.model.remove_unit(unit.id)
+        parallel, in_process = self.proximity_in_process()
+        self.assertEqual(len(parallel), 100)
+        np.testing.assert_allclose(parallel, in_process, rtol=1e-12)
+
+    def test_tile_edges_cover_the_board(self):
+        gravity = self.model.gravity
+        edges = gravity.tile_edges(np.linspace(0, 1000, 5000))
+        self.assertEqual(edges[0], -np.inf)
+        self.assertEqual(edges[-1], np.inf)
+        self.assertEqual(len(edges), gravity.workers * 4 + 1)
+        self.assertTrue(np.all(np.diff(edges) > 0))
+        self.assertEqual(len(gravity.tile_edges(np.full(100, 5.0))), 3)
+
+    def test_tiles_only_read_their_neighbours(self):
+        gravity = self.model.gravity
+        x = np.random.default_rng(1).uniform(0, 10000, 20000)
+        edges = gravity.tile_edges(x)
+        bounds = [0] + np.cumsum(np.bincount(np.searchsorted(edges[1:-1], x, side="right"))).tolist()
+        ranges = gravity.tile_ranges(edges, bounds)
+        self.assertEqual(sum(own_stop - own_start for _, _, own_start, own_stop, _, _ in ranges), len(x))
+        for start, stop, own_start, own_stop, lo, hi in ranges:
+            self.assertLessEqual(start, own_start)
+            self.assertGreaterEqual(stop, own_stop)
+        # Each row is read by its own tile and at most its two neighbours, not by every tile
+        self.assertLessEqual(sum(stop - start for start, stop, _, _, _, _ in ranges), 3 * len(x))
+
+    def test_small_boards_stay_in_process(self):
+        self.model.gravity.min_units = 1000
+        self.populate(50)
+        self.model.update_unit_times(0.05, now=1.0)
+        self.assertIsNone(self.model.gravity._executor)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from quantum_chronometer.peers import PeerTable, seq_newer
+
+
+class TestPeerTable(unittest.TestCase):
+    """Tests for per-instance distortion tracking and aggregation."""
+
+    def table(self, aggregation="mean", **kwargs):
+        table = PeerTable(aggregation, ttl=3.0, clock=lambda: 0.0, **kwargs)
+        table.update(1, 1, 0.5, now=0.0)
+        table.update(2, 1, -0.25, now=1.0)
+        table.update(3, 1, 1.0, now=2.0)
+        return table
+
+    def test_aggregations(self):
+        self.assertAlmostEqual(self.table("sum").aggregate(), 1.25)
+        self.assertAlmostEqual(self.table("mean").aggregate(), 1.25 / 3)
+        self.assertAlmostEqual(self.table("max").aggregate(), 1.0)
+        with self.assertRaises(ValueError):
+            PeerTable("median")
+
+    def test_ewma_smooths_each_peer(self):
+        table = self.table("ewma", ewma_alpha=0.5)
+        table.update(1, 2, 1.5, now=2.0)
+        self.assertAlmostEqual(table.get(1).smoothed, 1.0)
+        self.assertAlmostEqual(table.aggregate(), (1.0 - 0.25 + 1.0) / 3)
+
+    def test_stale_packets_are_ignored(self):
+        table = self.table()
+        self.assertTrue(table.update(1, 5, 2.0, now=2.0))
+        self.assertFalse(table.update(1, 4, 9.0, now=2.0))
+        self.assertFalse(table.update(1, 5, 9.0, now=2.0))
+        self.assertEqual(table.get(1).value, 2.0)
+        self.assertEqual(table.stale_packets, 2)
+
+    def test_sequence_wraps(self):
+        self.assertTrue(seq_newer(0, 2 ** 32 - 1))
+        self.assertFalse(seq_newer(2 ** 32 - 1, 0))
+        self.assertTrue(seq_newer(10, 3))
+
+    def test_silent_peers_expire(self):
+        table = self.table("sum")
+        table.update(1, 2, 0.5, now=2.5)  # Heard from again, now the newest
+        self.assertEqual(table.expire(now=4.2), [2])
+        self.assertAlmostEqual(table.aggregate(), 1.5)
+        self.assertEqual(table.expire(now=10.0), [3, 1])
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.aggregate(), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
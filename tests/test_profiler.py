@@ -0,0 +1,83 @@
+import time
+import unittest
+from quantum_chronometer.engine import SimulationEngine
+from quantum_chronometer.model import QuantumUnit
+from quantum_chronometer.profiler import (
+    NULL_PROFILER, RollingHistogram, TickProfiler, format_snapshot
+)
+
+
+class TestRollingHistogram(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = RollingHistogram(window=100)
+        for ns in range(1, 101):
+            histogram.add(ns * 1_000_000)
+        summary = histogram.summary()
+        self.assertEqual(summary["p50_ms"], 50.0)
+        self.assertEqual(summary["p95_ms"], 95.0)
+        self.assertEqual(summary["p99_ms"], 99.0)
+        self.assertEqual(summary["max_ms"], 100.0)
+
+    def test_window_rolls(self):
+        histogram = RollingHistogram(window=3)
+        for ns in (10, 20, 30, 40):
+            histogram.add(ns)
+        self.assertEqual(list(histogram.samples), [20, 30, 40])
+        self.assertEqual(histogram.count, 4)
+
+
+class TestTickProfiler(unittest.TestCase):
+
+    def test_phases_and_dropped_frames(self):
+        profiler = TickProfiler(budget_ms=1.0)
+        profiler.begin_frame()
+        with profiler.phase("slow"):
+            time.sleep(0.003)
+        profiler.end_frame()
+
+        profiler.begin_frame()
+        profiler.end_frame()
+
+        snapshot = profiler.snapshot()
+        self.assertEqual(snapshot["frames"], 2)
+        self.assertEqual(snapshot["dropped_frames"], 1)
+        self.assertGreaterEqual(snapshot["phases"]["slow"]["max_ms"], 3.0)
+        self.assertIn("slow", format_snapshot(snapshot))
+
+    def test_exporter_called_every_n_frames(self):
+        profiler = TickProfiler(export_every=5)
+        snapshots = []
+        profiler.add_exporter(snapshots.append)
+        for _ in range(12):
+            profiler.begin_frame()
+            profiler.end_frame()
+        self.assertEqual(len(snapshots), 2)
+        self.assertEqual(snapshots[-1]["frames"], 10)
+
+        profiler.remove_exporter(snapshots.append)
+        for _ in range(5):
+            profiler.begin_frame()
+            profiler.end_frame()
+        self.assertEqual(len(snapshots), 2)
+
+    def test_engine_reports_model_phases(self):
+        engine = SimulationEngine()
+        engine.model.add_unit(QuantumUnit("A", 0, 0))
+        profiler = TickProfiler()
+        engine.set_profiler(profiler)
+        engine.step(3)
+
+        for name in ("observation", "gravity", "local_effects", "entanglement"):
+            self.assertEqual(profiler.phases[name].count, 3)
+
+    def test_null_profiler_is_inert(self):
+        with NULL_PROFILER.phase("anything"):
+            pass
+        NULL_PROFILER.begin_frame()
+        NULL_PROFILER.end_frame()
+        self.assertFalse(NULL_PROFILER.enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
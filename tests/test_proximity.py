@@ -0,0 +1,93 @@
+import random
+import unittest
+from quantum_chronometer.model import QuantumModel, QuantumUnit
+
+
+def pair_keys(pairs):
+    return {frozenset((unit1.id, unit2.id)) for unit1, unit2 in pairs}
+
+
+class TestProximityTracker(unittest.TestCase):
+    """Tests for incremental proximity pair tracking in the model."""
+
+    def setUp(self):
+        self.model = QuantumModel()
+        self.a = QuantumUnit("A", 0, 0)
+        self.b = QuantumUnit("B", 50, 0)
+        self.c = QuantumUnit("C", 500, 500)
+        for unit in (self.a, self.b, self.c):
+            self.model.add_unit(unit)
+
+    def test_first_changes_are_a_reset(self):
+        changes = self.model.take_proximity_changes()
+        self.assertTrue(changes.reset)
+        self.assertEqual(pair_keys(changes.added), {frozenset((self.a.id, self.b.id))})
+
+        changes = self.model.take_proximity_changes()
+        self.assertEqual(changes, ([], [], [], False))
+
+    def test_moves_produce_deltas(self):
+        self.model.take_proximity_changes()
+
+        self.model.update_unit_position(self.c.id, 40, 40)
+        changes = self.model.take_proximity_changes()
+        self.assertFalse(changes.reset)
+        self.assertEqual(pair_keys(changes.added),
+                         {frozenset((self.a.id, self.c.id)), frozenset((self.b.id, self.c.id))})
+        self.assertEqual(changes.removed, [])
+
+        self.model.update_unit_position(self.a.id, 10, 0)  # Stays in range of both
+        changes = self.model.take_proximity_changes()
+        self.assertEqual(changes.added, [])
+        self.assertEqual(pair_keys(changes.updated),
+                         {frozenset((self.a.id, self.b.id)), frozenset((self.a.id, self.c.id))})
+
+        self.model.move_unit(self.c, 900, 900)
+        changes = self.model.take_proximity_changes()
+        self.assertEqual({frozenset(key) for key in changes.removed},
+                         {frozenset((self.a.id, self.c.id)), frozenset((self.b.id, self.c.id))})
+
+    def test_move_out_and_back_is_an_update(self):
+        self.model.take_proximity_changes()
+        self.model.update_unit_position(self.b.id, 900, 0)
+        self.model.update_unit_position(self.b.id, 60, 0)
+        changes = self.model.take_proximity_changes()
+        self.assertEqual((changes.added, changes.removed), ([], []))
+        self.assertEqual(pair_keys(changes.updated), {frozenset((self.a.id, self.b.id))})
+
+    def test_remove_unit_reports_its_pairs(self):
+        self.model.take_proximity_changes()
+        self.model.remove_unit(self.b.id)
+        changes = self.model.take_proximity_changes()
+        self.assertEqual([frozenset(key) for key in changes.removed], [frozenset((self.a.id, self.b.id))])
+
+    def test_reset_and_load_rebuild(self):
+        self.model.take_proximity_changes()
+        state = self.model.save_state()
+        self.model.reset()
+        self.assertEqual(self.model.take_proximity_changes(), ([], [], [], True))
+
+        self.model.load_state(state)
+        changes = self.model.take_proximity_changes()
+        self.assertTrue(changes.reset)
+        self.assertEqual(len(changes.added), 1)
+
+    def test_matches_full_scan_after_random_moves(self):
+        rng = random.Random(3)
+        model = QuantumModel()
+        units = [QuantumUnit("X", rng.uniform(0, 600), rng.uniform(0, 600)) for _ in range(80)]
+        for unit in units:
+            model.add_unit(unit)
+        shown = pair_keys(model.take_proximity_changes().added)
+        for _ in range(20):
+            for unit in rng.sample(units, 5):
+                model.update_unit_position(unit.id, rng.uniform(0, 600), rng.uniform(0, 600))
+            changes = model.take_proximity_changes()
+            self.assertFalse(changes.reset)
+            shown -= {frozenset(key) for key in changes.removed}
+            shown |= pair_keys(changes.added)
+            self.assertEqual(shown, pair_keys(model.get_proximity_pairs()))
+
+
+if __name__ == '__main__':
+    unittest.main()
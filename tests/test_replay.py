@@ -0,0 +1,152 @@
+import os
+import tempfile
+import unittest
+from quantum_chronometer.engine import SimulationEngine
+from quantum_chronometer.model import QuantumModel
+from quantum_chronometer.replay import (
+    ManualClock, SessionRecorder, SessionReplayer, load_recording
+)
+from quantum_chronometer.store import HAS_NUMPY
+
+
+def record_session(path, backend="python", ticks=250):
+    """Scripted session: units added, moved and entangled while the mouse wanders."""
+    clock = ManualClock(1000.0)
+    engine = SimulationEngine(QuantumModel(backend, clock=clock), dt=0.05, clock=clock)
+    recorder = SessionRecorder(engine, path, seed=42)
+    model = engine.model
+    units = []
+    for tick in range(ticks):
+        if tick % 20 == 0:
+            unit = model.create_unit("🕳️" if tick % 60 == 0 else "🚀", 30 * len(units), 40)
+            engine.add_unit(unit)
+            units.append(unit)
+        if tick % 7 == 0:
+            engine.observe_mouse(5 * tick % 300, 40)
+        if tick % 30 == 15:
+            engine.move_unit(units[0].id, tick % 200, 60)
+        if tick == 90:
+            engine.entangle_units(units[1].id, units[3].id)
+        if tick == 120:
+            engine.set_observing(True)
+            engine.set_remote_distortion(0.25)
+        clock.advance(0.05)
+        engine.step()
+    recorder.save()
+    return engine, load_recording(path)
+
+
+def snapshot(engine):
+    model = engine.model
+    return (engine.save_state(), [unit.elapsed_time_sec for unit in model.units],
+            [unit.local_distortion for unit in model.units], engine.accumulated_time)
+
+
+class TestSeededModel(unittest.TestCase):
+    """Tests for the model's injectable random streams and clock."""
+
+    def build(self, seed):
+        model = QuantumModel(seed=seed, clock=ManualClock(5.0))
+        for i in range(20):
+            model.add_unit(model.create_unit("⚛️", i * 20, 0))
+        return model
+
+    def test_same_seed_same_run(self):
+        runs = []
+        for _ in range(2):
+            model = self.build(7)
+            distortions = []
+            for tick in range(10):
+                model.update_unit_times(0.05, True, (0, 0), now=tick * 0.05)
+                distortions.append(model.time_distortion)
+            runs.append((model.save_state(), distortions))
+        self.assertEqual(runs[0], runs[1])
+        self.assertEqual(self.build(7).units[0].start_time, 5.0)
+        self.assertNotEqual(self.build(8).save_state(), runs[0][0])
+
+    def test_unit_creation_does_not_shift_the_noise(self):
+        model = self.build(3)
+        other = self.build(3)
+        other.create_unit("X", 0, 0)  # Not added, but draws from the unit stream
+        model.update_unit_times(0.05, now=1.0)
+        other.update_unit_times(0.05, now=1.0)
+        self.assertEqual(model.time_distortion, other.time_distortion)
+
+
+class TestSessionReplay(unittest.TestCase):
+    """Tests for deterministic recording, replay and seeking."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replay_matches_recording(self):
+        engine, recording = record_session(self.path)
+        replayer = SessionReplayer(recording)
+        self.assertEqual(replayer.run(), 250)
+        self.assertTrue(replayer.finished)
+        self.assertIsNone(replayer.divergence)
+        self.assertEqual(snapshot(replayer.engine), snapshot(engine))
+
+    def test_seek_matches_linear_replay(self):
+        recording = record_session(self.path)[1]
+        linear = SessionReplayer(recording, keyframe_every=50)
+        linear.step(130)
+
+        seeking = SessionReplayer(recording, keyframe_every=50)
+        seeking.run()
+        self.assertEqual(sorted(seeking.keyframes), [0, 50, 100, 150, 200, 250])
+        self.assertEqual(seeking.seek(130), 130)
+        self.assertEqual(snapshot(seeking.engine), snapshot(linear.engine))
+        self.assertEqual(seeking.seek(400), 250)
+        with self.assertRaises(ValueError):
+            seeking.seek(-1)
+
+    def test_frames_reach_disk_before_save(self):
+        """A crashed session is replayable up to the last flushed chunk."""
+        clock = ManualClock(0.0)
+        engine = SimulationEngine(QuantumModel(clock=clock), dt=0.05, clock=clock)
+        recorder = SessionRecorder(engine, self.path, seed=1, flush_every=10, flush_interval=3600)
+        engine.add_unit(engine.model.create_unit("⚛️", 10, 10))
+        for _ in range(24):
+            clock.advance(0.05)
+            engine.step()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('[1.0,{"op":"ti')  # Torn line, as after a crash mid-write
+
+        recording = load_recording(self.path)
+        self.assertEqual(len(recording["frames"]), 20)  # Two chunks of ten; the rest is still buffered
+        replayer = SessionReplayer(recording)
+        self.assertEqual(replayer.run(), 19)
+        self.assertIsNone(replayer.divergence)
+        recorder.save()
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"version": 1, "frames": []}\n')
+        with self.assertRaises(ValueError):
+            load_recording(self.path)
+
+    def test_divergence_is_reported(self):
+        recording = record_session(self.path, ticks=40)[1]
+        frames = recording["frames"]
+        index = max(i for i, (_, event) in enumerate(frames) if event["op"] == "tick")
+        frames[index][1]["distortion"] += 1.0
+        replayer = SessionReplayer(recording)
+        replayer.run()
+        self.assertEqual(replayer.divergence, 40)
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_array_backend_replay(self):
+        engine, recording = record_session(self.path, "numpy", ticks=120)
+        replayer = SessionReplayer(recording)
+        replayer.run()
+        self.assertIsNone(replayer.divergence)
+        self.assertEqual(replayer.engine.model.save_state(), engine.model.save_state())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+import unittest
+from quantum_chronometer.engine import SimulationEngine
+from quantum_chronometer.model import QuantumModel, QuantumUnit
+from quantum_chronometer.snapshot import (
+    HEADER, PAIR, RECORD, is_snapshot_path, load_snapshot, write_snapshot
+)
+from quantum_chronometer.store import HAS_NUMPY
+
+
+class TestBinarySnapshot(unittest.TestCase):
+    """Tests for the binary .qcs snapshot format."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "board.qcs")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build_model(self, backend="python"):
+        model = QuantumModel(backend=backend)
+        for i in range(50):
+            unit = QuantumUnit("🕳️" if i % 5 == 0 else "🚀🌌", i * 13.5, -i * 0.25)
+            unit.superposition_symbol = ['+', '*', '~'][i % 3]
+            model.add_unit(unit)
+        custom = QuantumUnit("⚛️", 1, 2)
+        custom.id = "custom-id"  # Not a UUID, stored via the string table
+        model.add_unit(custom)
+        ids = [unit.id for unit in model.units]
+        for i in range(1, len(ids), 2):
+            model.entangle_units(ids[i - 1], ids[i])
+        model.time_distortion = 0.125
+        return model
+
+    def test_round_trip_matches_json_state(self):
+        model = self.build_model()
+        write_snapshot(model, self.path, accumulated_time=4.5)
+
+        loaded = QuantumModel()
+        self.assertEqual(load_snapshot(loaded, self.path), 4.5)
+        self.assertEqual(loaded.save_state(4.5), model.save_state(4.5))
+        self.assertEqual(loaded.get_unit_by_id("custom-id").text, "⚛️")
+
+    def test_file_is_compact(self):
+        model = self.build_model()
+        write_snapshot(model, self.path)
+        size = os.path.getsize(self.path)
+        self.assertLess(size, HEADER.size + len(model.units) * (RECORD.size + 8) + 200)
+        self.assertLess(size, len(json.dumps(model.save_state(), ensure_ascii=False)))
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_load_into_array_backend(self):
+        model = self.build_model()
+        write_snapshot(model, self.path)
+        loaded = QuantumModel(backend="numpy")
+        load_snapshot(loaded, self.path)
+        self.assertEqual(loaded.store.size, len(model.units))
+        self.assertEqual(loaded.save_state(), model.save_state())
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"{}" * 40)
+        with self.assertRaises(ValueError):
+            load_snapshot(QuantumModel(), self.path)
+
+        write_snapshot(self.build_model(), self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 4)
+        model = QuantumModel()
+        model.add_unit(QuantumUnit("A", 0, 0))
+        with self.assertRaises(ValueError):
+            load_snapshot(model, self.path)
+        self.assertEqual(len(model.units), 1)  # Untouched on failure
+
+    def test_corrupt_index_leaves_board_unchanged(self):
+        write_snapshot(self.build_model(), self.path)
+        with open(self.path, "rb") as f:
+            data = bytearray(f.read())
+        # Point the second unit record's text at a string that does not exist
+        _magic, _version, _flags, unit_count, _strings, pair_count = HEADER.unpack_from(data)[:6]
+        records_at = len(data) - unit_count * RECORD.size - pair_count * PAIR.size
+        fields = list(RECORD.unpack_from(data, records_at + RECORD.size))
+        fields[3] = 999
+        RECORD.pack_into(data, records_at + RECORD.size, *fields)
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+        model = QuantumModel()
+        for i in range(3):
+            model.add_unit(QuantumUnit("A", i * 10, 0))
+        before = model.save_state()
+        with self.assertRaises(ValueError):
+            load_snapshot(model, self.path)
+        self.assertEqual(model.save_state(), before)
+        self.assertEqual(len(model.get_proximity_pairs()), 3)
+        self.assertTrue(all(model.get_unit_by_id(unit.id) is unit for unit in model.units))
+
+    def test_engine_snapshot_and_extension(self):
+        engine = SimulationEngine(self.build_model())
+        engine.accumulated_time = 2.0
+        engine.save_snapshot(self.path)
+
+        other = SimulationEngine()
+        other.load_snapshot(self.path)
+        self.assertEqual(other.accumulated_time, 2.0)
+        self.assertEqual(len(other.model.units), 51)
+        self.assertTrue(is_snapshot_path("state.QCS"))
+        self.assertFalse(is_snapshot_path("state.json"))
+
+
+if __name__ == '__main__':
+    unittest.main()
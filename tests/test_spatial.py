@@ -0,0 +1,122 @@
+import unittest
+import math
+import random
+from quantum_chronometer.model import QuantumModel, QuantumUnit
+from quantum_chronometer.spatial import SpatialHashGrid
+
+
+def brute_force_pairs(units, threshold):
+    pairs = set()
+    for i, unit1 in enumerate(units):
+        for unit2 in units[i+1:]:
+            if math.hypot(unit1.x - unit2.x, unit1.y - unit2.y) < threshold:
+                pairs.add(frozenset((unit1.id, unit2.id)))
+    return pairs
+
+
+class TestSpatialHashGrid(unittest.TestCase):
+    """Tests for the uniform grid neighbour index."""
+
+    def test_neighbors_only_returns_units_in_radius(self):
+        grid = SpatialHashGrid(100)
+        near = QuantumUnit("A", 10, 10)
+        edge = QuantumUnit("B", 150, 10)  # Different cell, within 200px
+        far = QuantumUnit("C", 900, 900)
+        for unit in (near, edge, far):
+            grid.insert(unit)
+
+        found = {unit.id for unit, _ in grid.neighbors(0, 0, 200)}
+        self.assertEqual(found, {near.id, edge.id})
+
+    def test_update_moves_unit_between_cells(self):
+        grid = SpatialHashGrid(100)
+        unit = QuantumUnit("A", 10, 10)
+        grid.insert(unit)
+
+        unit.x, unit.y = 550, 550
+        grid.update(unit)
+
+        self.assertEqual(list(grid.neighbors(10, 10, 100)), [])
+        self.assertEqual([u.id for u, _ in grid.neighbors(550, 550, 100)], [unit.id])
+        self.assertEqual(len(grid.cells), 1)
+
+    def test_remove(self):
+        grid = SpatialHashGrid(100)
+        unit = QuantumUnit("A", -30, -30)  # Negative coordinates use floor cells
+        grid.insert(unit)
+        self.assertTrue(grid.remove(unit.id))
+        self.assertFalse(grid.remove(unit.id))
+        self.assertEqual(len(grid), 0)
+        self.assertEqual(grid.cells, {})
+
+    def test_pairs_within_matches_brute_force(self):
+        rng = random.Random(1234)
+        units = [QuantumUnit("A", rng.uniform(-300, 600), rng.uniform(-300, 600)) for _ in range(200)]
+        grid = SpatialHashGrid(100)
+        grid.rebuild(units)
+
+        for threshold in (50, 100, 250):
+            found = [frozenset((u1.id, u2.id)) for u1, u2, _ in grid.pairs_within(threshold)]
+            self.assertEqual(len(found), len(set(found)))  # No pair visited twice
+            self.assertEqual(set(found), brute_force_pairs(units, threshold))
+
+
+class TestModelSpatialIndex(unittest.TestCase):
+    """The model must keep its spatial index in sync with unit positions."""
+
+    def setUp(self):
+        self.model = QuantumModel()
+
+    def test_proximity_pairs_follow_position_updates(self):
+        unit1 = QuantumUnit("A", 0, 0)
+        unit2 = QuantumUnit("B", 500, 500)
+        self.model.add_unit(unit1)
+        self.model.add_unit(unit2)
+        self.assertEqual(self.model.get_proximity_pairs(), [])
+
+        self.model.update_unit_position(unit2.id, 30, 40)
+        self.assertEqual(len(self.model.get_proximity_pairs()), 1)
+
+        self.model.move_unit(unit2, 800, 800)
+        self.assertEqual(self.model.get_proximity_pairs(), [])
+
+    def test_load_state_rebuilds_index(self):
+        self.model.add_unit(QuantumUnit("Z", 0, 0))
+        self.model.load_state({
+            "units": [
+                {"id": "a", "text": "A", "x": 200, "y": 200},
+                {"id": "b", "text": "B", "x": 210, "y": 210},
+            ]
+        })
+        pairs = self.model.get_proximity_pairs()
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual({pairs[0][0].id, pairs[0][1].id}, {"a", "b"})
+
+    def test_reset_clears_units_and_index(self):
+        self.model.add_unit(QuantumUnit("A", 0, 0))
+        self.model.add_unit(QuantumUnit("B", 5, 5))
+        self.model.time_distortion = 3.0
+        self.model.reset()
+        self.assertEqual(self.model.units, [])
+        self.assertEqual(self.model.get_proximity_pairs(), [])
+        self.assertEqual(self.model.time_distortion, 0.0)
+
+    def test_gravity_uses_index(self):
+        """Gravity term should equal the brute-force sum over close units."""
+        unit1 = QuantumUnit("A", 100, 100)
+        unit2 = QuantumUnit("B", 150, 100)   # 50px away, different cell
+        unit3 = QuantumUnit("C", 400, 100)   # Out of range
+        for unit in (unit1, unit2, unit3):
+            unit.superposition_symbol = '*'
+            self.model.add_unit(unit)
+
+        self.model.update_unit_times(dt=0.1)
+
+        # CLOSE_GRAVITY_FACTOR / (50 / 50) = 0.1 on each close unit, noise is within +-0.002
+        self.assertAlmostEqual(unit1.local_distortion, 0.1, delta=0.01)
+        self.assertAlmostEqual(unit2.local_distortion, 0.1, delta=0.01)
+        self.assertAlmostEqual(unit3.local_distortion, 0.0, delta=0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+import random
+from quantum_chronometer.model import QuantumModel, QuantumUnit, ArrayBackedUnit
+from quantum_chronometer.store import HAS_NUMPY
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestArrayBackend(unittest.TestCase):
+    """Tests for the NumPy structure-of-arrays unit backend."""
+
+    def setUp(self):
+        self.model = QuantumModel(backend="numpy")
+
+    def test_unknown_backend_rejected(self):
+        with self.assertRaises(ValueError):
+            QuantumModel(backend="fortran")
+
+    def test_units_become_views_over_store(self):
+        unit = QuantumUnit("🕳️", 10, 20)
+        unit.superposition_symbol = '~'
+        self.model.add_unit(unit)
+
+        self.assertIsInstance(unit, ArrayBackedUnit)
+        self.assertEqual((unit.x, unit.y), (10, 20))
+        self.assertEqual(unit.superposition_symbol, '~')
+        self.assertTrue(unit.is_black_hole)
+
+        self.model.update_unit_position(unit.id, 300, 400)
+        self.assertEqual(self.model.store.x[0], 300)
+        self.assertEqual(self.model.store.y[0], 400)
+
+        unit.accumulate_time(1.5)
+        self.assertEqual(self.model.store.elapsed_time_sec[0], 1.5)
+
+    def test_reset_detaches_units(self):
+        unit = QuantumUnit("🚀", 5, 5)
+        self.model.add_unit(unit)
+        unit.accumulate_time(2.0)
+        self.model.reset()
+
+        self.assertEqual(len(self.model.store), 0)
+        self.assertIs(type(unit), QuantumUnit)
+        self.assertEqual(unit.x, 5)
+        self.assertEqual(unit.elapsed_time_sec, 2.0)
+
+    def test_remove_unit_frees_row(self):
+        units = [QuantumUnit("A", i * 10, 0) for i in range(4)]
+        for unit in units:
+            self.model.add_unit(unit)
+
+        self.model.remove_unit(units[1].id)
+        self.assertEqual(len(self.model.store), 3)
+        self.assertIs(type(units[1]), QuantumUnit)
+        self.assertEqual(units[1].x, 10)
+        # The last row was moved into the freed slot
+        self.assertEqual(units[3].x, 30)
+        self.assertEqual(self.model.store.x[units[3]._row], 30)
+
+    def test_store_grows_past_initial_capacity(self):
+        units = [QuantumUnit("A", i, i) for i in range(200)]
+        for unit in units:
+            self.model.add_unit(unit)
+        self.assertEqual(len(self.model.store), 200)
+        self.assertEqual(units[150].x, 150)
+
+    def test_proximity_pairs_match_python_backend(self):
+        rng = random.Random(7)
+        python_model = QuantumModel()
+        for _ in range(300):
+            x, y = rng.uniform(-500, 1500), rng.uniform(-500, 1500)
+            python_model.add_unit(QuantumUnit("A", x, y))
+            unit = QuantumUnit("A", x, y)
+            unit.id = python_model.units[-1].id
+            self.model.add_unit(unit)
+
+        expected = {frozenset((u1.id, u2.id)) for u1, u2 in python_model.get_proximity_pairs()}
+        found = [frozenset((u1.id, u2.id)) for u1, u2 in self.model.get_proximity_pairs()]
+        self.assertEqual(len(found), len(set(found)))
+        self.assertEqual(set(found), expected)
+
+    def test_vectorized_tick_matches_scalar_effects(self):
+        """Gravity and black hole terms should agree with the scalar path (noise aside)."""
+        python_model = QuantumModel()
+        layout = [("A", 100, 100), ("B", 150, 100), ("🕳️", 170, 130), ("C", 900, 900)]
+        for text, x, y in layout:
+            for model in (python_model, self.model):
+                unit = QuantumUnit(text, x, y)
+                unit.superposition_symbol = '*'
+                model.add_unit(unit)
+
+        python_model.update_unit_times(dt=0.1, is_observing=True, mouse_pos=(100, 100))
+        self.model.update_unit_times(dt=0.1, is_observing=True, mouse_pos=(100, 100))
+
+        for scalar, vector in zip(python_model.units, self.model.units):
+            self.assertAlmostEqual(scalar.local_distortion, vector.local_distortion, delta=0.01)
+            self.assertAlmostEqual(scalar.elapsed_time_sec, vector.elapsed_time_sec)
+        self.assertAlmostEqual(python_model.time_distortion, self.model.time_distortion, delta=0.02)
+
+    def test_vectorized_entanglement(self):
+        unit1 = QuantumUnit("A", 0, 0)
+        unit2 = QuantumUnit("🕳️", 500, 500)
+        self.model.add_unit(unit1)
+        self.model.add_unit(unit2)
+        self.model.entangle_units(unit1.id, unit2.id)
+
+        self.model.update_unit_times(dt=1.0, is_observing=True)
+        self.assertAlmostEqual(unit1.local_distortion, unit2.local_distortion)
+        self.assertGreater(unit1.local_distortion, 0.2)
+
+    def test_vectorized_entanglement_components(self):
+        """A chain A-B-C should share one value after a removal reorders rows."""
+        units = [QuantumUnit(text, i * 400, 0) for i, text in enumerate(["A", "🕳️", "C", "D"])]
+        for unit in units:
+            self.model.add_unit(unit)
+        self.model.entangle_units(units[0].id, units[1].id)
+        self.model.entangle_units(units[1].id, units[3].id)
+        self.model.remove_unit(units[2].id)
+
+        self.model.update_unit_times(dt=0.1)
+        values = [units[i].local_distortion for i in (0, 1, 3)]
+        self.assertAlmostEqual(min(values), max(values))
+        self.assertAlmostEqual(values[0], 0.5 / 3, delta=0.01)
+
+    def test_cached_gravity_follows_moves_adds_and_removes(self):
+        """Only the affected rows are recomputed between ticks; they must match a full pass."""
+        rng = random.Random(3)
+        for _ in range(2000):
+            self.model.add_unit(QuantumUnit("A", rng.uniform(0, 3000), rng.uniform(0, 3000)))
+        self.model.proximity_columns()
+        for _ in range(30):
+            unit = rng.choice(self.model.units)
+            action = rng.random()
+            if action < 0.2:
+                self.model.remove_unit(unit.id)
+            elif action < 0.4:
+                self.model.add_unit(QuantumUnit("A", rng.uniform(0, 3000), rng.uniform(0, 3000)))
+            else:
+                self.model.update_unit_position(unit.id, unit.x + rng.uniform(-120, 120), unit.y)
+            self.model.proximity_columns()
+
+        def by_id(model):
+            columns = model.proximity_columns()
+            return {owner.id: columns[row] for row, owner in enumerate(model.store.units)}
+
+        fresh = QuantumModel(backend="numpy")
+        fresh.load_state(self.model.save_state())
+        cached, expected = by_id(self.model), by_id(fresh)
+        self.assertEqual(cached.keys(), expected.keys())
+        for unit_id, value in expected.items():
+            self.assertAlmostEqual(cached[unit_id], value, places=12)
+
+    def test_load_state_into_store(self):
+        state = {
+            "units": [
+                {"id": "a", "text": "🌌", "x": 200, "y": 300, "superposition_symbol": "+"},
+                {"id": "b", "text": "💡", "x": 210, "y": 300, "superposition_symbol": "~"},
+            ],
+            "entangled_pairs": [["a", "b"]],
+        }
+        self.model.load_state(state)
+        self.assertEqual(len(self.model.store), 2)
+        self.assertEqual(self.model.units[1].superposition_symbol, "~")
+        self.assertEqual(self.model.save_state()["units"][0]["x"], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import socket
+import time
+import unittest
+from quantum_chronometer.engine import SimulationEngine
+from quantum_chronometer.model import QuantumUnit
+from quantum_chronometer.sync import (
+    OP_ADD, OP_ENTANGLE, OP_MOVE, OP_REMOVE, OP_RESET, StateSync, decode_ops, encode_op
+)
+
+
+def board(engine):
+    model = engine.model
+    units = {(unit.id, unit.text, unit.x, unit.y, unit.superposition_symbol) for unit in model.units}
+    return units, {frozenset(pair) for pair in model.entangled_pairs}
+
+
+class LoopbackCluster:
+    """Several engines on 127.0.0.1, each syncing with all the others."""
+
+    def __init__(self, count, **kwargs):
+        self.engines = []
+        self.syncs = []
+        sockets = []
+        for _ in range(count):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(("127.0.0.1", 0))
+            sockets.append(sock)
+        addresses = [sock.getsockname() for sock in sockets]
+        for sock, address in zip(sockets, addresses):
+            engine = SimulationEngine()
+            sync = StateSync(engine, sock, [a for a in addresses if a != address],
+                             heartbeat_interval=0.05, **kwargs)
+            sync.start()
+            self.engines.append(engine)
+            self.syncs.append(sync)
+
+    def stop(self):
+        for sync in self.syncs:
+            sync.stop()
+
+    def pump(self, condition, timeout=5.0):
+        """Poll every instance until condition() holds."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for sync in self.syncs:
+                sync.poll()
+            if condition():
+                return True
+            time.sleep(0.005)
+        return False
+
+    def converged(self):
+        boards = [board(engine) for engine in self.engines]
+        return all(other == boards[0] for other in boards[1:])
+
+
+class TestStateSync(unittest.TestCase):
+    """Tests for board synchronization between instances on loopback."""
+
+    def setUp(self):
+        self.cluster = None
+
+    def tearDown(self):
+        if self.cluster is not None:
+            self.cluster.stop()
+
+    def start(self, count=3, **kwargs):
+        self.cluster = LoopbackCluster(count, **kwargs)
+        return self.cluster.engines
+
+    def test_ops_round_trip(self):
+        ops = [(OP_ADD, "id-1", "🚀🌌", 1.5, -2.0, "~"), (OP_MOVE, "id-1", 3.0, 4.0),
+               (OP_ENTANGLE, "id-1", "id-2"), (OP_REMOVE, "id-2"), (OP_RESET,)]
+        data = b"".join(encode_op(op) for op in ops)
+        self.assertEqual(decode_ops(data), ops)
+        for bad in (data[:5], b"\x09", data + b"\x01\xff"):
+            with self.assertRaises(ValueError):
+                decode_ops(bad)
+
+    def test_changes_reach_every_instance(self):
+        a, b, c = self.start()
+        units = [QuantumUnit("⚛️", i * 10, 0) for i in range(5)]
+        for unit in units:
+            a.add_unit(unit)
+        a.entangle_units(units[0].id, units[1].id)
+        for x in range(20):  # Merged into one move per poll
+            a.move_unit(units[2].id, x, 50)
+        b.add_unit(QuantumUnit("🕳️", 300, 300))
+        self.assertTrue(self.cluster.pump(lambda: len(c.model.units) == 6 and self.cluster.converged()))
+        self.assertTrue(c.model.are_entangled(units[0].id, units[1].id))
+        self.assertEqual((c.model.get_unit_by_id(units[2].id).x), 19)
+
+        c.remove_unit(units[4].id)
+        c.move_unit(units[0].id, 77, 77)
+        self.assertTrue(self.cluster.pump(lambda: len(a.model.units) == 5 and self.cluster.converged()))
+        self.assertEqual(a.model.get_unit_by_id(units[0].id).x, 77)
+
+    def test_poll_reports_changes_for_the_view(self):
+        a, b = self.start(2)
+        sync_a, sync_b = self.cluster.syncs
+
+        def collect(until):
+            seen = []
+            deadline = time.monotonic() + 5.0
+            while not until(seen) and time.monotonic() < deadline:
+                sync_a.poll()
+                seen.append(sync_b.poll())
+                time.sleep(0.005)
+            return seen
+
+        unit = QuantumUnit("A", 0, 0)
+        a.add_unit(unit)
+        seen = collect(lambda seen: b.model.units)
+        self.assertEqual([u.id for changes in seen for u in changes.added], [unit.id])
+
+        a.move_unit(unit.id, 5, 5)
+        seen = collect(lambda seen: b.model.units[0].x == 5)
+        self.assertEqual([u.id for changes in seen for u in changes.moved], [unit.id])
+
+        a.remove_unit(unit.id)
+        seen = collect(lambda seen: not b.model.units)
+        self.assertEqual([i for changes in seen for i in changes.removed], [unit.id])
+
+        a.add_unit(QuantumUnit("B", 1, 1))
+        a.reset()
+        collect(lambda seen: any(changes.reset for changes in seen))
+        self.assertEqual(b.model.units, [])
+
+    def test_initial_board_is_shared(self):
+        engine = SimulationEngine()
+        engine.add_unit(QuantumUnit("⚛️", 1, 2))
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        a, = self.start(1)
+        sync = StateSync(engine, sock, [self.cluster.syncs[0].transport.sock.getsockname()])
+        sync.start()
+        self.cluster.syncs.append(sync)
+        self.assertTrue(self.cluster.pump(lambda: len(a.model.units) == 1))
+
+    def test_late_joiner_gets_chunked_snapshot(self):
+        a, b = self.start(2, mtu=300, history_size=4)
+        sync_a, sync_b = self.cluster.syncs
+        for i in range(60):  # The second instance is not listening yet
+            a.add_unit(QuantumUnit("🚀" * (i % 4 + 1), i, i * 2))
+            sync_a.poll()
+        a.entangle_units(a.model.units[0].id, a.model.units[1].id)
+        sync_a.poll()
+        time.sleep(0.05)
+        sync_b.transport.drain()
+
+        self.assertTrue(self.cluster.pump(self.cluster.converged))
+        self.assertEqual(len(b.model.units), 60)
+        self.assertGreater(sync_a.snapshots_sent, 0)
+        self.assertGreater(sync_b.snapshots_applied, 0)
+        self.assertEqual(b.model.entangled_pairs, a.model.entangled_pairs)
+
+    def test_lost_deltas_are_retransmitted(self):
+        a, b = self.start(2)
+        sync_a, sync_b = self.cluster.syncs
+        a.add_unit(QuantumUnit("A", 0, 0))
+        self.assertTrue(self.cluster.pump(lambda: len(b.model.units) == 1))
+
+        for i in range(5):
+            a.add_unit(QuantumUnit("B", i, i))
+            sync_a.poll()
+        time.sleep(0.05)
+        sync_b.transport.drain()  # Lost on the way
+        a.add_unit(QuantumUnit("C", 9, 9))
+        self.assertTrue(self.cluster.pump(lambda: len(b.model.units) == 7))
+        self.assertGreater(sync_a.retransmits, 0)
+        self.assertTrue(self.cluster.converged())
+
+
+if __name__ == '__main__':
+    unittest.main()
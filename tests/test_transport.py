@@ -0,0 +1,84 @@
+import socket
+import time
+import unittest
+from quantum_chronometer.transport import DatagramTransport
+
+
+def bound_socket():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+def decode_text(data, addr):
+    """Datagrams like b"peer=value"; anything else is dropped."""
+    peer, value = data.decode("ascii").split("=")
+    return peer, int(value)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestDatagramTransport(unittest.TestCase):
+    """Tests for the asyncio UDP transport and its send/receive batching."""
+
+    def setUp(self):
+        self.receiver = DatagramTransport(bound_socket(), decode_text)
+        self.sender = DatagramTransport(bound_socket(), decode_text)
+        self.assertTrue(self.receiver.start())
+        self.assertTrue(self.sender.start())
+        self.addr = self.receiver.sock.getsockname()
+
+    def tearDown(self):
+        self.sender.stop()
+        self.receiver.stop()
+
+    def test_latest_value_per_peer(self):
+        for i in range(50):
+            self.sender.send(("a", i), f"a={i}".encode(), self.addr)
+        self.sender.send("b", b"b=7", self.addr)
+        self.assertTrue(wait_for(lambda: self.receiver.received == 51))
+
+        self.assertEqual(self.receiver.drain(), {"a": 49, "b": 7})
+        self.assertEqual(self.receiver.drain(), {})
+
+    def test_send_queue_coalesces_by_key(self):
+        for i in range(200):
+            self.sender.send("a", f"a={i}".encode(), self.addr)
+        self.assertTrue(wait_for(lambda: self.receiver.drain().get("a") == 199))
+        self.assertEqual(self.sender.sent + self.sender.coalesced, 200)
+
+    def test_malformed_datagrams_are_dropped(self):
+        self.sender.send("x", b"\xff not a value", self.addr)
+        self.sender.send("y", b"a=1", self.addr)
+        self.assertTrue(wait_for(lambda: self.receiver.received + self.receiver.dropped == 2))
+        self.assertEqual(self.receiver.dropped, 1)
+        self.assertEqual(self.receiver.drain(), {"a": 1})
+
+    def test_keep_all_queues_every_datagram(self):
+        receiver = DatagramTransport(bound_socket(), decode_text, keep_all=True, max_backlog=3)
+        self.assertTrue(receiver.start())
+        try:
+            addr = receiver.sock.getsockname()
+            for i in range(5):
+                self.sender.send(i, f"a={i}".encode(), addr)
+            self.assertTrue(wait_for(lambda: receiver.received + receiver.overflowed == 5))
+            self.assertEqual(receiver.drain(), [("a", 0), ("a", 1), ("a", 2)])
+            self.assertEqual(receiver.overflowed, 2)
+        finally:
+            receiver.stop()
+
+    def test_send_after_stop(self):
+        self.sender.stop()
+        self.assertFalse(self.sender.running)
+        self.assertFalse(self.sender.send("a", b"a=1", self.addr))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from quantum_chronometer.wire import (
+    DISTORTION, FLAG_HEARTBEAT, HEADER, KIND_DISTORTION, SendPolicy,
+    pack_distortion, unpack_distortion, unpack_header
+)
+
+
+class TestWireProtocol(unittest.TestCase):
+    """Tests for the binary packet layout."""
+
+    def test_distortion_round_trip(self):
+        data = pack_distortion(2 ** 64 - 1, 7, -0.125, FLAG_HEARTBEAT)
+        self.assertEqual(len(data), DISTORTION.size)
+        self.assertEqual(unpack_distortion(data), (2 ** 64 - 1, 7, -0.125, FLAG_HEARTBEAT))
+        self.assertEqual(unpack_header(data), (KIND_DISTORTION, FLAG_HEARTBEAT, 2 ** 64 - 1, 7))
+
+    def test_rejects_foreign_packets(self):
+        data = pack_distortion(1, 1, 0.5)
+        for bad in (b'{"type": "DISTORTION", "value": 0.5}', data[:-1], data + b"\0",
+                    b"XXXX" + data[4:], data[:4] + b"\x09" + data[5:], b""):
+            with self.assertRaises(ValueError):
+                unpack_distortion(bad)
+        with self.assertRaises(ValueError):
+            unpack_header(data[:HEADER.size - 1])
+
+
+class TestSendPolicy(unittest.TestCase):
+    """Tests for delta, rate and heartbeat based broadcasting."""
+
+    def setUp(self):
+        self.policy = SendPolicy(delta=0.01, max_rate=10.0, heartbeat=1.0)
+
+    def test_small_changes_wait_for_heartbeat(self):
+        self.assertEqual(self.policy.decide(0.5, now=0.0), 0)
+        self.assertIsNone(self.policy.decide(0.505, now=0.2))
+        self.assertIsNone(self.policy.decide(0.495, now=0.9))
+        self.assertEqual(self.policy.decide(0.5, now=1.0), FLAG_HEARTBEAT)
+        self.assertEqual(self.policy.suppressed, 2)
+
+    def test_rate_limit(self):
+        self.policy.decide(0.0, now=0.0)
+        self.assertIsNone(self.policy.decide(1.0, now=0.05))
+        self.assertEqual(self.policy.decide(1.0, now=0.1), 0)
+
+    def test_twenty_hz_noise_is_thinned(self):
+        sent = 0
+        for tick in range(200):  # 10 s of ticks with a value jittering by up to 0.004
+            if self.policy.decide(0.3 + (tick % 3) * 0.002, now=tick * 0.05) is not None:
+                sent += 1
+        self.assertLessEqual(sent, 11)
+
+
+if __name__ == '__main__':
+    unittest.main()